@@ -0,0 +1,119 @@
+"""Sohbet LLM üretim yolunu ölçer: her istek için ayrı model.generate çağrısı (eski yol)
+ile önbellekli sistem promptu ve sürekli gruplama kullanan GenerationEngine karşılaştırılır.
+
+Kullanım:
+    python -m benchmarks.llm_generation --requests 16 --concurrency 4 --max-new-tokens 64
+"""
+import argparse
+import asyncio
+import json
+import time
+import numpy as np
+from src.ai_engine.chat_engine import FinancialChatBot
+from src.ai_engine.llm_engine import GenerationEngine
+from src.ai_engine.model_registry import get_model_registry
+
+PROMPTS = [
+    "Enflasyon yükselirken tahvil fiyatları neden düşer?",
+    "Temettü verimi nedir, nasıl hesaplanır?",
+    "Uzun vadeli yatırımda çeşitlendirmenin önemi nedir?",
+    "Merkez bankası faiz kararları borsayı nasıl etkiler?",
+    "Kripto paraların volatilitesini ne belirler?",
+    "Endeks fonu ile aktif fon arasındaki fark nedir?"
+]
+
+async def _run_requests(call, requests, concurrency):
+    """İstekleri verilen eşzamanlılıkla çalıştırır; her istek için (süre, ilk token süresi, token) döndürür"""
+    semaphore = asyncio.Semaphore(concurrency)
+    results = []
+
+    async def one(index):
+        async with semaphore:
+            started = time.perf_counter()
+            first, tokens = await call(PROMPTS[index % len(PROMPTS)])
+            results.append((time.perf_counter() - started, first - started, tokens))
+
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return results
+
+def _summary(name, results, elapsed):
+    latencies = np.array([r[0] for r in results])
+    ttft = np.array([r[1] for r in results])
+    tokens = sum(r[2] for r in results)
+    return {
+        'path': name,
+        'requests': len(results),
+        'tokens': tokens,
+        'tokens_per_second': round(tokens / elapsed, 2),
+        'latency_p50': round(float(np.percentile(latencies, 50)), 3),
+        'latency_p95': round(float(np.percentile(latencies, 95)), 3),
+        'ttft_p50': round(float(np.percentile(ttft, 50)), 3),
+        'ttft_p95': round(float(np.percentile(ttft, 95)), 3)
+    }
+
+async def bench_baseline(chatbot, tokenizer, model, args):
+    """Eski yol: tam prompt her istekte yeniden kodlanır, her istek kendi generate çağrısını yapar"""
+    import torch
+
+    def generate(prompt):
+        text = chatbot._prompt_prefix() + chatbot._build_prompt(prompt)
+        inputs = tokenizer(text, return_tensors="pt")
+        with torch.inference_mode():
+            output = model.generate(**inputs, max_new_tokens=args.max_new_tokens, do_sample=False)
+        return time.perf_counter(), output.shape[1] - inputs['input_ids'].shape[1]
+
+    async def call(prompt):
+        return await asyncio.to_thread(generate, prompt)
+
+    started = time.perf_counter()
+    results = await _run_requests(call, args.requests, args.concurrency)
+    return _summary('baseline_generate', results, time.perf_counter() - started)
+
+async def bench_engine(chatbot, tokenizer, model, args):
+    """Yeni yol: sistem promptu KV önbelleği ve sürekli gruplama"""
+    engine = GenerationEngine(
+        tokenizer, model,
+        prefix=chatbot._prompt_prefix(),
+        max_batch_size=args.concurrency,
+        max_new_tokens=args.max_new_tokens,
+        temperature=0.0
+    )
+
+    async def call(prompt):
+        first = None
+        async for _ in engine.stream(chatbot._build_prompt(prompt)):
+            first = first or time.perf_counter()
+        # Metin parçaları token'larla birebir örtüşmez; toplam token motor sayacından okunur
+        return first or time.perf_counter(), 0
+
+    before = engine.tokens
+    started = time.perf_counter()
+    results = await _run_requests(call, args.requests, args.concurrency)
+    elapsed = time.perf_counter() - started
+    engine.stop()
+
+    summary = _summary('generation_engine', results, elapsed)
+    summary['tokens'] = engine.tokens - before
+    summary['tokens_per_second'] = round(summary['tokens'] / elapsed, 2)
+    summary['engine'] = engine.stats()
+    return summary
+
+async def main(args):
+    chatbot = FinancialChatBot()
+    tokenizer, model = await asyncio.to_thread(get_model_registry().get, 'chat_llm')
+
+    report = []
+    if args.path in ('both', 'baseline'):
+        report.append(await bench_baseline(chatbot, tokenizer, model, args))
+    if args.path in ('both', 'engine'):
+        report.append(await bench_engine(chatbot, tokenizer, model, args))
+
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sohbet LLM üretim kıyaslaması")
+    parser.add_argument('--requests', type=int, default=16)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--max-new-tokens', type=int, default=64)
+    parser.add_argument('--path', choices=['both', 'baseline', 'engine'], default='both')
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,485 @@
+"""Uçtan uca yük kıyaslaması: FastAPI uç noktaları ve bot işleyicileri eşzamanlı yük altında ölçülür
+
+Upstream'ler (Alpha Vantage, NewsAPI) yerel stub sunucusuna, modeller (FinBERT, LSTM, sohbet LLM'i)
+küçük yer tutuculara yönlendirilir; veritabanı geçici bir SQLite dosyasıdır. Canlı API anahtarı ya da
+model indirmesi gerekmez. Her senaryo için verim ve p50/p95/p99 gecikme raporlanır ve JSON olarak
+kaydedilir; --baseline ile önceki bir commit'in sonucu verilirse farklar da yazılır.
+
+Kullanım:
+    python -m benchmarks.load --duration 30 --concurrency 16 --upstream-latency-ms 120
+    python -m benchmarks.load --scenarios market_analysis,portfolio --baseline benchmarks/results/abc123.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import numpy as np
+from benchmarks.models import install_stand_in_models
+from benchmarks.stubs import StubUpstream, CRYPTO_SYMBOLS
+
+STOCKS = ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'TSLA', 'NVDA', 'THYAO', 'GARAN']
+CRYPTOS = ['BTC', 'ETH', 'SOL']
+SYMBOLS = STOCKS + CRYPTOS
+
+CHAT_PROMPTS = [
+    "Enflasyon yükselirken tahvil fiyatları neden düşer?",
+    "Temettü verimi nedir, nasıl hesaplanır?",
+    "Uzun vadeli yatırımda çeşitlendirmenin önemi nedir?",
+    "Merkez bankası faiz kararları borsayı nasıl etkiler?"
+]
+
+# LLM kullanan senaryolar ayrı (daha düşük) eşzamanlılıkla çalışır
+LLM_SCENARIOS = {'chat_general', 'chat_stream', 'telegram_message'}
+
+class ScenarioError(Exception):
+    pass
+
+def _environment(upstream_url, workdir, args):
+    """Uygulama modülleri import edilmeden önce uygulanacak ortam değişkenleri"""
+    database = os.path.join(workdir, 'benchmark.db')
+    return {
+        'ALPHA_VANTAGE_BASE_URL': upstream_url,
+        'NEWS_API_BASE_URL': upstream_url,
+        'ALPHA_VANTAGE_API_KEY': 'benchmark',
+        'NEWS_API_KEY': 'benchmark',
+        'DATABASE_URL': f"sqlite:///{database}",
+        'ASYNC_DATABASE_URL': f"sqlite+aiosqlite:///{database}",
+        'SENTIMENT_CACHE_PATH': os.path.join(workdir, 'sentiment_cache.sqlite3'),
+        'SENTIMENT_MODEL_ID': 'benchmark-tiny-sentiment',
+        # Stub'ın kotası yok; zamanlayıcı ölçülen yolu kısmasın
+        'ALPHA_VANTAGE_CALLS_PER_MINUTE': str(10 ** 6),
+        'ALPHA_VANTAGE_CALLS_PER_DAY': str(10 ** 9),
+        'QUOTE_TTL_STOCK': str(args.quote_ttl),
+        'QUOTE_TTL_CRYPTO': str(args.quote_ttl),
+        'CHAT_MAX_NEW_TOKENS': str(args.max_new_tokens),
+        'TELEGRAM_BOT_TOKEN': '123456:benchmark',
+        # Sanal kullanıcılar art arda aynı istemleri gönderir; ağ geçidi mesajları düşürmesin
+        'BOT_USER_MESSAGE_RATE': str(10 ** 6),
+        'BOT_USER_MESSAGE_BURST': str(10 ** 6),
+        'BOT_GATEWAY_QUEUE_SIZE': str(10 ** 6),
+        'BOT_GATEWAY_MAX_PENDING_PER_USER': str(10 ** 6),
+        'BOT_GATEWAY_DUPLICATE_WINDOW': '0'
+    }
+
+def _git_revision():
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = bool(subprocess.run(
+            ['git', 'status', '--porcelain', '--untracked-files=no'], capture_output=True, text=True, check=True
+        ).stdout.strip())
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown', False
+
+async def seed_database(users, days=120, ticks=240, seed=0):
+    """Kullanıcı, portföy, günlük bar, tik ve alarm verisi yazar"""
+    from sqlalchemy import insert
+    from src.database.models import User, Portfolio, MarketData, OHLCVBar, PriceAlert
+    from src.database.session import get_engine
+
+    rng = random.Random(seed)
+    now = datetime.utcnow().replace(microsecond=0)
+    today = now.replace(hour=0, minute=0, second=0)
+    bars, tick_rows = [], []
+    for symbol in SYMBOLS:
+        price = rng.uniform(20000, 60000) if symbol in CRYPTO_SYMBOLS else rng.uniform(10, 500)
+        for day in range(days, 0, -1):
+            open_ = price
+            price *= 1 + rng.gauss(0, 0.02)
+            bars.append({
+                'symbol': symbol, 'resolution': '1d', 'bucket_start': today - timedelta(days=day),
+                'open': open_, 'high': max(open_, price) * 1.01, 'low': min(open_, price) * 0.99,
+                'close': price, 'volume': rng.uniform(1e5, 1e7), 'tick_count': 100
+            })
+        for minute in range(ticks, 0, -1):
+            price *= 1 + rng.gauss(0, 0.001)
+            tick_rows.append({
+                'symbol': symbol, 'price': price, 'volume': rng.uniform(1e3, 1e5),
+                'timestamp': now - timedelta(minutes=minute)
+            })
+
+    user_rows, portfolio_rows, alert_rows = [], [], []
+    for user_id in range(1, users + 1):
+        user_rows.append({'id': user_id, 'username': f"bench{user_id}", 'email': f"bench{user_id}@example.com"})
+        for symbol in rng.sample(SYMBOLS, 5):
+            portfolio_rows.append({
+                'user_id': user_id, 'asset_type': 'crypto' if symbol in CRYPTO_SYMBOLS else 'stock',
+                'symbol': symbol, 'quantity': rng.uniform(1, 50), 'purchase_price': rng.uniform(10, 500)
+            })
+        for symbol in rng.sample(SYMBOLS, 3):
+            alert_rows.append({
+                'platform': 'telegram', 'user_id': user_id, 'chat_id': user_id,
+                'asset_type': 'crypto' if symbol in CRYPTO_SYMBOLS else 'stock', 'symbol': symbol,
+                'direction': rng.choice(['above', 'below']), 'threshold': rng.uniform(10, 60000),
+                'created_at': now
+            })
+
+    async with get_engine().begin() as conn:
+        await conn.execute(insert(User.__table__), user_rows)
+        await conn.execute(insert(Portfolio.__table__), portfolio_rows)
+        await conn.execute(insert(OHLCVBar.__table__), bars)
+        await conn.execute(insert(MarketData.__table__), tick_rows)
+        await conn.execute(insert(PriceAlert.__table__), alert_rows)
+
+def _expect(response, *statuses):
+    if response.status_code not in (statuses or (200,)):
+        raise ScenarioError(f"HTTP {response.status_code}")
+    return response
+
+def api_scenarios(client, users):
+    """FastAPI uç noktası senaryoları: ad -> çağrı sırasına göre isteği yapan fonksiyon"""
+
+    def symbol(i):
+        return SYMBOLS[i % len(SYMBOLS)]
+
+    def user(i):
+        return i % users + 1
+
+    async def health_live(i):
+        _expect(await client.get("/health/live"))
+
+    async def market_analysis(i):
+        _expect(await client.get(f"/api/v1/market/analysis/{symbol(i)}"))
+
+    async def market_trends(i):
+        symbols = ",".join(SYMBOLS[j % len(SYMBOLS)] for j in range(i, i + 4))
+        _expect(await client.get("/api/v1/market/trends", params={'symbols': symbols}))
+
+    async def indicators(i):
+        _expect(await client.get(f"/api/v1/market/indicators/{symbol(i)}"))
+
+    async def portfolio(i):
+        _expect(await client.get(f"/api/v1/portfolio/{user(i)}"))
+
+    async def advice(i):
+        _expect(await client.get(f"/api/v1/advice/{user(i)}/{symbol(i)}"))
+
+    async def alerts_list(i):
+        _expect(await client.get(f"/api/v1/alerts/{user(i)}", params={'platform': 'telegram'}))
+
+    async def chat_analysis(i):
+        _expect(await client.post(f"/api/v1/chat/{user(i)}", json={'text': f"{symbol(i)} analiz"}))
+
+    async def chat_general(i):
+        _expect(await client.post(f"/api/v1/chat/{user(i)}", json={'text': CHAT_PROMPTS[i % len(CHAT_PROMPTS)]}))
+
+    async def chat_stream(i):
+        text = CHAT_PROMPTS[i % len(CHAT_PROMPTS)]
+        async with client.stream("POST", f"/api/v1/chat/{user(i)}/stream", json={'text': text}) as response:
+            _expect(response)
+            async for _ in response.aiter_bytes():
+                pass
+
+    async def chat_history(i):
+        _expect(await client.get(f"/api/v1/chat/history/{user(i)}"))
+
+    return {
+        'health_live': health_live,
+        'market_analysis': market_analysis,
+        'market_trends': market_trends,
+        'indicators': indicators,
+        'portfolio': portfolio,
+        'advice': advice,
+        'alerts_list': alerts_list,
+        'chat_analysis': chat_analysis,
+        'chat_general': chat_general,
+        'chat_stream': chat_stream,
+        'chat_history': chat_history
+    }
+
+class _FakeSent:
+    def __init__(self, text):
+        self.text = text
+
+    async def edit_text(self, text):
+        self.text = text
+        return self
+
+class _FakeTelegramMessage:
+    """Telegram Update.message'ın işleyicilerin kullandığı kısmı"""
+
+    def __init__(self, text):
+        self.text = text
+        self.replies = []
+        self.chat = SimpleNamespace(send_action=self._send_action)
+
+    async def _send_action(self, action):
+        pass
+
+    async def reply_text(self, text):
+        sent = _FakeSent(text)
+        self.replies.append(sent)
+        return sent
+
+def _check_replies(replies, failure="hata oluştu"):
+    if not replies or any(failure in str(reply) for reply in replies):
+        raise ScenarioError("İşleyici hata yanıtı döndürdü")
+
+def telegram_scenarios(users):
+    """Telegram bot işleyicilerini sahte Update nesneleriyle çağıran senaryolar"""
+    from src.integrations.telegram_bot import FintelliTelegramBot
+    bot = FintelliTelegramBot()
+
+    def update(i, text):
+        user_id = i % users + 1
+        return SimpleNamespace(
+            effective_user=SimpleNamespace(id=user_id),
+            effective_chat=SimpleNamespace(id=user_id),
+            message=_FakeTelegramMessage(text)
+        )
+
+    async def telegram_message(i):
+        event = update(i, CHAT_PROMPTS[i % len(CHAT_PROMPTS)])
+        outcome = await (await bot.handle_message(event, SimpleNamespace(args=[])))
+        if outcome != 'done':
+            raise ScenarioError(f"Ağ geçidi mesajı işlemedi: {outcome}")
+        _check_replies([sent.text for sent in event.message.replies])
+
+    async def telegram_analysis(i):
+        event = update(i, "")
+        await bot.analysis_command(event, SimpleNamespace(args=[SYMBOLS[i % len(SYMBOLS)]]))
+        _check_replies([sent.text for sent in event.message.replies])
+
+    async def telegram_alarm(i):
+        event = update(i, "")
+        await bot.alarm_command(event, SimpleNamespace(args=['liste']))
+        _check_replies([sent.text for sent in event.message.replies])
+
+    scenarios = {
+        'telegram_message': telegram_message,
+        'telegram_analysis': telegram_analysis,
+        'telegram_alarm': telegram_alarm
+    }
+    return bot.chatbot, scenarios
+
+class _FakeTyping:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+class _FakeDiscordContext:
+    """discord.py komut bağlamının komutların kullandığı kısmı"""
+
+    def __init__(self, user_id):
+        self.author = SimpleNamespace(id=user_id)
+        self.channel = SimpleNamespace(id=user_id)
+        self.sent = []
+
+    def typing(self):
+        return _FakeTyping()
+
+    async def send(self, content=None, embed=None):
+        self.sent.append(content if embed is None else embed.description)
+
+def discord_scenarios(users):
+    """Discord bot komutlarını sahte bağlamla çağıran senaryolar"""
+    from src.integrations.discord_bot import FintelliDiscordBot
+    bot = FintelliDiscordBot()
+
+    async def discord_analysis(i):
+        ctx = _FakeDiscordContext(i % users + 1)
+        await bot.get_command('analiz').callback(ctx, SYMBOLS[i % len(SYMBOLS)])
+        _check_replies(ctx.sent)
+
+    async def discord_alarm(i):
+        ctx = _FakeDiscordContext(i % users + 1)
+        await bot.get_command('alarm').callback(ctx, 'liste')
+        _check_replies(ctx.sent)
+
+    return bot.chatbot, {'discord_analysis': discord_analysis, 'discord_alarm': discord_alarm}
+
+async def run_load(scenarios, concurrency, duration):
+    """Tüm senaryoları aynı anda, her biri kendi işçi sayısıyla `duration` saniye boyunca çalıştırır"""
+    results = {name: {'latencies': [], 'errors': Counter()} for name in scenarios}
+    deadline = time.perf_counter() + duration
+
+    async def worker(name, call, first, step):
+        i = first
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                await call(i)
+                results[name]['latencies'].append(time.perf_counter() - started)
+            except Exception as e:
+                results[name]['errors'][f"{type(e).__name__}: {e}"[:120]] += 1
+            i += step
+            # Süreç içi ASGI çağrıları hiç askıya alınmadan tamamlanabilir; diğer işçiler aç kalmasın
+            await asyncio.sleep(0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        worker(name, call, first, concurrency[name])
+        for name, call in scenarios.items()
+        for first in range(concurrency[name])
+    ))
+    return results, time.perf_counter() - started
+
+def summarize(results, elapsed, concurrency):
+    """Senaryo başına verim ve gecikme yüzdeliklerini (ms) hesaplar"""
+    summary = {}
+    for name, result in results.items():
+        latencies = np.array(result['latencies']) * 1000
+        entry = {
+            'concurrency': concurrency[name],
+            'requests': len(latencies),
+            'errors': sum(result['errors'].values()),
+            'throughput_rps': round(len(latencies) / elapsed, 2)
+        }
+        if len(latencies):
+            entry.update({
+                'latency_ms_mean': round(float(latencies.mean()), 2),
+                'latency_ms_p50': round(float(np.percentile(latencies, 50)), 2),
+                'latency_ms_p95': round(float(np.percentile(latencies, 95)), 2),
+                'latency_ms_p99': round(float(np.percentile(latencies, 99)), 2),
+                'latency_ms_max': round(float(latencies.max()), 2)
+            })
+        if result['errors']:
+            entry['error_samples'] = dict(result['errors'].most_common(3))
+        summary[name] = entry
+    return summary
+
+def compare(summary, baseline):
+    """Önceki sonuca göre verim ve p95/p99 gecikmedeki yüzde değişim"""
+    comparison = {}
+    for name, entry in summary.items():
+        previous = baseline.get('scenarios', {}).get(name)
+        if not previous:
+            continue
+        deltas = {}
+        for key in ('throughput_rps', 'latency_ms_p50', 'latency_ms_p95', 'latency_ms_p99'):
+            if entry.get(key) is not None and previous.get(key):
+                deltas[key] = round((entry[key] - previous[key]) / previous[key] * 100, 1)
+        comparison[name] = deltas
+    return {'baseline_commit': baseline.get('commit'), 'percent_change': comparison}
+
+async def main(args):
+    stub = StubUpstream(
+        latency=args.upstream_latency_ms / 1000,
+        jitter=args.upstream_jitter_ms / 1000,
+        news_latency=None if args.news_latency_ms is None else args.news_latency_ms / 1000,
+        seed=args.seed
+    )
+    upstream_url = await stub.start()
+    workdir = tempfile.mkdtemp(prefix='fintelli-bench-')
+    os.environ.update(_environment(upstream_url, workdir, args))
+
+    # Uygulama yapılandırmayı import anında okur; ortam ayarlandıktan sonra yüklenir
+    import httpx
+    from src.api import main as api
+    install_stand_in_models(api.model_registry, seed=args.seed)
+
+    await api.startup()
+    await seed_database(args.users, seed=args.seed)
+    # Arka planda önceden yüklenen küçük modeller hazır olana kadar beklenir
+    while not api.startup_report.is_ready():
+        await asyncio.sleep(0.05)
+
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=api.app), base_url="http://benchmark", timeout=120)
+    scenarios = api_scenarios(client, args.users)
+    bot_chatbots, skipped = [], {}
+    for platform_name, factory in (('telegram', telegram_scenarios), ('discord', discord_scenarios)):
+        try:
+            chatbot, platform_scenarios = factory(args.users)
+        except ImportError as e:
+            skipped[platform_name] = f"bot kütüphanesi yüklü değil ({e.name})"
+            continue
+        bot_chatbots.append(chatbot)
+        scenarios.update(platform_scenarios)
+
+    if args.scenarios:
+        selected = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+        unknown = set(selected) - set(scenarios)
+        if unknown:
+            raise SystemExit(f"Bilinmeyen senaryo: {', '.join(sorted(unknown))} (mevcut: {', '.join(scenarios)})")
+        scenarios = {name: scenarios[name] for name in selected}
+    concurrency = {
+        name: args.llm_concurrency if name in LLM_SCENARIOS else args.concurrency
+        for name in scenarios
+    }
+
+    try:
+        # Tembel başlatılan yollar (üretim motoru, gösterge önyüklemesi) ölçüme girmesin
+        for name, call in scenarios.items():
+            try:
+                await call(0)
+            except Exception as e:
+                print(f"Isınma hatası ({name}): {e}")
+        upstream_before = Counter(stub.stats())
+        results, elapsed = await run_load(scenarios, concurrency, args.duration)
+        upstream_calls = dict(Counter(stub.stats()) - upstream_before)
+        components = (await client.get("/api/v1/system/cache")).json()
+        models = (await client.get("/api/v1/system/models")).json()
+    finally:
+        await client.aclose()
+        for chatbot in bot_chatbots:
+            await asyncio.to_thread(chatbot.close)
+        await api.shutdown()
+        await stub.stop()
+
+    commit, dirty = _git_revision()
+    summary = summarize(results, elapsed, concurrency)
+    report = {
+        'commit': commit,
+        'dirty': dirty,
+        'timestamp': datetime.utcnow().isoformat(timespec='seconds') + 'Z',
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count()
+        },
+        'parameters': {key: value for key, value in vars(args).items() if key not in ('output', 'baseline')},
+        'elapsed_seconds': round(elapsed, 3),
+        'throughput_rps': round(sum(entry['requests'] for entry in summary.values()) / elapsed, 2),
+        'scenarios': summary,
+        'skipped': skipped,
+        'upstream_calls': upstream_calls,
+        'components': components,
+        'models': models
+    }
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as baseline:
+            report['comparison'] = compare(summary, json.load(baseline))
+
+    output = args.output or os.path.join('benchmarks', 'results', f"{commit}{'-dirty' if dirty else ''}.json")
+    directory = os.path.dirname(output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as handle:
+        json.dump(report, handle, ensure_ascii=False, indent=2, default=str)
+
+    print(json.dumps(
+        {key: report[key] for key in ('commit', 'throughput_rps', 'scenarios', 'skipped', 'upstream_calls')
+         + (('comparison',) if args.baseline else ())},
+        ensure_ascii=False, indent=2
+    ))
+    print(f"Sonuçlar {output} dosyasına yazıldı", file=sys.stderr)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--duration', type=float, default=20, help="Ölçüm süresi (saniye)")
+    parser.add_argument('--concurrency', type=int, default=8, help="Senaryo başına eşzamanlı istemci")
+    parser.add_argument('--llm-concurrency', type=int, default=2, help="LLM senaryoları için eşzamanlı istemci")
+    parser.add_argument('--scenarios', default='', help="Virgülle ayrılmış senaryo adları (boşsa hepsi)")
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--upstream-latency-ms', type=float, default=80)
+    parser.add_argument('--upstream-jitter-ms', type=float, default=20)
+    parser.add_argument('--news-latency-ms', type=float, default=None)
+    parser.add_argument('--quote-ttl', type=float, default=5, help="Fiyat önbelleği TTL'i (saniye)")
+    parser.add_argument('--max-new-tokens', type=int, default=32)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None, help="JSON çıktı yolu (varsayılan benchmarks/results/<commit>.json)")
+    parser.add_argument('--baseline', default=None, help="Karşılaştırılacak önceki sonuç dosyası")
+    asyncio.run(main(parser.parse_args()))
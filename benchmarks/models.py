@@ -0,0 +1,108 @@
+"""Kıyaslamalar için FinBERT, LSTM ve sohbet LLM'inin yerine geçen küçük modeller
+
+Modeller gerçek ağırlık indirmeden, aynı arayüzle ve gerçek hesaplama yaparak çalışır; böylece
+partileme, önbellek ve üretim motoru gibi sıcak yollar ölçülebilir ama sonuçlar anlamlı değildir.
+"""
+import hashlib
+import numpy as np
+
+SENTIMENT_LABELS = ('positive', 'negative', 'neutral')
+
+class TinySentimentPipeline:
+    """transformers duygu analizi pipeline'ının arayüzünü taklit eden hash özellikli doğrusal model"""
+
+    def __init__(self, features=4096, hidden=128, seed=0):
+        rng = np.random.default_rng(seed)
+        self.features = features
+        self.w1 = rng.standard_normal((features, hidden)).astype(np.float32) / np.sqrt(features)
+        self.w2 = rng.standard_normal((hidden, len(SENTIMENT_LABELS))).astype(np.float32) / np.sqrt(hidden)
+        self.calls = 0
+
+    def _featurize(self, texts, max_length):
+        batch = np.zeros((len(texts), self.features), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in text.lower().split()[:max_length]:
+                digest = hashlib.blake2b(token.encode('utf-8'), digest_size=4).digest()
+                batch[row, int.from_bytes(digest, 'little') % self.features] += 1.0
+        return batch
+
+    def __call__(self, texts, batch_size=None, truncation=True, max_length=512, **kwargs):
+        single = isinstance(texts, str)
+        texts = [texts] if single else list(texts)
+        self.calls += 1
+        logits = np.tanh(self._featurize(texts, max_length) @ self.w1) @ self.w2
+        logits -= logits.max(axis=1, keepdims=True)
+        probabilities = np.exp(logits)
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
+        outputs = [
+            {'label': SENTIMENT_LABELS[int(row.argmax())], 'score': float(row.max())}
+            for row in probabilities
+        ]
+        return outputs[0] if single else outputs
+
+class TinyTrendModel:
+    """Keras LSTM modelinin predict_on_batch arayüzünü taklit eden küçük Elman RNN"""
+
+    def __init__(self, hidden=32, seed=0):
+        rng = np.random.default_rng(seed)
+        self.w_in = rng.standard_normal((1, hidden)).astype(np.float32) * 0.5
+        self.w_h = rng.standard_normal((hidden, hidden)).astype(np.float32) / np.sqrt(hidden)
+        self.w_out = rng.standard_normal((hidden, 1)).astype(np.float32) / np.sqrt(hidden)
+        self.calls = 0
+
+    def predict_on_batch(self, batch):
+        """(N, window, 1) girdiden (N, 1) tahmin döndürür"""
+        batch = np.asarray(batch, dtype=np.float32)
+        self.calls += 1
+        state = np.zeros((batch.shape[0], self.w_h.shape[0]), dtype=np.float32)
+        for step in range(batch.shape[1]):
+            state = np.tanh(batch[:, step] @ self.w_in + state @ self.w_h)
+        # Son değerin etrafında küçük bir sapma; ölçeklenmiş [0, 1] aralığında kalır
+        return np.clip(batch[:, -1] + 0.05 * np.tanh(state @ self.w_out), 0.0, 1.0)
+
+class ByteTokenizer:
+    """Sohbet LLM tokenizer'ının üretim motorunun kullandığı kısmını bayt düzeyinde taklit eder"""
+
+    bos_token_id = 1
+    eos_token_id = 2
+    offset = 3
+    vocab_size = 256 + offset
+
+    class _Encoding:
+        def __init__(self, input_ids):
+            self.input_ids = input_ids
+
+    def __call__(self, text, add_special_tokens=True, **kwargs):
+        ids = [byte + self.offset for byte in text.encode('utf-8')]
+        return self._Encoding(([self.bos_token_id] if add_special_tokens else []) + ids)
+
+    def decode(self, ids, skip_special_tokens=True):
+        data = bytes(int(i) - self.offset for i in ids if int(i) >= self.offset)
+        return data.decode('utf-8', errors='ignore')
+
+def tiny_causal_lm(hidden_size=64, layers=2, max_positions=4096, seed=0):
+    """Gerçek mimariyle (Mistral) ama birkaç yüz bin parametreyle rastgele başlatılmış LLM döndürür"""
+    import torch
+    from transformers import MistralConfig, MistralForCausalLM
+    torch.manual_seed(seed)
+    tokenizer = ByteTokenizer()
+    config = MistralConfig(
+        vocab_size=tokenizer.vocab_size,
+        hidden_size=hidden_size,
+        intermediate_size=hidden_size * 2,
+        num_hidden_layers=layers,
+        num_attention_heads=4,
+        num_key_value_heads=2,
+        max_position_embeddings=max_positions,
+        bos_token_id=tokenizer.bos_token_id,
+        eos_token_id=tokenizer.eos_token_id
+    )
+    model = MistralForCausalLM(config).eval()
+    return tokenizer, model
+
+def install_stand_in_models(registry, seed=0):
+    """Kayıt defterindeki sentiment, market_predictor ve chat_llm yükleyicilerini küçük modellerle değiştirir"""
+    registry.register('sentiment', lambda: TinySentimentPipeline(seed=seed))
+    registry.register('market_predictor', lambda: TinyTrendModel(seed=seed))
+    registry.register('chat_llm', lambda: tiny_causal_lm(seed=seed))
+    return registry
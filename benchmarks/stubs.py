@@ -0,0 +1,172 @@
+"""Alpha Vantage ve NewsAPI yanıtlarını taklit eden yerel stub HTTP sunucusu
+
+Kıyaslamalar gerçek API anahtarı ve ağ olmadan, ayarlanabilir upstream gecikmesiyle çalışır.
+Uygulama ALPHA_VANTAGE_BASE_URL ve NEWS_API_BASE_URL ile bu sunucuya yönlendirilir.
+
+Kullanım:
+    python -m benchmarks.stubs --port 8900 --latency-ms 120 --jitter-ms 40
+"""
+import argparse
+import asyncio
+import random
+from collections import Counter
+from datetime import datetime, timedelta
+from aiohttp import web
+
+# Stub'ın kripto olarak fiyatladığı semboller (diğerleri hisse senedidir)
+CRYPTO_SYMBOLS = {'BTC', 'ETH', 'SOL', 'ADA', 'XRP', 'DOGE', 'AVAX', 'DOT'}
+
+HEADLINES = [
+    "{symbol} beklentilerin üzerinde bilanço açıkladı",
+    "{symbol} için analistler hedef fiyatı yükseltti",
+    "{symbol} hisselerinde satış baskısı sürüyor",
+    "Piyasalar faiz kararı öncesi {symbol} tarafında temkinli",
+    "{symbol} yeni yatırım planını duyurdu",
+    "{symbol} işlem hacminde sert artış"
+]
+
+class StubUpstream:
+    """Alpha Vantage GLOBAL_QUOTE / CURRENCY_EXCHANGE_RATE ve NewsAPI everything stub'ı
+
+    Fiyatlar sembol başına tohumlanmış rastgele yürüyüşle her istekte değişir; her yanıt
+    latency ± jitter kadar gecikir. İstek sayıları uç nokta bazında tutulur.
+    """
+
+    def __init__(self, latency=0.05, jitter=0.0, news_latency=None, articles=20, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.news_latency = latency if news_latency is None else news_latency
+        self.articles = articles
+        self._random = random.Random(seed)
+        self._prices = {}
+        self.requests = Counter()
+        self._runner = None
+        self.url = None
+
+    def app(self):
+        app = web.Application()
+        app.router.add_get('/query', self.query)
+        app.router.add_get('/v2/everything', self.everything)
+        return app
+
+    async def start(self, host='127.0.0.1', port=0):
+        """Sunucuyu başlatır ve taban adresini döndürür (port=0 boş bir port seçer)"""
+        self._runner = web.AppRunner(self.app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://{host}:{port}"
+        return self.url
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _delay(self, base):
+        delay = base + self._random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _price(self, symbol):
+        """Sembolün fiyatını küçük bir rastgele adımla ilerletir"""
+        price = self._prices.get(symbol)
+        if price is None:
+            seeded = random.Random(symbol)
+            price = seeded.uniform(20000, 60000) if symbol in CRYPTO_SYMBOLS else seeded.uniform(10, 500)
+        price *= 1 + self._random.gauss(0, 0.002)
+        self._prices[symbol] = price
+        return price
+
+    async def query(self, request):
+        function = request.query.get('function')
+        self.requests[function] += 1
+        await self._delay(self.latency)
+
+        if function == 'GLOBAL_QUOTE':
+            symbol = request.query.get('symbol', '').upper()
+            if symbol in CRYPTO_SYMBOLS:
+                # Alpha Vantage bilinmeyen hisse sembolü için boş sözlük döndürür
+                return web.json_response({'Global Quote': {}})
+            price = self._price(symbol)
+            return web.json_response({'Global Quote': {
+                '01. symbol': symbol,
+                '02. open': f"{price * 0.99:.4f}",
+                '03. high': f"{price * 1.01:.4f}",
+                '04. low': f"{price * 0.98:.4f}",
+                '05. price': f"{price:.4f}",
+                '06. volume': str(self._random.randint(10_000, 5_000_000)),
+                '07. latest trading day': datetime.utcnow().strftime('%Y-%m-%d'),
+                '08. previous close': f"{price * 0.995:.4f}",
+                '09. change': f"{price * 0.005:.4f}",
+                '10. change percent': "0.5000%"
+            }})
+
+        if function == 'CURRENCY_EXCHANGE_RATE':
+            symbol = request.query.get('from_currency', '').upper()
+            if symbol not in CRYPTO_SYMBOLS:
+                return web.json_response({'Error Message': 'Invalid API call.'})
+            price = self._price(symbol)
+            return web.json_response({'Realtime Currency Exchange Rate': {
+                '1. From_Currency Code': symbol,
+                '3. To_Currency Code': request.query.get('to_currency', 'USD'),
+                '5. Exchange Rate': f"{price:.8f}",
+                '6. Last Refreshed': datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S'),
+                '8. Bid Price': f"{price * 0.9995:.8f}",
+                '9. Ask Price': f"{price * 1.0005:.8f}"
+            }})
+
+        return web.json_response({'Error Message': f"Desteklenmeyen fonksiyon: {function}"})
+
+    async def everything(self, request):
+        self.requests['everything'] += 1
+        await self._delay(self.news_latency)
+
+        query = request.query.get('q') or 'Piyasa'
+        symbol = query.split()[0].upper()
+        now = datetime.utcnow()
+        articles = []
+        for i in range(self.articles):
+            title = HEADLINES[i % len(HEADLINES)].format(symbol=symbol)
+            articles.append({
+                'source': {'id': None, 'name': 'Stub Haber'},
+                'author': 'Fintelli Kıyaslama',
+                'title': f"{title} ({i + 1})",
+                'description': f"{title}. Ayrıntılar yatırımcıların gündeminde.",
+                'url': f"https://example.com/{symbol.lower()}/{i + 1}",
+                'publishedAt': (now - timedelta(hours=i)).strftime('%Y-%m-%dT%H:%M:%SZ'),
+                'content': f"{title}. " * 4
+            })
+        return web.json_response({'status': 'ok', 'totalResults': len(articles), 'articles': articles})
+
+    def stats(self):
+        return dict(self.requests)
+
+async def main(args):
+    stub = StubUpstream(
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        news_latency=None if args.news_latency_ms is None else args.news_latency_ms / 1000,
+        articles=args.articles
+    )
+    url = await stub.start(args.host, args.port)
+    print(f"Stub upstream {url} adresinde çalışıyor")
+    print(f"  ALPHA_VANTAGE_BASE_URL={url} NEWS_API_BASE_URL={url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await stub.stop()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--latency-ms', type=float, default=50)
+    parser.add_argument('--jitter-ms', type=float, default=0)
+    parser.add_argument('--news-latency-ms', type=float, default=None)
+    parser.add_argument('--articles', type=int, default=20)
+    try:
+        asyncio.run(main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,5 @@
+# Testler `src.` paket yoluyla import eder; depo kökü sys.path'te olmalıdır
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
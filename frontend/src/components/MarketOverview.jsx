@@ -1,4 +1,4 @@
-import React from 'react';
+import React, { useEffect, useState } from 'react';
 import { 
     Box, 
     Typography, 
@@ -14,8 +14,20 @@ import {
 } from '@mui/material';
 import TrendingUpIcon from '@mui/icons-material/TrendingUp';
 import TrendingDownIcon from '@mui/icons-material/TrendingDown';
+import quoteStream from '../services/api/quotes';
 
 const MarketOverview = ({ data }) => {
+    // Fiyatlar yoklama yerine canlı akıştan güncellenir
+    const [livePrices, setLivePrices] = useState({});
+    const symbols = (data?.topMovers || []).map((stock) => stock.symbol).join(',');
+
+    useEffect(() => {
+        if (!symbols) return undefined;
+        return quoteStream.subscribe(symbols.split(','), (quote) => {
+            setLivePrices((prices) => ({ ...prices, [quote.symbol]: quote.price }));
+        });
+    }, [symbols]);
+
     if (!data) {
         return (
             <Box sx={{ display: 'flex', justifyContent: 'center', alignItems: 'center', height: '200px' }}>
@@ -84,7 +96,7 @@ const MarketOverview = ({ data }) => {
                                     {stock.symbol}
                                 </TableCell>
                                 <TableCell align="right">
-                                    ₺{stock.price.toLocaleString()}
+                                    ₺{(livePrices[stock.symbol.toUpperCase()] ?? stock.price).toLocaleString()}
                                 </TableCell>
                                 <TableCell 
                                     align="right"
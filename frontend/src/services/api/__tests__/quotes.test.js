@@ -0,0 +1,96 @@
+import { QuoteStream } from '../quotes';
+import monitoring from '../../monitoring';
+
+jest.mock('../../monitoring');
+
+class MockWebSocket {
+    static OPEN = 1;
+
+    constructor(url) {
+        this.url = url;
+        this.readyState = 0;
+        this.sent = [];
+        MockWebSocket.instances.push(this);
+    }
+
+    send(data) {
+        this.sent.push(JSON.parse(data));
+    }
+
+    close() {
+        this.readyState = 3;
+    }
+
+    open() {
+        this.readyState = MockWebSocket.OPEN;
+        this.onopen();
+    }
+
+    receive(message) {
+        this.onmessage({ data: JSON.stringify(message) });
+    }
+}
+
+describe('QuoteStream', () => {
+    let stream;
+
+    beforeEach(() => {
+        jest.clearAllMocks();
+        jest.useFakeTimers();
+        MockWebSocket.instances = [];
+        global.WebSocket = MockWebSocket;
+        stream = new QuoteStream('ws://test/ws/quotes');
+    });
+
+    afterEach(() => {
+        stream.close();
+        jest.useRealTimers();
+    });
+
+    it('subscribes on open and delivers quotes to listeners', () => {
+        const onQuote = jest.fn();
+        stream.subscribe(['aapl'], onQuote);
+
+        const socket = MockWebSocket.instances[0];
+        socket.open();
+        expect(socket.sent).toEqual([{ action: 'subscribe', symbols: ['AAPL'] }]);
+
+        socket.receive({ type: 'quotes', data: [{ symbol: 'AAPL', price: 190.5 }] });
+        expect(onQuote).toHaveBeenCalledWith({ symbol: 'AAPL', price: 190.5 });
+    });
+
+    it('shares one connection and unsubscribes unused symbols', () => {
+        const first = jest.fn();
+        const second = jest.fn();
+        const unsubscribeFirst = stream.subscribe(['AAPL'], first);
+        MockWebSocket.instances[0].open();
+        stream.subscribe(['AAPL', 'BTC'], second);
+
+        const socket = MockWebSocket.instances[0];
+        expect(MockWebSocket.instances).toHaveLength(1);
+        expect(socket.sent[1]).toEqual({ action: 'subscribe', symbols: ['BTC'] });
+
+        unsubscribeFirst();
+        expect(socket.sent).toHaveLength(2);
+    });
+
+    it('reconnects with backoff and resubscribes', () => {
+        stream.subscribe(['BTC'], jest.fn());
+        MockWebSocket.instances[0].open();
+        MockWebSocket.instances[0].onclose();
+
+        jest.advanceTimersByTime(1000);
+        expect(MockWebSocket.instances).toHaveLength(2);
+
+        MockWebSocket.instances[1].open();
+        expect(MockWebSocket.instances[1].sent).toEqual([{ action: 'subscribe', symbols: ['BTC'] }]);
+    });
+
+    it('records server errors', () => {
+        stream.subscribe(['AAPL'], jest.fn());
+        MockWebSocket.instances[0].open();
+        MockWebSocket.instances[0].receive({ type: 'error', detail: 'limit' });
+
+        expect(monitoring.recordError).toHaveBeenCalledWith('quote_stream', { message: 'limit' });
+    });
+});
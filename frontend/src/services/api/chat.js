@@ -35,6 +35,70 @@ class ChatAPI {
         }
     }
 
+    /**
+     * Mesaj gönder ve yanıtı üretildikçe al (Server-Sent Events)
+     * @param {Object} params - İstek parametreleri
+     * @param {Function} onToken - Her yeni parça için çağrılır
+     * @returns {Promise<string>} Tam yanıt metni
+     */
+    async streamMessage({ userId, text, context = [] }, onToken) {
+        const startTime = performance.now();
+        let firstToken = true;
+        let fullText = '';
+
+        try {
+            // axios tarayıcıda yanıtı akış olarak okuyamadığı için fetch kullanılır
+            const response = await fetch(`${process.env.REACT_APP_API_URL}/chat/${userId}/stream`, {
+                method: 'POST',
+                credentials: 'include',
+                headers: {
+                    'Accept': 'text/event-stream',
+                    'Content-Type': 'application/json'
+                },
+                body: JSON.stringify({ text, context })
+            });
+
+            if (!response.ok) {
+                const error = new Error(`HTTP ${response.status}`);
+                error.response = { status: response.status };
+                throw error;
+            }
+
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+
+            for (;;) {
+                const { value, done } = await reader.read();
+                if (done) break;
+
+                buffer += decoder.decode(value, { stream: true });
+                const events = buffer.split('\n\n');
+                buffer = events.pop();
+
+                for (const event of events) {
+                    if (event.startsWith('event: done')) continue;
+                    const data = event.replace(/^data: /, '');
+                    if (!data) continue;
+
+                    const { token } = JSON.parse(data);
+                    if (firstToken) {
+                        monitoring.recordApiCall('streamMessageFirstToken', performance.now() - startTime);
+                        firstToken = false;
+                    }
+                    fullText += token;
+                    onToken?.(token, fullText);
+                }
+            }
+
+            monitoring.recordApiCall('streamMessage', performance.now() - startTime);
+            return fullText;
+        } catch (error) {
+            this.handleError(error, 'streamMessage');
+            throw error;
+        }
+    }
+
     /**
      * Konuşma geçmişini getir
      * @param {string} conversationId - Konuşma ID'si
@@ -0,0 +1,131 @@
+import monitoring from '../monitoring';
+
+const RECONNECT_BASE_DELAY = 1000;
+const RECONNECT_MAX_DELAY = 30000;
+
+/**
+ * Canlı fiyat akışı (WebSocket)
+ * Tüm bileşenlerin abonelikleri tek bağlantıda birleştirilir; sunucu her istemciye
+ * saniyede sınırlı sayıda, sembol başına yalnızca son değeri içeren güncelleme gönderir.
+ * Bağlantı koparsa artan beklemeyle yeniden bağlanılır ve abonelikler yenilenir.
+ */
+class QuoteStream {
+    constructor(url) {
+        this.url = url;
+        this.socket = null;
+        this.listeners = new Map();
+        this.latest = new Map();
+        this.retries = 0;
+        this.reconnectTimer = null;
+    }
+
+    getUrl() {
+        return this.url || `${process.env.REACT_APP_API_URL.replace(/^http/, 'ws')}/ws/quotes`;
+    }
+
+    /**
+     * Sembollere abone ol
+     * @param {string[]} symbols - Semboller
+     * @param {Function} onQuote - Her yeni fiyat için çağrılır
+     * @returns {Function} Aboneliği kaldıran fonksiyon
+     */
+    subscribe(symbols, onQuote) {
+        const added = [];
+        symbols.map((symbol) => symbol.toUpperCase()).forEach((symbol) => {
+            if (!this.listeners.has(symbol)) {
+                this.listeners.set(symbol, new Set());
+                added.push(symbol);
+            }
+            this.listeners.get(symbol).add(onQuote);
+            // Bilinen son fiyat hemen iletilir
+            if (this.latest.has(symbol)) onQuote(this.latest.get(symbol));
+        });
+
+        if (!this.socket) {
+            this.connect();
+        } else if (added.length) {
+            this.send({ action: 'subscribe', symbols: added });
+        }
+
+        return () => this.unsubscribe(symbols, onQuote);
+    }
+
+    unsubscribe(symbols, onQuote) {
+        const removed = [];
+        symbols.map((symbol) => symbol.toUpperCase()).forEach((symbol) => {
+            const callbacks = this.listeners.get(symbol);
+            if (!callbacks) return;
+            callbacks.delete(onQuote);
+            if (!callbacks.size) {
+                this.listeners.delete(symbol);
+                this.latest.delete(symbol);
+                removed.push(symbol);
+            }
+        });
+
+        if (!this.listeners.size) {
+            this.close();
+        } else if (removed.length) {
+            this.send({ action: 'unsubscribe', symbols: removed });
+        }
+    }
+
+    connect() {
+        const startTime = performance.now();
+        this.socket = new WebSocket(this.getUrl());
+
+        this.socket.onopen = () => {
+            this.retries = 0;
+            monitoring.recordApiCall('quoteStreamConnect', performance.now() - startTime);
+            this.send({ action: 'subscribe', symbols: [...this.listeners.keys()] });
+        };
+        this.socket.onmessage = (event) => this.handleMessage(event);
+        this.socket.onclose = () => {
+            this.socket = null;
+            if (this.listeners.size) this.scheduleReconnect();
+        };
+    }
+
+    handleMessage(event) {
+        const message = JSON.parse(event.data);
+        if (message.type === 'error') {
+            monitoring.recordError('quote_stream', { message: message.detail });
+            return;
+        }
+        if (message.type !== 'quotes') return;
+
+        message.data.forEach((quote) => {
+            this.latest.set(quote.symbol, quote);
+            this.listeners.get(quote.symbol)?.forEach((onQuote) => onQuote(quote));
+        });
+    }
+
+    scheduleReconnect() {
+        const delay = Math.min(RECONNECT_BASE_DELAY * 2 ** this.retries, RECONNECT_MAX_DELAY);
+        this.retries += 1;
+        this.reconnectTimer = setTimeout(() => {
+            this.reconnectTimer = null;
+            if (this.listeners.size && !this.socket) this.connect();
+        }, delay);
+    }
+
+    send(message) {
+        if (this.socket?.readyState === WebSocket.OPEN) {
+            this.socket.send(JSON.stringify(message));
+        }
+    }
+
+    close() {
+        clearTimeout(this.reconnectTimer);
+        this.reconnectTimer = null;
+        if (this.socket) {
+            const socket = this.socket;
+            this.socket = null;
+            socket.onclose = null;
+            socket.close();
+        }
+    }
+}
+
+export { QuoteStream };
+export default new QuoteStream();
@@ -0,0 +1,98 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from src.utils.tracing import get_tracer
+
+class MicroBatcher:
+    """Eşzamanlı çağrıları dinamik boyutlu partilerde toplayıp event loop dışında işler
+
+    process_batch: öğe listesini alıp aynı sırada sonuç listesi döndüren senkron fonksiyon.
+    Parti, max_batch_size öğeye ulaştığında ya da ilk öğeden max_wait saniye sonra gönderilir.
+    name verilirse her parti model span'ı olarak ölçülür ve partideki isteklerin izlerine eklenir.
+    """
+
+    def __init__(self, process_batch, max_batch_size, max_wait, executor=None, name=None):
+        self.process_batch = process_batch
+        self.name = name
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        # Model çağrıları tek bir işçi iş parçacığında sırayla çalışır
+        self.executor = executor or ThreadPoolExecutor(max_workers=1)
+        self._pending = []
+        self._timer = None
+        # Event loop görevlere yalnızca zayıf referans tutar; işlenen partiler burada saklanır
+        self._running = set()
+
+        self.batches = 0
+        self.items = 0
+
+    async def submit(self, item):
+        """Öğeyi bir sonraki partiye ekler ve kendi sonucunu bekler"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        parent = get_tracer().current_span() if self.name else None
+        self._pending.append((item, future, parent))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        while self._pending:
+            batch = self._pending[:self.max_batch_size]
+            self._pending = self._pending[self.max_batch_size:]
+            task = asyncio.ensure_future(self._run(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch):
+        batch = [entry for entry in batch if not entry[1].cancelled()]
+        if not batch:
+            return
+
+        self.batches += 1
+        self.items += len(batch)
+        tracer = get_tracer()
+        # Parti tek bir isteğe ait değildir; span izden bağımsız ölçülür, sonra isteklerin izlerine eklenir
+        span = tracer.start_span(self.name, kind='model', parent=None, batch_size=len(batch)) if self.name else None
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                self.executor, self.process_batch, [item for item, _, _ in batch]
+            )
+        except Exception as e:
+            if span is not None:
+                tracer.finish_span(span, error=e)
+                self._attach(tracer, span, batch)
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        if span is not None:
+            tracer.finish_span(span)
+            self._attach(tracer, span, batch)
+        for (_, future, _), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    @staticmethod
+    def _attach(tracer, span, batch):
+        """Parti span'ını partide öğesi olan her span'a bir kez ekler"""
+        parents = {id(parent): parent for _, _, parent in batch if parent is not None}
+        for parent in parents.values():
+            tracer.attach(parent, span)
+
+    def stats(self):
+        """Parti sayaçlarını döndürür"""
+        return {
+            'pending': len(self._pending),
+            'running': len(self._running),
+            'batches': self.batches,
+            'items': self.items,
+            'avg_batch_size': self.items / self.batches if self.batches else 0.0
+        }
@@ -1,18 +1,34 @@
-from transformers import AutoTokenizer, AutoModelForCausalLM
-import torch
+import asyncio
+import threading
+import time
+from datetime import datetime
 from src.config import Config
+from src.ai_engine.llm_engine import GenerationEngine, GenerationQueueFullError
+from src.ai_engine.response_cache import get_response_cache
+from src.ai_engine.conversation_store import get_conversation_store
+from src.ai_engine.recognizer import get_recognizer
 from src.ai_engine.market_analyzer import MarketAnalyzer
+from src.ai_engine.model_registry import get_model_registry
 from src.data_collectors.news_collector import NewsCollector
+from src.utils.tracing import get_tracer, current_request_id
 
 class FinancialChatBot:
-    def __init__(self):
-        # LLM modelini yükle
-        self.tokenizer = AutoTokenizer.from_pretrained("mistralai/Mistral-7B-Instruct-v0.2")
-        self.model = AutoModelForCausalLM.from_pretrained("mistralai/Mistral-7B-Instruct-v0.2")
+    def __init__(self, market_analyzer=None, news_collector=None, registry=None, response_cache=None,
+                 conversations=None, platform=None):
+        # LLM paylaşılan kayıt defterinden ilk kullanımda yüklenir
+        self.registry = registry or get_model_registry()
         
-        # Diğer modülleri başlat
-        self.market_analyzer = MarketAnalyzer()
-        self.news_collector = NewsCollector()
+        # Aynı süreçteki diğer bileşenlerle paylaşılan modüller
+        self.news_collector = news_collector or NewsCollector(registry=self.registry)
+        self.market_analyzer = market_analyzer or MarketAnalyzer(self.registry, news_collector=self.news_collector)
+        # Deterministik yanıtlar süreçteki tüm botlarla paylaşılan önbellekte tutulur
+        self.response_cache = response_cache or get_response_cache()
+        # Kullanıcı başına sınırlı konuşma hafızası
+        self.conversations = conversations or get_conversation_store()
+        # Bot platformu ('telegram'/'discord'); None ise kullanıcılar API'nin users tablosundandır
+        self.platform = platform
+        # Sembol evreninden bir kez derlenen sembol/amaç tanıyıcı
+        self.recognizer = get_recognizer()
         
         # Sistem promptu
         self.system_prompt = """Sen Fintelli'nin yapay zeka destekli finansal asistanısın. 
@@ -21,49 +37,155 @@ class FinancialChatBot:
         durumunda daha fazla bilgi iste. Asla kesin yatırım tavsiyesi verme, bunun yerine 
         analiz ve önerilerde bulun."""
         
+        # Üretim motoru LLM ilk kez gerektiğinde oluşturulur
+        self._engine = None
+        self._engine_lock = threading.Lock()
+        
+    @property
+    def tokenizer(self):
+        return self.registry.get('chat_llm')[0]
+        
+    @property
+    def model(self):
+        return self.registry.get('chat_llm')[1]
+        
+    def get_engine(self):
+        """Sistem promptu önbelleğe alınmış paylaşılan üretim motorunu döndürür"""
+        with self._engine_lock:
+            if self._engine is None:
+                tokenizer, model = self.registry.get('chat_llm')
+                self._engine = GenerationEngine(tokenizer, model, prefix=self._prompt_prefix())
+            return self._engine
+            
+    def close(self):
+        """Üretim motorunu durdurur"""
+        if self._engine is not None:
+            self._engine.stop()
+            
+    def engine_stats(self):
+        """Üretim motoru sayaçlarını döndürür (motor henüz oluşturulmadıysa None)"""
+        return self._engine.stats() if self._engine is not None else None
+        
     async def generate_response(self, user_id: int, message: str, context: list = None):
         """Kullanıcı mesajına yanıt üretir"""
+        chunks = []
+        async for chunk in self.stream_response(user_id, message, context):
+            chunks.append(chunk)
+        return "".join(chunks)
+        
+    async def stream_response(self, user_id: int, message: str, context: list = None):
+        """Kullanıcı mesajına yanıtı üretildikçe parça parça döndürür
+
+        Bağlam verilmezse kullanıcının sunucudaki konuşma hafızası kullanılır; her iki durumda
+        da bağlam token bütçesine sığdırılır ve tamamlanan tur hafızaya kaydedilir.
+        """
         try:
-            # Mesaj içeriğini analiz et
-            intent = self._analyze_intent(message)
-            
-            # Bağlama göre yanıt oluştur
-            if intent == "MARKET_ANALYSIS":
-                response = await self._handle_market_analysis(message)
-            elif intent == "PORTFOLIO_ADVICE":
-                response = await self._handle_portfolio_advice(user_id, message)
-            elif intent == "NEWS_QUERY":
-                response = await self._handle_news_query(message)
+            if context:
+                context = self.conversations.fit(context)
             else:
-                response = await self._generate_general_response(message, context)
+                context = await self.conversations.build_context(user_id, platform=self.platform)
                 
-            return response
+            # Mesajdaki amaç ve sembol tek geçişte tanınır
+            recognition = self.recognizer.recognize(message)
+            intent = self.recognizer.best_intent(recognition)
+            symbol = self.recognizer.best_symbol(recognition)
             
+            # Bağlama göre yanıt oluştur; yalnızca LLM yanıtları token token akar
+            chunks = []
+            with get_tracer().span(f"chat.{(intent or 'general').lower()}", symbol=symbol):
+                if intent == "MARKET_ANALYSIS":
+                    chunks.append(await self._handle_market_analysis(message, symbol))
+                    yield chunks[-1]
+                elif intent == "PORTFOLIO_ADVICE":
+                    chunks.append(await self._handle_portfolio_advice(user_id, message, symbol))
+                    yield chunks[-1]
+                elif intent == "NEWS_QUERY":
+                    chunks.append(await self._handle_news_query(message, symbol))
+                    yield chunks[-1]
+                else:
+                    async for chunk in self._stream_general_response(message, context):
+                        chunks.append(chunk)
+                        yield chunk
+                        
+            self.conversations.record(user_id, "user", message, platform=self.platform)
+            self.conversations.record(user_id, "assistant", "".join(chunks), platform=self.platform)
+            
+        except GenerationQueueFullError:
+            yield "Şu anda çok fazla istek var, lütfen birazdan tekrar deneyin."
         except Exception as e:
-            print(f"Chat yanıt hatası: {e}")
-            return "Üzgünüm, şu anda yanıt üretirken bir sorun oluştu. Lütfen tekrar deneyin."
+            print(f"Chat yanıt hatası [{current_request_id()}]: {e}")
+            yield "Üzgünüm, şu anda yanıt üretirken bir sorun oluştu. Lütfen tekrar deneyin."
             
+    def _prompt_prefix(self) -> str:
+        """Tüm konuşmalarda ortak olan, KV önbelleği bir kez hesaplanan prompt başlangıcı"""
+        return f"[INST] {self.system_prompt}\n\n"
+        
+    def _build_prompt(self, message: str, context: list = None) -> str:
+        """Önceki konuşma ve mesajdan sistem promptunun devamını oluşturur (Mistral talimat formatı)"""
+        history = []
+        for turn in context or []:
+            if isinstance(turn, dict) and turn.get('role') == 'summary':
+                history.append(f"({turn.get('content', '')})")
+            elif isinstance(turn, dict):
+                role = "Kullanıcı" if turn.get('role', 'user') == 'user' else "Asistan"
+                history.append(f"{role}: {turn.get('content', '')}")
+            else:
+                history.append(str(turn))
+                
+        conversation = "\n".join(history)
+        if conversation:
+            conversation += "\n"
+        return f"{conversation}Kullanıcı: {message} [/INST]"
+        
+    async def _generate_general_response(self, message: str, context: list = None):
+        """Genel sorulara LLM ile yanıt üretir"""
+        chunks = []
+        async for chunk in self._stream_general_response(message, context):
+            chunks.append(chunk)
+        return "".join(chunks)
+        
+    async def _stream_general_response(self, message: str, context: list = None):
+        """LLM çıktısını üretildikçe döndürür; eşzamanlı konuşmalar aynı partide üretilir"""
+        engine = await asyncio.to_thread(self.get_engine)
+        # Kuyrukta bekleme dahil üretim süresi; ilk parça süresi ayrıca işaretlenir
+        with get_tracer().span("chat_llm.generate", kind='model') as span:
+            chunks = 0
+            async for chunk in engine.stream(self._build_prompt(message, context)):
+                if not chunks:
+                    span.set(first_chunk_ms=round((time.perf_counter() - span.started) * 1000, 1))
+                chunks += 1
+                yield chunk
+            span.set(chunks=chunks)
+            
+    async def _handle_news_query(self, message: str, symbol: str = None):
+        """Haber sorularına ilgili haberlerin özetiyle yanıt verir"""
+        symbol = symbol or self._extract_symbol(message)
+        news = await self.news_collector.get_financial_news(symbol, days=1)
+        if not news:
+            return "Şu anda ilgili bir haber bulunamadı."
+            
+        lines = [f"{symbol or 'Piyasa'} ile ilgili son haberler:"]
+        for article in news[:5]:
+            lines.append(f"- {article['title']} ({article['sentiment']['label']})")
+        return "\n".join(lines)
+        
     def _analyze_intent(self, message: str) -> str:
         """Kullanıcı mesajının amacını analiz eder"""
-        message = message.lower()
-        
-        if any(word in message for word in ["fiyat", "trend", "analiz", "tahmin"]):
-            return "MARKET_ANALYSIS"
-        elif any(word in message for word in ["portföy", "yatırım", "al", "sat"]):
-            return "PORTFOLIO_ADVICE"
-        elif any(word in message for word in ["haber", "gelişme", "duyuru"]):
-            return "NEWS_QUERY"
-        else:
-            return "GENERAL"
-            
-    async def _handle_market_analysis(self, message: str):
+        return self.recognizer.best_intent(self.recognizer.recognize(message))
+        
+    async def _handle_market_analysis(self, message: str, symbol: str = None):
         """Piyasa analizi ile ilgili sorulara yanıt verir"""
         # Sembolü mesajdan çıkar
-        symbol = self._extract_symbol(message)
+        symbol = symbol or self._extract_symbol(message)
         if not symbol:
             return "Hangi hisse senedi veya kripto para hakkında bilgi almak istersiniz?"
             
-        # Analiz yap
+        return await self.response_cache.get_or_compute(
+            "MARKET_ANALYSIS", symbol, lambda: self._market_analysis_response(symbol)
+        )
+        
+    async def _market_analysis_response(self, symbol: str):
+        """Sembolün analiz yanıtını ve önbellekte kalabileceği süreyi döndürür"""
         trend_analysis = await self.market_analyzer.analyze_trend(symbol)
         
         response = f"{symbol} için piyasa analizi:\n"
@@ -72,30 +194,61 @@ class FinancialChatBot:
             response += f"Güven Seviyesi: %{trend_analysis['confidence']*100:.2f}\n"
             if trend_analysis['prediction']:
                 response += f"Tahmin Edilen Fiyat: {trend_analysis['prediction']:.2f}\n"
+            
+            indicators = trend_analysis.get('indicators') or {}
+            if indicators.get('rsi') is not None:
+                response += f"RSI({self.market_analyzer.indicators.rsi_period}): {indicators['rsi']:.1f}\n"
+            if indicators.get('macd_histogram') is not None:
+                response += f"MACD: {indicators['macd']:.4f} (sinyal: {indicators['macd_signal']:.4f})\n"
+            if indicators.get('bollinger_middle') is not None:
+                response += f"Bollinger: {indicators['bollinger_lower']:.2f} - {indicators['bollinger_upper']:.2f}\n"
+            if indicators.get('vwap') is not None:
+                response += f"VWAP: {indicators['vwap']:.2f}\n"
+            if any(indicators.get(key) is not None for key in ('sma', 'rsi', 'macd', 'vwap')):
+                # Göstergeler her fiyatla değiştiğinden yanıt fiyat önbelleği süresinden uzun tutulmaz
+                return response, min(self._freshness_ttl(trend_analysis), Config.QUOTE_TTL_STOCK)
                 
-        return response
+        return response, self._freshness_ttl(trend_analysis)
         
-    async def _handle_portfolio_advice(self, user_id: int, message: str):
+    async def _handle_portfolio_advice(self, user_id: int, message: str, symbol: str = None):
         """Portföy tavsiyeleri ile ilgili sorulara yanıt verir"""
-        symbol = self._extract_symbol(message)
+        symbol = symbol or self._extract_symbol(message)
         if symbol:
-            advice = await self.market_analyzer.get_investment_advice(user_id, symbol)
+            # Tavsiye kullanıcının portföyüne bağlı olduğundan kayıt kullanıcıya özeldir
+            advice = await self.response_cache.get_or_compute(
+                "PORTFOLIO_ADVICE", symbol, lambda: self._portfolio_advice_response(user_id, symbol),
+                user_id=user_id
+            )
             if advice:
-                return f"""
+                return advice
+        
+        return "Portföyünüz hakkında daha spesifik bilgi verebilir misiniz?"
+        
+    async def _portfolio_advice_response(self, user_id: int, symbol: str):
+        """Kullanıcının sembol için tavsiye yanıtını ve önbellekte kalabileceği süreyi döndürür"""
+        advice = await self.market_analyzer.get_investment_advice(user_id, symbol)
+        if not advice:
+            return None, 0
+            
+        response = f"""
                 {symbol} için yatırım analizi:
                 Önerilen Aksiyon: {advice['action']}
                 Gerekçe: {advice['reasoning']}
                 Risk Seviyesi: {advice['risk_level']}
                 """
+        # Portföy ve fiyat da değişebileceği için fiyat önbelleği süresiyle sınırlanır
+        return response, min(self._freshness_ttl(advice.get('trend')), Config.QUOTE_TTL_STOCK)
         
-        return "Portföyünüz hakkında daha spesifik bilgi verebilir misiniz?"
+    def _freshness_ttl(self, trend_analysis) -> float:
+        """Yanıtın, dayandığı tahmin bir sonraki kez yenilenene kadar geçerli kalacağı süre"""
+        if not trend_analysis:
+            return 0
+        generated_at = trend_analysis.get('generated_at')
+        if generated_at is None:
+            return Config.RESPONSE_CACHE_MIN_TTL
+        remaining = Config.FORECAST_INTERVAL - (datetime.utcnow() - generated_at).total_seconds()
+        return max(Config.RESPONSE_CACHE_MIN_TTL, min(Config.RESPONSE_CACHE_MAX_TTL, remaining))
         
     def _extract_symbol(self, message: str) -> str:
-        """Mesajdan hisse/kripto sembolünü çıkarır"""
-        # Bu fonksiyon geliştirilecek
-        # Şimdilik basit bir implementasyon
-        words = message.upper().split()
-        for word in words:
-            if word.isalpha() and len(word) <= 5:
-                return word
-        return None 
\ No newline at end of file
+        """Mesajdan sembol evrenindeki en olası hisse/kripto sembolünü çıkarır"""
+        return self.recognizer.best_symbol(self.recognizer.recognize(message)) 
\ No newline at end of file
@@ -0,0 +1,252 @@
+import asyncio
+from collections import OrderedDict, deque
+from datetime import datetime
+from sqlalchemy import insert, select
+from src.config import Config
+from src.database.models import ChatMessage, User
+from src.database.queries import get_user_chat_history
+from src.database.session import get_engine
+
+# users.id 32 bit tamsayıdır; daha büyük kimlikler sorguya girerse Postgres'te tüm işlem hata verir
+_MAX_USER_ID = 2 ** 31 - 1
+
+def estimate_tokens(text):
+    """Tokenizer yüklemeden yaklaşık token sayısı (Türkçe metinde ~3 karakter/token)"""
+    return len(text) // 3 + 1
+
+class ConversationStore:
+    """Kullanıcı başına son konuşma turlarını sınırlı halka tamponda tutar ve toplu olarak kalıcılaştırır
+
+    Prompt bağlamı sabit bir token bütçesiyle oluşturulur; bütçeye sığmayan eski turlar kısa bir
+    özete indirilir, özet de sığmazsa atılır.
+    """
+
+    def __init__(self, engine=None, max_turns=None, max_users=None, token_budget=None,
+                 summary_tokens=None, batch_size=None, flush_interval=None, count_tokens=None):
+        self._engine = engine
+        self.max_turns = max_turns or Config.CONVERSATION_MAX_TURNS
+        self.max_users = max_users or Config.CONVERSATION_MAX_USERS
+        self.token_budget = token_budget or Config.CONVERSATION_TOKEN_BUDGET
+        self.summary_tokens = Config.CONVERSATION_SUMMARY_TOKENS if summary_tokens is None else summary_tokens
+        self.batch_size = batch_size or Config.CONVERSATION_BATCH_SIZE
+        self.flush_interval = flush_interval or Config.CONVERSATION_FLUSH_INTERVAL
+        self.count_tokens = count_tokens or estimate_tokens
+
+        # user_id -> deque[tur]; en uzun süre konuşmayan kullanıcı önce çıkarılır
+        self._buffers = OrderedDict()
+        # Veritabanından geçmişi yüklenmiş kullanıcılar
+        self._loaded = set()
+        self._pending = []
+        self._wakeup = None
+        self._writer = None
+
+        self.recorded = 0
+        self.written = 0
+        self.memory_only = 0
+        self.flushes = 0
+        self.flush_errors = 0
+        self.dropped = 0
+        self.evictions = 0
+        self.summarized = 0
+
+    @property
+    def engine(self):
+        return self._engine or get_engine()
+
+    def start(self):
+        """Kalıcılaştırma görevini başlatır"""
+        if self._writer is None or self._writer.done():
+            self._wakeup = asyncio.Event()
+            self._writer = asyncio.ensure_future(self._write_loop())
+
+    async def stop(self):
+        """Bekleyen turları yazıp görevi durdurur"""
+        if self._writer is not None:
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+            self._writer = None
+        await self.flush()
+
+    @staticmethod
+    def _key(user_id, platform):
+        # Bot kimlikleri API kullanıcılarının id'leriyle çakışabilir; platformla birlikte anahtarlanır
+        return user_id if platform is None else (platform, user_id)
+
+    def _buffer(self, key):
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = self._buffers[key] = deque(maxlen=self.max_turns)
+            while len(self._buffers) > self.max_users:
+                evicted, _ = self._buffers.popitem(last=False)
+                self._loaded.discard(evicted)
+                self.evictions += 1
+        self._buffers.move_to_end(key)
+        return buffer
+
+    def record(self, user_id, role, content, platform=None):
+        """Turu hafızaya ekler; API kullanıcılarının turlarını kalıcılaştırma kuyruğuna alır
+
+        Bot platformlarının (platform verilmişse) kullanıcıları users tablosunda yoktur ve kimlikleri
+        (Discord/Telegram) 32 bit tamsayıya sığmayabilir; onların turları yalnızca hafızada tutulur.
+        """
+        turn = {'role': role, 'content': content, 'created_at': datetime.utcnow()}
+        self._buffer(self._key(user_id, platform)).append(turn)
+        self.recorded += 1
+        if platform is not None:
+            self.memory_only += 1
+            return
+        self._pending.append({'user_id': user_id, **turn})
+        if len(self._pending) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+
+    async def turns(self, user_id, platform=None):
+        """Kullanıcının son turlarını eskiden yeniye döndürür; gerekirse veritabanından yükler"""
+        key = self._key(user_id, platform)
+        if platform is not None:
+            return list(self._buffer(key))
+        if key not in self._loaded:
+            # Aynı kullanıcı için eşzamanlı ikinci yükleme yapılmaz
+            self._loaded.add(key)
+            try:
+                rows = await get_user_chat_history(user_id, limit=self.max_turns)
+            except Exception as e:
+                print(f"Sohbet geçmişi yükleme hatası: {e}")
+                rows = []
+            buffer = self._buffer(key)
+            # Yüklemeden önce kaydedilen turların bir kısmı çoktan yazılmış olabilir; aynı tur iki kez eklenmez
+            turns = [
+                {'role': row['role'], 'content': row['content'], 'created_at': row['created_at']}
+                for row in reversed(rows)
+            ]
+            seen = {(turn['role'], turn['content'], turn['created_at']) for turn in turns}
+            turns.extend(
+                turn for turn in buffer
+                if (turn['role'], turn['content'], turn['created_at']) not in seen
+            )
+            buffer.clear()
+            buffer.extend(sorted(turns, key=lambda turn: turn['created_at']))
+        return list(self._buffer(key))
+
+    async def build_context(self, user_id, budget=None, platform=None):
+        """Kullanıcının hafızasından token bütçesine sığan prompt bağlamını oluşturur"""
+        return self.fit(await self.turns(user_id, platform), budget)
+
+    def fit(self, turns, budget=None):
+        """Turları bütçeye sığdırır: en yeni turlar korunur, eskileri özetlenir ya da atılır"""
+        budget = budget or self.token_budget
+        turns = [
+            turn if isinstance(turn, dict) else {'role': 'user', 'content': str(turn)}
+            for turn in turns or []
+        ]
+        costs = [self.count_tokens(turn.get('content', '')) for turn in turns]
+        if sum(costs) <= budget:
+            return turns
+
+        limit = budget - self.summary_tokens
+        kept = 0
+        used = 0
+        for cost in reversed(costs):
+            if used + cost > limit:
+                break
+            used += cost
+            kept += 1
+
+        dropped = turns[:len(turns) - kept]
+        context = turns[len(turns) - kept:] if kept else []
+        summary = self._summarize(dropped)
+        if summary:
+            self.summarized += 1
+            context = [{'role': 'summary', 'content': summary}] + context
+        return context
+
+    def _summarize(self, turns):
+        """Atılan turlardaki kullanıcı sorularından özet bütçesine sığan kısa bir konu özeti çıkarır"""
+        if self.summary_tokens <= 0:
+            return None
+        questions = [
+            " ".join(turn.get('content', '').split())[:80]
+            for turn in turns
+            if turn.get('role', 'user') == 'user' and turn.get('content')
+        ]
+        if not questions:
+            return None
+
+        summary = "Önceki konuşmada sorulanlar: "
+        # En yeni sorulardan başlanır; sığmayan soru kısaltılır ve özet orada biter
+        for question in reversed(questions):
+            part = question if summary.endswith(": ") else f"; {question}"
+            fits = self.count_tokens(summary + part) <= self.summary_tokens
+            while part and self.count_tokens(summary + part + "…") > self.summary_tokens:
+                part = part[:-8]
+            if not fits:
+                if len(part.strip("; ")) >= 10:
+                    summary += part.rstrip() + "…"
+                break
+            summary += part
+        return None if summary.endswith(": ") else summary
+
+    async def _write_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self):
+        """Bekleyen turları tek işlemde çoklu satır insert ile yazar"""
+        if not self._pending:
+            return
+        rows, self._pending = self._pending, []
+        try:
+            async with self.engine.begin() as conn:
+                # Silinmiş kullanıcıların turları yazılmaz; yalnızca hafızada kalır
+                user_ids = {row['user_id'] for row in rows if 0 < row['user_id'] <= _MAX_USER_ID}
+                known = set((await conn.execute(select(User.id).where(User.id.in_(user_ids)))).scalars())
+                persisted = [row for row in rows if row['user_id'] in known]
+                if persisted:
+                    await conn.execute(insert(ChatMessage.__table__), persisted)
+        except Exception as e:
+            print(f"Sohbet geçmişi yazma hatası: {e}")
+            self.flush_errors += 1
+            # Bir sonraki turda yeniden denenir; veritabanı uzun süre erişilemezse en eski turlar atılır
+            self._pending = rows + self._pending
+            overflow = len(self._pending) - self.max_users * self.max_turns
+            if overflow > 0:
+                del self._pending[:overflow]
+                self.dropped += overflow
+            return
+
+        self.flushes += 1
+        self.written += len(persisted)
+        self.memory_only += len(rows) - len(persisted)
+
+    def stats(self):
+        """Hafıza ve kalıcılaştırma sayaçlarını döndürür"""
+        return {
+            'users': len(self._buffers),
+            'max_users': self.max_users,
+            'pending': len(self._pending),
+            'recorded': self.recorded,
+            'written': self.written,
+            'memory_only': self.memory_only,
+            'flushes': self.flushes,
+            'flush_errors': self.flush_errors,
+            'dropped': self.dropped,
+            'evictions': self.evictions,
+            'summarized': self.summarized
+        }
+
+# Süreç genelinde paylaşılan sohbet hafızası
+_conversation_store = None
+
+def get_conversation_store():
+    """Paylaşılan sohbet hafızasını döndürür"""
+    global _conversation_store
+    if _conversation_store is None:
+        _conversation_store = ConversationStore()
+    return _conversation_store
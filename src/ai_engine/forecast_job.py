@@ -0,0 +1,104 @@
+import asyncio
+import time
+from src.config import Config
+
+class ForecastJob:
+    """Takip edilen semboller için trend tahminlerini toplu üretip forecasts tablosuna yazar
+
+    Tam tarama Config.FORECAST_INTERVAL aralığıyla yapılır; yeni bar gelen semboller
+    mark_dirty() ile işaretlenir ve kısa bir bekleme sonrasında ayrıca yenilenir.
+    """
+
+    def __init__(self, market_analyzer, forecast_store, symbols_loader=None, interval=None, debounce=None,
+                 on_written=None):
+        self.analyzer = market_analyzer
+        self.store = forecast_store
+        self.symbols_loader = symbols_loader
+        # Yeni tahminler yazıldığında sembol listesiyle çağrılır (ör. yanıt önbelleğini geçersiz kılmak için)
+        self.on_written = on_written
+        self.interval = interval or Config.FORECAST_INTERVAL
+        self.debounce = Config.FORECAST_DIRTY_DEBOUNCE if debounce is None else debounce
+        self._dirty = set()
+        self._wakeup = None
+        self._task = None
+
+        self.runs = 0
+        self.forecasts_written = 0
+        self.last_run_seconds = None
+
+    def start(self):
+        """Zamanlanmış tahmin döngüsünü başlatır"""
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        """Tahmin döngüsünü durdurur"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def mark_dirty(self, symbol):
+        """Sembole yeni bar geldiğini bildirir; tahmini bir sonraki kısa turda yenilenir"""
+        self._dirty.add(symbol.upper())
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _tracked_symbols(self):
+        if self.symbols_loader is None:
+            return set()
+        return {symbol.upper() for symbol in await self.symbols_loader()}
+
+    async def run_once(self, symbols=None):
+        """Verilen (ya da takip edilen tüm) semboller ve işaretli semboller için tahmin üretir"""
+        started = time.perf_counter()
+        symbols = set(symbols) if symbols is not None else await self._tracked_symbols()
+        symbols |= self._dirty
+        self._dirty.clear()
+        if not symbols:
+            return {}
+
+        # Tablodaki eski değerler değil, canlı çıkarım kullanılmalı
+        trends = await self.analyzer.analyze_trends(sorted(symbols), use_forecasts=False, with_indicators=False)
+        forecasts = {symbol: trend for symbol, trend in trends.items() if trend is not None}
+        await self.store.write(forecasts)
+        if self.on_written is not None and forecasts:
+            self.on_written(list(forecasts))
+
+        self.runs += 1
+        self.forecasts_written += len(forecasts)
+        self.last_run_seconds = time.perf_counter() - started
+        return forecasts
+
+    async def _run(self):
+        next_full_run = 0.0
+        while True:
+            full_run = time.monotonic() >= next_full_run
+            # Tur sırasında gelen mark_dirty() sinyali kaybolmasın diye olay turdan önce temizlenir
+            self._wakeup.clear()
+            try:
+                await self.run_once(None if full_run else set())
+            except Exception as e:
+                print(f"Tahmin işi hatası: {e}")
+            if full_run:
+                next_full_run = time.monotonic() + self.interval
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(0.0, next_full_run - time.monotonic()))
+                # Aynı anda gelen diğer barların da bu tura katılması için kısa bekle
+                await asyncio.sleep(self.debounce)
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self):
+        """İş sayaçlarını döndürür"""
+        return {
+            'runs': self.runs,
+            'forecasts_written': self.forecasts_written,
+            'pending_dirty': len(self._dirty),
+            'last_run_seconds': self.last_run_seconds
+        }
@@ -0,0 +1,342 @@
+import time
+from datetime import datetime
+import numpy as np
+from src.config import Config
+
+# Sembol başına durum satırının sütunları
+(_COUNT, _SUM, _SUMSQ, _EMA, _FAST, _SLOW, _SIGNAL, _MACD_COUNT, _GAIN, _LOSS,
+ _LAST, _LAST_TS, _SESSION, _CUM_PV, _CUM_V, _LAST_CUM_VOLUME, _SINCE_RECOMPUTE) = range(17)
+_FIELDS = 17
+
+# Kayan toplamlar bu kadar güncellemede bir tampondan yeniden hesaplanır (kayan nokta birikimine karşı)
+_RECOMPUTE_EVERY = 1024
+# Vektörel EMA hesabında üstel ağırlıkların taşmaması için parça uzunluğu
+_EMA_CHUNK = 256
+_EPOCH = datetime(1970, 1, 1)
+
+def _ema_step(previous, value, n, alpha, period):
+    """Tek adım EMA: ilk `period` değerde kümülatif ortalama (tohum), sonra üstel düzeltme"""
+    if n <= period:
+        return previous + (value - previous) / n
+    return previous + alpha * (value - previous)
+
+def _ema_series(values, period, alpha):
+    """_ema_step ile birebir aynı sonucu veren vektörel EMA serisi"""
+    values = np.asarray(values, dtype=np.float64)
+    out = np.empty_like(values)
+    seed = min(period, len(values))
+    if seed == 0:
+        return out
+    out[:seed] = np.cumsum(values[:seed]) / np.arange(1, seed + 1)
+
+    # e_k = (1-a)^k * (e_0 + sum_j a * x_j / (1-a)^j); parça parça uygulanır
+    previous = out[seed - 1]
+    decay = 1.0 - alpha
+    for start in range(seed, len(values), _EMA_CHUNK):
+        chunk = values[start:start + _EMA_CHUNK]
+        powers = decay ** np.arange(1, len(chunk) + 1)
+        out[start:start + len(chunk)] = powers * (previous + np.cumsum(alpha * chunk / powers))
+        previous = out[start + len(chunk) - 1]
+    return out
+
+def _tick_volumes(cumulative):
+    """Seans içi kümülatif hacmi tik başına hacme çevirir; sayaç sıfırlanırsa ham değer alınır"""
+    deltas = np.diff(cumulative, prepend=0.0)
+    reset = deltas < 0
+    deltas[reset] = cumulative[reset]
+    return deltas
+
+class IndicatorEngine:
+    """Semboller için teknik göstergeleri artımlı olarak hesaplar
+
+    Her sembolün durumu sabit boyutlu NumPy dizilerinde bir satırdır: fiyat halka tamponu
+    (SMA/Bollinger penceresi) ve kayan toplamlar, EMA/MACD/RSI(Wilder) düzeltme değerleri ile
+    seans VWAP birikimleri. Yeni tik O(1) işlenir; geçmişten başlatma vektörel yapılır ve
+    tik tik güncellemeyle aynı sonucu verir. Sembol sayısı sınırlıdır; en uzun süre
+    güncellenmeyen sembol çıkarılır.
+
+    Hacimler Alpha Vantage'daki gibi seans içi kümülatif kabul edilir (cumulative_volume=True);
+    tik hacmi ardışık değerlerin farkıdır.
+    """
+
+    def __init__(self, window=None, ema_period=None, rsi_period=None, macd_fast=None, macd_slow=None,
+                 macd_signal=None, bollinger_std=None, max_symbols=None, cumulative_volume=True,
+                 initial_capacity=256):
+        self.window = window or Config.INDICATOR_WINDOW
+        self.ema_period = ema_period or Config.INDICATOR_EMA_PERIOD
+        self.rsi_period = rsi_period or Config.INDICATOR_RSI_PERIOD
+        self.macd_fast = macd_fast or Config.INDICATOR_MACD_FAST
+        self.macd_slow = macd_slow or Config.INDICATOR_MACD_SLOW
+        self.macd_signal = macd_signal or Config.INDICATOR_MACD_SIGNAL
+        self.bollinger_std = bollinger_std or Config.INDICATOR_BOLLINGER_STD
+        self.max_symbols = max_symbols or Config.INDICATOR_MAX_SYMBOLS
+        self.cumulative_volume = cumulative_volume
+
+        self._alpha_ema = 2.0 / (self.ema_period + 1)
+        self._alpha_fast = 2.0 / (self.macd_fast + 1)
+        self._alpha_slow = 2.0 / (self.macd_slow + 1)
+        self._alpha_signal = 2.0 / (self.macd_signal + 1)
+        self._alpha_rsi = 1.0 / self.rsi_period
+
+        capacity = min(initial_capacity, self.max_symbols)
+        self._prices = np.full((capacity, self.window), np.nan)
+        self._state = np.zeros((capacity, _FIELDS))
+        self._touched = np.full(capacity, np.inf)
+        self._slots = {}
+        self._free = list(range(capacity - 1, -1, -1))
+
+        self.updates = 0
+        self.stale = 0
+        self.bootstraps = 0
+        self.evictions = 0
+
+    def __contains__(self, symbol):
+        return symbol.upper() in self._slots
+
+    def __len__(self):
+        return len(self._slots)
+
+    def _grow(self):
+        capacity = len(self._state)
+        extra = min(capacity, self.max_symbols - capacity)
+        self._prices = np.vstack([self._prices, np.full((extra, self.window), np.nan)])
+        self._state = np.vstack([self._state, np.zeros((extra, _FIELDS))])
+        self._touched = np.concatenate([self._touched, np.full(extra, np.inf)])
+        self._free.extend(range(capacity + extra - 1, capacity - 1, -1))
+
+    def _allocate(self, symbol):
+        if not self._free:
+            if len(self._state) < self.max_symbols:
+                self._grow()
+            else:
+                self._evict()
+        slot = self._free.pop()
+        self._prices[slot] = np.nan
+        self._state[slot] = 0.0
+        self._slots[symbol] = slot
+        return slot
+
+    def _evict(self):
+        slot = int(np.argmin(self._touched))
+        symbol = next(name for name, index in self._slots.items() if index == slot)
+        self.remove(symbol)
+        self.evictions += 1
+
+    def _slot(self, symbol):
+        slot = self._slots.get(symbol)
+        if slot is None:
+            slot = self._allocate(symbol)
+        self._touched[slot] = time.monotonic()
+        return slot
+
+    def remove(self, symbol):
+        """Sembolün durumunu siler"""
+        slot = self._slots.pop(symbol.upper(), None)
+        if slot is not None:
+            self._touched[slot] = np.inf
+            self._free.append(slot)
+
+    def update(self, symbol, price, volume=None, timestamp=None):
+        """Yeni tiki O(1) işler; zaman damgası son işlenenden eski ya da aynıysa atlanır"""
+        symbol = symbol.upper()
+        ts = _seconds(timestamp)
+        slot = self._slot(symbol)
+        # Satır Python listesi üzerinde güncellenip tek atamayla geri yazılır
+        state = self._state[slot].tolist()
+        if ts is not None and state[_COUNT] and ts <= state[_LAST_TS]:
+            self.stale += 1
+            return False
+
+        price = float(price)
+        count = state[_COUNT] + 1
+        n = int(count)
+
+        # Halka tampon ve kayan toplamlar
+        head = (n - 1) % self.window
+        old = float(self._prices[slot, head])
+        self._prices[slot, head] = price
+        if n > self.window:
+            state[_SUM] += price - old
+            state[_SUMSQ] += price * price - old * old
+        else:
+            state[_SUM] += price
+            state[_SUMSQ] += price * price
+        state[_SINCE_RECOMPUTE] += 1
+        if state[_SINCE_RECOMPUTE] >= _RECOMPUTE_EVERY:
+            ring = self._prices[slot]
+            state[_SUM] = float(np.nansum(ring))
+            state[_SUMSQ] = float(np.nansum(ring * ring))
+            state[_SINCE_RECOMPUTE] = 0
+
+        # EMA ve MACD
+        state[_EMA] = _ema_step(state[_EMA], price, n, self._alpha_ema, self.ema_period)
+        state[_FAST] = _ema_step(state[_FAST], price, n, self._alpha_fast, self.macd_fast)
+        state[_SLOW] = _ema_step(state[_SLOW], price, n, self._alpha_slow, self.macd_slow)
+        if n >= self.macd_slow:
+            state[_MACD_COUNT] += 1
+            state[_SIGNAL] = _ema_step(
+                state[_SIGNAL], state[_FAST] - state[_SLOW], int(state[_MACD_COUNT]),
+                self._alpha_signal, self.macd_signal
+            )
+
+        # RSI (Wilder düzeltmesi)
+        if n > 1:
+            change = price - state[_LAST]
+            state[_GAIN] = _ema_step(state[_GAIN], max(change, 0.0), n - 1, self._alpha_rsi, self.rsi_period)
+            state[_LOSS] = _ema_step(state[_LOSS], max(-change, 0.0), n - 1, self._alpha_rsi, self.rsi_period)
+
+        # Seans VWAP'ı; seans UTC günüdür
+        if ts is not None:
+            session = ts // 86400
+            if session != state[_SESSION]:
+                state[_SESSION] = session
+                state[_CUM_PV] = state[_CUM_V] = state[_LAST_CUM_VOLUME] = 0.0
+            state[_LAST_TS] = ts
+        if volume is not None and volume == volume:
+            volume = float(volume)
+            if self.cumulative_volume:
+                tick_volume = volume - state[_LAST_CUM_VOLUME] if volume >= state[_LAST_CUM_VOLUME] else volume
+                state[_LAST_CUM_VOLUME] = volume
+            else:
+                tick_volume = volume
+            state[_CUM_PV] += price * tick_volume
+            state[_CUM_V] += tick_volume
+
+        state[_LAST] = price
+        state[_COUNT] = count
+        self._state[slot] = state
+        self.updates += 1
+        return True
+
+    def bootstrap(self, symbol, prices, volumes=None, timestamps=None):
+        """Sembolün durumunu geçmiş tiklerden vektörel olarak kurar (eski durum silinir)"""
+        symbol = symbol.upper()
+        prices = np.asarray(prices, dtype=np.float64)
+        valid = ~np.isnan(prices)
+        prices = prices[valid]
+        if volumes is not None:
+            volumes = np.asarray(volumes, dtype=np.float64)[valid]
+        if timestamps is not None:
+            timestamps = np.asarray(timestamps, dtype='datetime64[us]')[valid]
+
+        self.remove(symbol)
+        slot = self._slot(symbol)
+        state = self._state[slot]
+        self.bootstraps += 1
+        n = len(prices)
+        if not n:
+            return
+
+        start = max(0, n - self.window)
+        recent = prices[start:]
+        self._prices[slot, np.arange(start, n) % self.window] = recent
+        state[_SUM] = recent.sum()
+        state[_SUMSQ] = (recent * recent).sum()
+
+        state[_EMA] = _ema_series(prices, self.ema_period, self._alpha_ema)[-1]
+        fast = _ema_series(prices, self.macd_fast, self._alpha_fast)
+        slow = _ema_series(prices, self.macd_slow, self._alpha_slow)
+        state[_FAST], state[_SLOW] = fast[-1], slow[-1]
+        macd = (fast - slow)[self.macd_slow - 1:]
+        state[_MACD_COUNT] = len(macd)
+        if len(macd):
+            state[_SIGNAL] = _ema_series(macd, self.macd_signal, self._alpha_signal)[-1]
+
+        if n > 1:
+            changes = np.diff(prices)
+            state[_GAIN] = _ema_series(np.maximum(changes, 0.0), self.rsi_period, self._alpha_rsi)[-1]
+            state[_LOSS] = _ema_series(np.maximum(-changes, 0.0), self.rsi_period, self._alpha_rsi)[-1]
+
+        if timestamps is not None:
+            seconds = timestamps.astype(np.int64) / 1e6
+            sessions = seconds // 86400
+            state[_LAST_TS] = seconds[-1]
+            state[_SESSION] = sessions[-1]
+            if volumes is not None:
+                current = sessions == sessions[-1]
+                session_prices, session_volumes = prices[current], volumes[current]
+                known = ~np.isnan(session_volumes)
+                session_prices, session_volumes = session_prices[known], session_volumes[known]
+                if len(session_volumes):
+                    if self.cumulative_volume:
+                        state[_LAST_CUM_VOLUME] = session_volumes[-1]
+                        session_volumes = _tick_volumes(session_volumes)
+                    state[_CUM_PV] = float(session_prices @ session_volumes)
+                    state[_CUM_V] = float(session_volumes.sum())
+
+        state[_LAST] = prices[-1]
+        state[_COUNT] = n
+
+    def snapshot(self, symbol):
+        """Sembolün güncel gösterge değerlerini döndürür; yeterli veri olmayan göstergeler None"""
+        slot = self._slots.get(symbol.upper())
+        if slot is None:
+            return None
+        state = self._state[slot]
+        count = int(state[_COUNT])
+
+        sma = upper = lower = None
+        if count >= self.window:
+            sma = state[_SUM] / self.window
+            std = max(state[_SUMSQ] / self.window - sma * sma, 0.0) ** 0.5
+            upper = sma + self.bollinger_std * std
+            lower = sma - self.bollinger_std * std
+
+        macd = signal = histogram = None
+        if count >= self.macd_slow:
+            macd = state[_FAST] - state[_SLOW]
+            if state[_MACD_COUNT] >= self.macd_signal:
+                signal = state[_SIGNAL]
+                histogram = macd - signal
+
+        rsi = None
+        if count > self.rsi_period:
+            gain, loss = state[_GAIN], state[_LOSS]
+            if loss == 0:
+                rsi = 100.0 if gain > 0 else 50.0
+            else:
+                rsi = 100.0 - 100.0 / (1.0 + gain / loss)
+
+        return {
+            'samples': count,
+            'last_price': _value(state[_LAST]) if count else None,
+            'sma': _value(sma),
+            'ema': _value(state[_EMA]) if count >= self.ema_period else None,
+            'rsi': _value(rsi),
+            'macd': _value(macd),
+            'macd_signal': _value(signal),
+            'macd_histogram': _value(histogram),
+            'bollinger_upper': _value(upper),
+            'bollinger_middle': _value(sma),
+            'bollinger_lower': _value(lower),
+            'vwap': _value(state[_CUM_PV] / state[_CUM_V]) if state[_CUM_V] > 0 else None
+        }
+
+    def stats(self):
+        """Takip edilen sembol sayısını, bellek kullanımını ve sayaçları döndürür"""
+        return {
+            'symbols': len(self._slots),
+            'capacity': len(self._state),
+            'max_symbols': self.max_symbols,
+            'memory_bytes': self._prices.nbytes + self._state.nbytes + self._touched.nbytes,
+            'updates': self.updates,
+            'stale': self.stale,
+            'bootstraps': self.bootstraps,
+            'evictions': self.evictions
+        }
+
+def _seconds(timestamp):
+    """datetime, np.datetime64 ya da saniye değerini Unix saniyesine çevirir"""
+    if timestamp is None:
+        return None
+    if isinstance(timestamp, np.datetime64):
+        return timestamp.astype('datetime64[us]').astype(np.int64) / 1e6
+    if hasattr(timestamp, 'timestamp'):
+        # Naive datetime'lar UTC kabul edilir (veritabanı utcnow kullanır)
+        if getattr(timestamp, 'tzinfo', None) is None:
+            return (timestamp - _EPOCH).total_seconds()
+        return timestamp.timestamp()
+    return float(timestamp)
+
+def _value(value):
+    return None if value is None else round(float(value), 6)
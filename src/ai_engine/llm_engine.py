@@ -0,0 +1,330 @@
+import asyncio
+import queue
+import threading
+import time
+from src.config import Config
+
+class GenerationQueueFullError(Exception):
+    """Bekleyen üretim isteği sınırı aşıldığında fırlatılır"""
+
+class _GenerationRequest:
+    """Tek bir üretim isteğinin durumunu tutar; token'ları asyncio kuyruğuna aktarır"""
+
+    def __init__(self, input_ids, max_new_tokens, loop):
+        self.input_ids = input_ids
+        self.max_new_tokens = max_new_tokens
+        self.loop = loop
+        self.output = asyncio.Queue()
+        self.generated = []
+        self.emitted_chars = 0
+        self.cancelled = False
+        self.submitted_at = time.perf_counter()
+        self.first_token_at = None
+
+    def emit(self, item):
+        """Üretim iş parçacığından event loop'a parça gönderir (None: bitti, Exception: hata)"""
+        try:
+            self.loop.call_soon_threadsafe(self.output.put_nowait, item)
+        except RuntimeError:
+            # İsteği yapan event loop kapanmış
+            self.cancelled = True
+
+class GenerationEngine:
+    """Sohbet LLM'i için CPU odaklı üretim motoru
+
+    - Sabit sistem promptu bir kez işlenir; KV önbelleği tüm isteklerde yeniden kullanılır.
+    - Sürekli gruplama: her adımda aktif tüm isteklerin bir sonraki token'ı tek ileri geçişte
+      üretilir; yeni istekler bir sonraki adımda partiye katılır, biten istekler hemen çıkar.
+    - Model çağrıları event loop'u bloklamamak için ayrı bir iş parçacığında çalışır.
+    """
+
+    def __init__(self, tokenizer, model, prefix="", max_batch_size=None, max_pending=None,
+                 max_new_tokens=None, max_input_tokens=None, temperature=None):
+        import torch
+        self._torch = torch
+        self.tokenizer = tokenizer
+        self.model = model
+        self.max_batch_size = max_batch_size or Config.CHAT_MAX_BATCH_SIZE
+        self.max_new_tokens = max_new_tokens or Config.CHAT_MAX_NEW_TOKENS
+        self.max_input_tokens = max_input_tokens or Config.CHAT_MAX_INPUT_TOKENS
+        self.temperature = Config.CHAT_TEMPERATURE if temperature is None else temperature
+        self.eos_token_id = tokenizer.eos_token_id
+        self._pending = queue.Queue(maxsize=max_pending or Config.CHAT_MAX_PENDING)
+
+        self.requests = 0
+        self.completed = 0
+        self.tokens = 0
+        self.steps = 0
+        self.batch_rows = 0
+        self.prefill_seconds = 0.0
+        self.decode_seconds = 0.0
+        self.ttft_total = 0.0
+        # İlk token'ı üretilen istek sayısı; iptal edilen ya da sürmekte olan istekler de dahildir
+        self.ttft_samples = 0
+        self._active = 0
+
+        self.model.eval()
+        self._prefix_cache, self._prefix_len = self._encode_prefix(prefix)
+
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="llm-generation", daemon=True)
+        self._thread.start()
+
+    async def stream(self, prompt, max_new_tokens=None):
+        """Sistem promptundan sonra gelen metin için üretilen yanıtı parça parça döndürür"""
+        input_ids = self.tokenizer(prompt, add_special_tokens=False).input_ids
+        if not input_ids:
+            raise ValueError("Boş prompt ile üretim yapılamaz")
+        # Uzun geçmişte en yeni kısım korunur
+        input_ids = input_ids[-self.max_input_tokens:]
+
+        limit = min(max_new_tokens or self.max_new_tokens, self.max_new_tokens)
+        request = _GenerationRequest(input_ids, limit, asyncio.get_running_loop())
+        try:
+            self._pending.put_nowait(request)
+        except queue.Full:
+            raise GenerationQueueFullError("Üretim kuyruğu dolu")
+        self.requests += 1
+
+        try:
+            while True:
+                item = await asyncio.wait_for(request.output.get(), timeout=Config.CHAT_STREAM_TIMEOUT)
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # İstemci bıraktıysa satır bir sonraki adımda partiden çıkarılır
+            request.cancelled = True
+
+    async def generate(self, prompt, max_new_tokens=None):
+        """Yanıtın tamamını döndürür"""
+        chunks = []
+        async for chunk in self.stream(prompt, max_new_tokens):
+            chunks.append(chunk)
+        return "".join(chunks)
+
+    def stop(self, timeout=5.0):
+        """Üretim iş parçacığını durdurur"""
+        self._running = False
+        self._thread.join(timeout)
+
+    def _encode_prefix(self, prefix):
+        """Sistem promptunu bir kez modelden geçirip KV önbelleğini saklar"""
+        input_ids = self._torch.tensor([self.tokenizer(prefix).input_ids])
+        with self._torch.inference_mode():
+            out = self.model(input_ids=input_ids, use_cache=True)
+        return _to_legacy_cache(out.past_key_values), input_ids.shape[1]
+
+    def _run(self):
+        torch = self._torch
+        batch = []
+        past = mask = tokens = None
+
+        with torch.inference_mode():
+            while self._running:
+                # Boştayken yeni istek gelene kadar bekler; doluyken yalnızca boş satırlar kadar alır
+                joined = self._take_pending(self.max_batch_size - len(batch), block=not batch)
+
+                parts = [] if not batch else [(past, mask, tokens)]
+                for request in joined:
+                    try:
+                        part = self._prefill(request)
+                    except Exception as e:
+                        print(f"LLM prefill hatası: {e}")
+                        request.emit(e)
+                        continue
+                    if self._push(request, part[2]):
+                        request.emit(None)
+                        continue
+                    batch.append(request)
+                    parts.append(part)
+
+                if not batch:
+                    continue
+                if len(parts) == 1:
+                    past, mask, tokens = parts[0]
+                else:
+                    past, mask, tokens = _merge(torch, parts)
+
+                try:
+                    past, mask, tokens = self._decode_step(past, mask, tokens, len(batch))
+                except Exception as e:
+                    print(f"LLM üretim hatası: {e}")
+                    for request in batch:
+                        request.emit(e)
+                    batch = []
+                    past = mask = tokens = None
+                    continue
+
+                keep = []
+                for row, request in enumerate(batch):
+                    if request.cancelled:
+                        continue
+                    if self._push(request, tokens[row]):
+                        request.emit(None)
+                        continue
+                    keep.append(row)
+
+                if len(keep) < len(batch):
+                    batch = [batch[row] for row in keep]
+                    if batch:
+                        past, mask, tokens = _select_rows(torch, past, mask, tokens, keep)
+                    else:
+                        past = mask = tokens = None
+                self._active = len(batch)
+
+            for request in batch:
+                request.emit(None)
+
+    def _take_pending(self, free, block):
+        taken = []
+        if free <= 0:
+            return taken
+        try:
+            if block:
+                taken.append(self._pending.get(timeout=0.5))
+            while len(taken) < free:
+                taken.append(self._pending.get_nowait())
+        except queue.Empty:
+            pass
+        return [request for request in taken if not request.cancelled]
+
+    def _prefill(self, request):
+        """İsteğin promptunu önbellekteki sistem promptunun devamı olarak işler"""
+        torch = self._torch
+        started = time.perf_counter()
+        input_ids = torch.tensor([request.input_ids])
+        length = self._prefix_len + input_ids.shape[1]
+        mask = torch.ones(1, length, dtype=torch.long)
+        positions = torch.arange(self._prefix_len, length).unsqueeze(0)
+
+        out = self.model(
+            input_ids=input_ids,
+            attention_mask=mask,
+            position_ids=positions,
+            past_key_values=_to_model_cache(self._prefix_cache),
+            use_cache=True
+        )
+        tokens = self._sample(out.logits[:, -1, :])
+        self.prefill_seconds += time.perf_counter() - started
+        return _to_legacy_cache(out.past_key_values), mask, tokens
+
+    def _decode_step(self, past, mask, tokens, rows):
+        """Partideki her satır için bir token üretir"""
+        torch = self._torch
+        started = time.perf_counter()
+        # Yeni token'ın konumu, satırdaki gerçek (dolgu olmayan) token sayısıdır
+        positions = mask.sum(dim=1, keepdim=True)
+        mask = torch.cat([mask, torch.ones(rows, 1, dtype=mask.dtype)], dim=1)
+
+        out = self.model(
+            input_ids=tokens,
+            attention_mask=mask,
+            position_ids=positions,
+            past_key_values=_to_model_cache(past),
+            use_cache=True
+        )
+        tokens = self._sample(out.logits[:, -1, :])
+
+        self.steps += 1
+        self.batch_rows += rows
+        self.decode_seconds += time.perf_counter() - started
+        return _to_legacy_cache(out.past_key_values), mask, tokens
+
+    def _sample(self, logits):
+        if self.temperature <= 0:
+            return logits.argmax(dim=-1, keepdim=True)
+        probs = self._torch.softmax(logits.float() / self.temperature, dim=-1)
+        return self._torch.multinomial(probs, 1)
+
+    def _push(self, request, token):
+        """Üretilen token'ı isteğe ekler, yeni metni gönderir; istek bittiyse True döndürür"""
+        token_id = int(token.item())
+        if request.first_token_at is None:
+            request.first_token_at = time.perf_counter()
+            self.ttft_total += request.first_token_at - request.submitted_at
+            self.ttft_samples += 1
+
+        finished = token_id == self.eos_token_id
+        if not finished:
+            request.generated.append(token_id)
+            self.tokens += 1
+            text = self.tokenizer.decode(request.generated, skip_special_tokens=True)
+            # Yarım kalmış çok baytlı karakterler tamamlanana kadar bekletilir
+            if not text.endswith("\ufffd") and len(text) > request.emitted_chars:
+                request.emit(text[request.emitted_chars:])
+                request.emitted_chars = len(text)
+            finished = len(request.generated) >= request.max_new_tokens
+
+        if finished:
+            self.completed += 1
+        return finished
+
+    def stats(self):
+        """Üretim sayaçlarını döndürür"""
+        return {
+            'active': self._active,
+            'pending': self._pending.qsize(),
+            'requests': self.requests,
+            'completed': self.completed,
+            'tokens': self.tokens,
+            'decode_steps': self.steps,
+            'avg_batch_size': self.batch_rows / self.steps if self.steps else 0.0,
+            'decode_tokens_per_second': self.batch_rows / self.decode_seconds if self.decode_seconds else 0.0,
+            'prefill_seconds': round(self.prefill_seconds, 3),
+            'avg_time_to_first_token': self.ttft_total / self.ttft_samples if self.ttft_samples else 0.0,
+            'prefix_tokens': self._prefix_len
+        }
+
+def _to_legacy_cache(past):
+    """Model çıktısındaki KV önbelleğini katman başına (key, value) demetlerine çevirir"""
+    if hasattr(past, 'to_legacy_cache'):
+        return past.to_legacy_cache()
+    if hasattr(past, 'layers'):
+        return tuple((layer.keys, layer.values) for layer in past.layers)
+    return tuple(past)
+
+def _to_model_cache(past):
+    """Demet biçimindeki önbelleği modelin beklediği önbellek nesnesine çevirir"""
+    try:
+        from transformers import DynamicCache
+    except ImportError:
+        return past
+    if hasattr(DynamicCache, 'from_legacy_cache'):
+        return DynamicCache.from_legacy_cache(past)
+    return DynamicCache(past)
+
+def _merge(torch, parts):
+    """Farklı uzunluktaki önbellekleri soldan dolgu ile hizalayıp tek partide birleştirir"""
+    import torch.nn.functional as F
+    length = max(mask.shape[1] for _, mask, _ in parts)
+
+    layers = []
+    for layer in range(len(parts[0][0])):
+        keys, values = [], []
+        for past, mask, _ in parts:
+            key, value = past[layer]
+            pad = length - key.shape[2]
+            if pad:
+                key = F.pad(key, (0, 0, pad, 0))
+                value = F.pad(value, (0, 0, pad, 0))
+            keys.append(key)
+            values.append(value)
+        layers.append((torch.cat(keys), torch.cat(values)))
+
+    masks = [F.pad(mask, (length - mask.shape[1], 0)) for _, mask, _ in parts]
+    tokens = torch.cat([part_tokens for _, _, part_tokens in parts])
+    return tuple(layers), torch.cat(masks), tokens
+
+def _select_rows(torch, past, mask, tokens, rows):
+    """Biten satırları partiden çıkarır ve tamamen dolgu olan sol sütunları kırpar"""
+    index = torch.tensor(rows)
+    mask = mask[index]
+    start = int((mask.sum(dim=0) > 0).nonzero()[0])
+    past = tuple(
+        (key[index][:, :, start:], value[index][:, :, start:])
+        for key, value in past
+    )
+    return past, mask[:, start:], tokens[index]
@@ -1,68 +1,166 @@
+import asyncio
 import numpy as np
 from datetime import datetime, timedelta
+from src.config import Config
 from src.database.models import MarketData, Portfolio
-from sklearn.preprocessing import MinMaxScaler
-import tensorflow as tf
+from src.ai_engine.model_registry import get_model_registry
+from src.ai_engine.trend_service import TrendInferenceService
+from src.ai_engine.indicators import IndicatorEngine
+from src.database.forecast_store import ForecastStore
+from src.database.timeseries import TimeSeriesStore
+from src.database.queries import get_user_portfolio
+from src.utils.tracing import get_tracer, current_request_id
+
+# FinBERT etiketlerinin duygu skoruna katkı yönü
+SENTIMENT_SIGNS = {'positive': 1.0, 'negative': -1.0, 'neutral': 0.0}
 
 class MarketAnalyzer:
-    def __init__(self):
-        self.model = self._load_or_create_model()
-        self.scaler = MinMaxScaler()
-        
-    def _load_or_create_model(self):
-        """Yapay zeka modelini yükler veya oluşturur"""
-        try:
-            return tf.keras.models.load_model(f"{Config.MODEL_PATH}/market_predictor.h5")
-        except:
-            return self._create_model()
-    
-    def _create_model(self):
-        """Yeni bir LSTM modeli oluşturur"""
-        model = tf.keras.Sequential([
-            tf.keras.layers.LSTM(50, return_sequences=True, input_shape=(60, 1)),
-            tf.keras.layers.LSTM(50, return_sequences=False),
-            tf.keras.layers.Dense(25),
-            tf.keras.layers.Dense(1)
-        ])
+    def __init__(self, registry=None, forecast_store=None, timeseries=None, news_collector=None, indicators=None):
+        self.registry = registry or get_model_registry()
+        self.forecast_store = forecast_store or ForecastStore()
+        self.timeseries = timeseries or TimeSeriesStore()
+        # Haber duygusu tavsiyede kullanılır; verilmezse piyasa duygusu nötr sayılır
+        self.news_collector = news_collector
+        # Eşzamanlı trend istekleri tek bir partili model çağrısında birleşir
+        self.trend_service = TrendInferenceService(lambda: self.registry.get('market_predictor'))
+        # Teknik göstergeler her yeni fiyatla artımlı güncellenir
+        self.indicators = indicators or IndicatorEngine()
+        self._bootstraps = {}
+        # Geçmişten başlatılmayı bekleyen fiyatlar; görevlere referans tutulmazsa toplanabilirler
+        self._pending_quotes = set()
         
-        model.compile(optimizer='adam', loss='mean_squared_error')
-        return model
+    @property
+    def model(self):
+        """LSTM modeli paylaşılan kayıt defterinden ilk kullanımda yüklenir"""
+        return self.registry.get('market_predictor')
     
-    async def analyze_trend(self, symbol, days=60):
+    async def analyze_trend(self, symbol, days=None):
         """Varlık için trend analizi yapar"""
-        try:
-            # Geçmiş verileri al
-            historical_data = await self._get_historical_data(symbol, days)
-            
-            if len(historical_data) < days:
-                return {
-                    'trend': 'NEUTRAL',
-                    'confidence': 0.5,
-                    'prediction': None
-                }
-            
-            # Veriyi hazırla
-            prices = np.array([d['price'] for d in historical_data]).reshape(-1, 1)
-            scaled_data = self.scaler.fit_transform(prices)
-            
-            # Tahmin yap
-            prediction = self._predict_next_day(scaled_data)
-            last_price = prices[-1][0]
-            predicted_price = self.scaler.inverse_transform([[prediction]])[0][0]
-            
-            # Trend analizi
-            trend = 'UP' if predicted_price > last_price else 'DOWN'
-            confidence = abs(predicted_price - last_price) / last_price
+        return (await self.analyze_trends([symbol], days))[symbol.upper()]
+    
+    async def analyze_trends(self, symbols, days=None, use_forecasts=True, with_indicators=True):
+        """Birden çok varlığın trend analizini yapar
+
+        Önce forecasts tablosundaki taze tahminler kullanılır; eksik ya da eski olan
+        semboller için canlı çıkarım tek bir partili model geçişiyle yapılır.
+        with_indicators ile her sonuca güncel teknik göstergeler eklenir.
+        Sonuçlar büyük harfli sembollerle döndürülür.
+        """
+        days = days or Config.TREND_WINDOW
+        symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        
+        trends = {}
+        if use_forecasts:
+            try:
+                trends = await self.forecast_store.read(symbols, Config.FORECAST_MAX_AGE)
+            except Exception as e:
+                print(f"Tahmin tablosu okuma hatası: {e}")
+                
+        live_symbols = [symbol for symbol in symbols if symbol not in trends]
+        results = await asyncio.gather(
+            *[self._analyze_symbol(symbol, days) for symbol in live_symbols],
+            return_exceptions=True
+        )
+        
+        for symbol, result in zip(live_symbols, results):
+            if isinstance(result, Exception):
+                print(f"Trend analizi hatası ({symbol}) [{current_request_id()}]: {result}")
+                result = None
+            trends[symbol] = result
             
+        if with_indicators:
+            snapshots = await asyncio.gather(
+                *[self.get_indicators(symbol) for symbol in symbols],
+                return_exceptions=True
+            )
+            for symbol, snapshot in zip(symbols, snapshots):
+                if isinstance(snapshot, Exception):
+                    print(f"Gösterge hesaplama hatası ({symbol}): {snapshot}")
+                elif trends.get(symbol) is not None:
+                    trends[symbol] = {**trends[symbol], 'indicators': snapshot}
+        return trends
+    
+    async def get_indicators(self, symbol):
+        """Sembolün güncel teknik göstergelerini döndürür; sembol ilk kez soruluyorsa geçmişten başlatılır"""
+        symbol = symbol.upper()
+        if symbol not in self.indicators:
+            await self._ensure_indicators(symbol)
+        return self.indicators.snapshot(symbol)
+    
+    def on_quote(self, quote):
+        """Fiyat toplayıcı dinleyicisi: yeni fiyat göstergelere O(1) işlenir"""
+        symbol = quote['symbol'].upper()
+        if symbol in self.indicators:
+            self._apply_quote(symbol, quote)
+            return
+        # Yeni sembol önce geçmişten başlatılır; bu sırada toplayıcı bekletilmez
+        task = asyncio.ensure_future(self._ensure_indicators(symbol))
+        self._pending_quotes.add(task)
+        task.add_done_callback(self._pending_quotes.discard)
+        task.add_done_callback(
+            lambda done: done.cancelled() or done.exception() or self._apply_quote(symbol, quote)
+        )
+    
+    def _apply_quote(self, symbol, quote):
+        self.indicators.update(symbol, quote['price'], quote.get('volume'), quote.get('timestamp'))
+    
+    async def _ensure_indicators(self, symbol):
+        """Sembolün gösterge durumunu geçmiş tiklerden kurar; eşzamanlı istekler aynı işi bekler"""
+        task = self._bootstraps.get(symbol)
+        if task is None:
+            task = self._bootstraps[symbol] = asyncio.ensure_future(self._bootstrap_indicators(symbol))
+            task.add_done_callback(lambda _: self._bootstraps.pop(symbol, None))
+        await asyncio.shield(task)
+    
+    async def _bootstrap_indicators(self, symbol):
+        start = datetime.utcnow() - timedelta(days=Config.INDICATOR_BOOTSTRAP_DAYS)
+        try:
+            ticks = await self.timeseries.read_ticks(symbol, start)
+        except Exception as e:
+            print(f"Gösterge geçmişi okuma hatası ({symbol}): {e}")
+            ticks = {'price': [], 'volume': None, 'timestamp': None}
+        limit = Config.INDICATOR_BOOTSTRAP_POINTS
+        self.indicators.bootstrap(
+            symbol,
+            ticks['price'][-limit:],
+            None if ticks['volume'] is None else ticks['volume'][-limit:],
+            None if ticks['timestamp'] is None else ticks['timestamp'][-limit:]
+        )
+    
+    async def _analyze_symbol(self, symbol, days):
+        # Geçmiş verileri al
+        prices = await self._get_historical_data(symbol, days)
+        
+        if len(prices) < days:
             return {
-                'trend': trend,
-                'confidence': float(confidence),
-                'prediction': float(predicted_price)
+                'trend': 'NEUTRAL',
+                'confidence': 0.5,
+                'prediction': None
             }
-            
-        except Exception as e:
-            print(f"Trend analizi hatası: {e}")
-            return None
+        
+        # Tahmin yap; ölçekleme sembolün kendi penceresiyle servis içinde yapılır
+        with get_tracer().span("trend.inference", symbol=symbol):
+            predicted_price = await self.trend_service.predict_next(prices)
+        last_price = prices[-1]
+        
+        # Trend analizi
+        trend = 'UP' if predicted_price > last_price else 'DOWN'
+        confidence = abs(predicted_price - last_price) / last_price
+        
+        return {
+            'trend': trend,
+            'confidence': float(confidence),
+            'prediction': float(predicted_price),
+            'generated_at': datetime.utcnow()
+        }
+    
+    async def _get_historical_data(self, symbol, days):
+        """Sembolün son `days` günlük kapanış fiyatlarını NumPy dizisi olarak döndürür"""
+        return await self.timeseries.last_closes(symbol, days, '1d')
+    
+    async def _get_user_portfolio(self, user_id, symbol):
+        """Kullanıcının ilgili sembole ait portföy satırlarını döndürür"""
+        return await get_user_portfolio(user_id, symbol=symbol) or []
     
     async def get_investment_advice(self, user_id, symbol):
         """Kullanıcıya özel yatırım tavsiyesi oluşturur"""
@@ -70,16 +168,114 @@ class MarketAnalyzer:
             trend_analysis = await self.analyze_trend(symbol)
             portfolio_data = await self._get_user_portfolio(user_id, symbol)
             market_sentiment = await self._get_market_sentiment(symbol)
+            indicators = (trend_analysis or {}).get('indicators') or {}
             
             # Tavsiye oluştur
             advice = {
-                'action': self._determine_action(trend_analysis, portfolio_data, market_sentiment),
-                'reasoning': self._generate_reasoning(trend_analysis, market_sentiment),
-                'risk_level': self._calculate_risk_level(trend_analysis, market_sentiment)
+                'action': self._determine_action(trend_analysis, portfolio_data, market_sentiment, indicators),
+                'reasoning': self._generate_reasoning(trend_analysis, market_sentiment, indicators),
+                'risk_level': self._calculate_risk_level(trend_analysis, market_sentiment, indicators),
+                'trend': trend_analysis,
+                'indicators': indicators
             }
             
             return advice
             
         except Exception as e:
-            print(f"Yatırım tavsiyesi hatası: {e}")
-            return None 
\ No newline at end of file
+            print(f"Yatırım tavsiyesi hatası [{current_request_id()}]: {e}")
+            return None
+    
+    async def _get_market_sentiment(self, symbol):
+        """Son haberlerin duygusunu -1 (olumsuz) ile 1 (olumlu) arasında tek skorda özetler"""
+        if self.news_collector is None:
+            return {'score': 0.0, 'articles': 0}
+        news = await self.news_collector.get_financial_news(symbol, days=1)
+        scores = [
+            SENTIMENT_SIGNS.get(str(article['sentiment']['label']).lower(), 0.0) * article['sentiment']['score']
+            for article in news if article.get('sentiment')
+        ]
+        return {'score': float(np.mean(scores)) if scores else 0.0, 'articles': len(scores)}
+    
+    def _signal_score(self, trend_analysis, market_sentiment, indicators):
+        """Trend, göstergeler ve haber duygusundan -1 ile 1 arasında birleşik sinyal skoru"""
+        score = 0.0
+        if trend_analysis and trend_analysis.get('trend') in ('UP', 'DOWN'):
+            direction = 1.0 if trend_analysis['trend'] == 'UP' else -1.0
+            # Güven, tahmin edilen göreli fiyat değişimidir; %5 ve üzeri tam ağırlık alır
+            score += 0.4 * direction * min(1.0, trend_analysis.get('confidence', 0.0) / 0.05)
+        
+        rsi = indicators.get('rsi')
+        if rsi is not None:
+            if rsi >= 70:
+                score -= 0.2
+            elif rsi <= 30:
+                score += 0.2
+        histogram = indicators.get('macd_histogram')
+        if histogram is not None:
+            score += 0.15 if histogram > 0 else -0.15
+        price, vwap = indicators.get('last_price'), indicators.get('vwap')
+        if price is not None and vwap:
+            score += 0.05 if price > vwap else -0.05
+        
+        score += 0.2 * market_sentiment.get('score', 0.0)
+        return max(-1.0, min(1.0, score))
+    
+    def _determine_action(self, trend_analysis, portfolio_data, market_sentiment, indicators=None):
+        """Birleşik sinyal skoruna ve kullanıcının pozisyonuna göre aksiyon belirler"""
+        score = self._signal_score(trend_analysis, market_sentiment, indicators or {})
+        holding = any((asset.quantity or 0) > 0 for asset in portfolio_data or [])
+        
+        if score >= 0.3:
+            return 'EKLE' if holding else 'AL'
+        if score <= -0.3:
+            return 'SAT' if holding else 'UZAK DUR'
+        return 'TUT' if holding else 'BEKLE'
+    
+    def _generate_reasoning(self, trend_analysis, market_sentiment, indicators=None):
+        """Aksiyonun dayandığı sinyalleri kısa cümlelerle açıklar"""
+        indicators = indicators or {}
+        reasons = []
+        if trend_analysis and trend_analysis.get('trend') in ('UP', 'DOWN'):
+            direction = 'yükseliş' if trend_analysis['trend'] == 'UP' else 'düşüş'
+            reasons.append(f"Model %{trend_analysis.get('confidence', 0.0)*100:.2f} oranında {direction} öngörüyor.")
+        else:
+            reasons.append("Trend modeli için yeterli geçmiş veri yok.")
+        
+        rsi = indicators.get('rsi')
+        if rsi is not None:
+            state = 'aşırı alım' if rsi >= 70 else 'aşırı satım' if rsi <= 30 else 'nötr'
+            reasons.append(f"RSI {rsi:.1f} ({state} bölgesi).")
+        histogram = indicators.get('macd_histogram')
+        if histogram is not None:
+            reasons.append(f"MACD sinyal çizgisinin {'üzerinde' if histogram > 0 else 'altında'}.")
+        price, vwap = indicators.get('last_price'), indicators.get('vwap')
+        if price is not None and vwap:
+            reasons.append(f"Fiyat seans VWAP'ının ({vwap:.2f}) {'üzerinde' if price > vwap else 'altında'}.")
+        
+        if market_sentiment.get('articles'):
+            tone = market_sentiment['score']
+            mood = 'olumlu' if tone > 0.1 else 'olumsuz' if tone < -0.1 else 'nötr'
+            reasons.append(f"Son {market_sentiment['articles']} haberin genel tonu {mood}.")
+        return " ".join(reasons)
+    
+    def _calculate_risk_level(self, trend_analysis, market_sentiment, indicators=None):
+        """Bollinger bant genişliğiyle ölçülen oynaklığa göre risk seviyesi; bant yoksa trend güveni kullanılır"""
+        indicators = indicators or {}
+        upper, lower, middle = (
+            indicators.get('bollinger_upper'), indicators.get('bollinger_lower'), indicators.get('bollinger_middle')
+        )
+        if upper is not None and middle:
+            volatility = (upper - lower) / middle
+        elif trend_analysis and trend_analysis.get('prediction'):
+            volatility = 2 * trend_analysis.get('confidence', 0.0)
+        else:
+            return 'ORTA'
+        
+        # Olumsuz haber akışı riski bir kademe artırır
+        if market_sentiment.get('score', 0.0) < -0.3:
+            volatility *= 1.5
+        if volatility >= 0.08:
+            return 'YÜKSEK'
+        if volatility >= 0.03:
+            return 'ORTA'
+        return 'DÜŞÜK' 
\ No newline at end of file
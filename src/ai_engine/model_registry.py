@@ -0,0 +1,155 @@
+import os
+import threading
+import time
+from src.config import Config
+
+class ModelRegistry:
+    """Süreç genelinde her modeli bir kez, ilk kullanımda yükleyip tüm bileşenlerle paylaşır"""
+
+    def __init__(self):
+        self._loaders = {}
+        self._models = {}
+        self._locks = {}
+        self._load_times = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, loader):
+        """Model için yükleyici fonksiyon kaydeder (yükleme ilk get() çağrısında yapılır)"""
+        with self._lock:
+            self._loaders[name] = loader
+            self._locks.setdefault(name, threading.Lock())
+            self._models.pop(name, None)
+
+    def get(self, name):
+        """Modeli döndürür; henüz yüklenmediyse yükler"""
+        model = self._models.get(name)
+        if model is not None:
+            return model
+
+        if name not in self._loaders:
+            raise KeyError(f"Kayıtlı olmayan model: {name}")
+
+        # Aynı model iki kez yüklenmesin; farklı modeller birbirini beklemesin
+        with self._locks[name]:
+            model = self._models.get(name)
+            if model is None:
+                started = time.perf_counter()
+                model = self._loaders[name]()
+                self._load_times[name] = time.perf_counter() - started
+                self._models[name] = model
+        return model
+
+    def is_loaded(self, name):
+        return name in self._models
+
+    def warm_up(self, names=None):
+        """Verilen (ya da tüm) modelleri önceden yükler"""
+        for name in names or list(self._loaders):
+            self.get(name)
+
+    def unload(self, name):
+        """Modeli bellekten çıkarır; bir sonraki get() yeniden yükler"""
+        with self._locks.get(name, self._lock):
+            self._models.pop(name, None)
+            self._load_times.pop(name, None)
+
+    def memory_report(self):
+        """Yüklü modellerin tahmini bellek kullanımını ve yükleme sürelerini döndürür"""
+        models = {}
+        for name in self._loaders:
+            if name in self._models:
+                models[name] = {
+                    'loaded': True,
+                    'load_seconds': round(self._load_times.get(name, 0.0), 3),
+                    'parameter_bytes': _estimate_bytes(self._models[name])
+                }
+            else:
+                models[name] = {'loaded': False}
+
+        return {
+            'process_rss_bytes': _process_rss(),
+            'models': models
+        }
+
+def _estimate_bytes(obj):
+    """Torch, Keras ve transformers pipeline nesnelerinin ağırlık boyutunu tahmin eder"""
+    if isinstance(obj, (tuple, list)):
+        return sum(_estimate_bytes(item) for item in obj)
+    if hasattr(obj, 'model') and not hasattr(obj, 'parameters'):
+        # transformers pipeline
+        return _estimate_bytes(obj.model)
+    if hasattr(obj, 'parameters'):
+        size = sum(p.numel() * p.element_size() for p in obj.parameters())
+        if hasattr(obj, 'buffers'):
+            size += sum(b.numel() * b.element_size() for b in obj.buffers())
+        return int(size)
+    if hasattr(obj, 'weights'):
+        # Keras modeli
+        return int(sum(w.numpy().nbytes for w in obj.weights))
+    return 0
+
+def _process_rss():
+    """Sürecin anlık bellek kullanımını (RSS) döndürür"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def _load_chat_llm():
+    """Sohbet için LLM tokenizer ve modelini CHAT_MODEL_PRECISION hassasiyetinde yükler"""
+    import torch
+    from transformers import AutoTokenizer, AutoModelForCausalLM
+    if Config.CHAT_NUM_THREADS:
+        torch.set_num_threads(Config.CHAT_NUM_THREADS)
+
+    tokenizer = AutoTokenizer.from_pretrained(Config.CHAT_MODEL_NAME)
+    if Config.CHAT_MODEL_PRECISION == 'int8':
+        # Linear katmanları int8 ağırlık ve dinamik aktivasyon nicemlemesiyle çalışır
+        model = AutoModelForCausalLM.from_pretrained(
+            Config.CHAT_MODEL_NAME, torch_dtype=torch.float32, low_cpu_mem_usage=True
+        )
+        model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    else:
+        dtype = {'bfloat16': torch.bfloat16, 'float16': torch.float16}.get(
+            Config.CHAT_MODEL_PRECISION, torch.float32
+        )
+        model = AutoModelForCausalLM.from_pretrained(
+            Config.CHAT_MODEL_NAME, torch_dtype=dtype, low_cpu_mem_usage=True
+        )
+    model.eval()
+    return tokenizer, model
+
+def _load_sentiment_pipeline():
+    """FinBERT duygu analizi pipeline'ını yükler"""
+    from transformers import pipeline
+    return pipeline("sentiment-analysis", model=Config.SENTIMENT_MODEL_ID)
+
+def _load_market_predictor():
+    """LSTM fiyat tahmin modelini yükler, yoksa yeni bir model oluşturur"""
+    import tensorflow as tf
+    try:
+        return tf.keras.models.load_model(os.path.join(Config.MODEL_PATH, 'market_predictor.h5'))
+    except Exception:
+        model = tf.keras.Sequential([
+            tf.keras.layers.LSTM(50, return_sequences=True, input_shape=(60, 1)),
+            tf.keras.layers.LSTM(50, return_sequences=False),
+            tf.keras.layers.Dense(25),
+            tf.keras.layers.Dense(1)
+        ])
+        model.compile(optimizer='adam', loss='mean_squared_error')
+        return model
+
+# Süreç genelinde paylaşılan kayıt defteri
+_registry = None
+
+def get_model_registry():
+    """Varsayılan modellerin kayıtlı olduğu paylaşılan kayıt defterini döndürür"""
+    global _registry
+    if _registry is None:
+        _registry = ModelRegistry()
+        _registry.register('chat_llm', _load_chat_llm)
+        _registry.register('sentiment', _load_sentiment_pipeline)
+        _registry.register('market_predictor', _load_market_predictor)
+    return _registry
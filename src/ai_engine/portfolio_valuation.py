@@ -0,0 +1,124 @@
+import asyncio
+import numpy as np
+from src.data_collectors.scheduler import QuotaExceededError
+
+class PortfolioValuationEngine:
+    """Portföyleri tekilleştirilmiş eşzamanlı fiyat sorguları ve NumPy dizileriyle değerler"""
+
+    def __init__(self, market_data_collector, portfolio_loader=None):
+        self.collector = market_data_collector
+        # user_ids -> {kullanıcı kimliği: Portfolio satırları} döndüren asenkron fonksiyon
+        self.portfolio_loader = portfolio_loader
+
+    @staticmethod
+    def _key(asset):
+        return (asset.asset_type or 'stock', asset.symbol.upper())
+
+    async def _fetch_price(self, asset_type, symbol):
+        if asset_type == 'crypto':
+            return await self.collector.get_crypto_data(symbol)
+        return await self.collector.get_stock_data(symbol)
+
+    async def fetch_prices(self, keys):
+        """Tekil (varlık tipi, sembol) çiftlerinin fiyatlarını tek bir eşzamanlı partide çeker"""
+        keys = list(dict.fromkeys(keys))
+        results = await asyncio.gather(
+            *[self._fetch_price(asset_type, symbol) for asset_type, symbol in keys],
+            return_exceptions=True
+        )
+
+        prices = {}
+        quota_errors = 0
+        for key, result in zip(keys, results):
+            if isinstance(result, QuotaExceededError):
+                quota_errors += 1
+            elif isinstance(result, Exception):
+                print(f"Fiyat çekme hatası ({key[1]}): {result}")
+            elif result and result.get('price') is not None:
+                prices[key] = float(result['price'])
+
+        # Hiçbir fiyat alınamadıysa ve sebep kota ise bunu çağırana bildir
+        if keys and not prices and quota_errors:
+            raise QuotaExceededError("Portföy fiyatları kota nedeniyle alınamadı")
+        return prices
+
+    async def value(self, holdings):
+        """Tek bir kullanıcının portföyünü değerler"""
+        return (await self.value_many({None: holdings}))[None]
+
+    async def value_users(self, user_ids=None):
+        """Kullanıcıların portföylerini tek sorguda yükleyip tek geçişte değerler (gece raporları için)
+
+        user_ids verilmezse portföyü olan tüm kullanıcılar değerlenir.
+        """
+        if self.portfolio_loader is None:
+            raise RuntimeError("Portföy yükleyicisi tanımlı değil")
+        return await self.value_many(await self.portfolio_loader(user_ids))
+
+    async def value_many(self, portfolios):
+        """Birden çok kullanıcının portföyünü tek geçişte değerler
+
+        portfolios: kullanıcı kimliği -> Portfolio satırları eşlemesi
+        """
+        owners = list(portfolios)
+        rows = [(index, asset) for index, owner in enumerate(owners) for asset in portfolios[owner]]
+        prices = await self.fetch_prices(self._key(asset) for _, asset in rows)
+
+        n = len(rows)
+        owner_index = np.fromiter((index for index, _ in rows), dtype=np.int64, count=n)
+        quantity = np.fromiter((asset.quantity or 0.0 for _, asset in rows), dtype=np.float64, count=n)
+        purchase_price = np.fromiter((asset.purchase_price or 0.0 for _, asset in rows), dtype=np.float64, count=n)
+        current_price = np.fromiter(
+            (prices.get(self._key(asset), np.nan) for _, asset in rows), dtype=np.float64, count=n
+        )
+
+        priced = ~np.isnan(current_price)
+        cost_basis = quantity * purchase_price
+        market_value = quantity * current_price
+        profit_loss = market_value - cost_basis
+        profit_loss_pct = np.full(n, np.nan)
+        np.divide(profit_loss, cost_basis, out=profit_loss_pct, where=priced & (cost_basis != 0))
+
+        # Kullanıcı bazında toplamlar; fiyatı alınamayan satırlar piyasa değerine katılmaz
+        users = len(owners)
+        total_value = np.bincount(owner_index, weights=np.where(priced, market_value, 0.0), minlength=users)
+        total_cost = np.bincount(owner_index, weights=np.where(priced, cost_basis, 0.0), minlength=users)
+        unpriced = np.bincount(owner_index, weights=(~priced).astype(np.float64), minlength=users)
+
+        weights = np.full(n, np.nan)
+        row_totals = total_value[owner_index]
+        np.divide(market_value, row_totals, out=weights, where=priced & (row_totals != 0))
+
+        results = {
+            owner: {'positions': [], 'summary': self._summary(total_value[i], total_cost[i], int(unpriced[i]))}
+            for i, owner in enumerate(owners)
+        }
+        for row, (index, asset) in enumerate(rows):
+            results[owners[index]]['positions'].append({
+                'symbol': asset.symbol,
+                'type': asset.asset_type,
+                'quantity': asset.quantity,
+                'purchase_price': asset.purchase_price,
+                'current_price': self._optional(current_price[row]),
+                'cost_basis': float(cost_basis[row]),
+                'market_value': self._optional(market_value[row]),
+                'profit_loss': self._optional(profit_loss[row]),
+                'profit_loss_pct': self._optional(profit_loss_pct[row]),
+                'weight': self._optional(weights[row])
+            })
+        return results
+
+    @staticmethod
+    def _optional(value):
+        return None if np.isnan(value) else float(value)
+
+    @staticmethod
+    def _summary(total_value, total_cost, unpriced):
+        profit_loss = total_value - total_cost
+        return {
+            'market_value': float(total_value),
+            'cost_basis': float(total_cost),
+            'profit_loss': float(profit_loss),
+            'profit_loss_pct': float(profit_loss / total_cost) if total_cost else None,
+            'unpriced_positions': unpriced
+        }
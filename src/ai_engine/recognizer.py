@@ -0,0 +1,217 @@
+import json
+import os
+import re
+from collections import deque
+from src.config import Config
+
+DEFAULT_UNIVERSE_PATH = os.path.join(os.path.dirname(__file__), 'data', 'ticker_universe.json')
+
+# Amaç anahtar kelimeleri (katlanmış biçimde): (ifade, ağırlık, yalnızca tam kelime mi)
+# Kök eşleşmesi Türkçe eklerini kapsar: "analiz" -> "analizi", "analizini"
+INTENT_KEYWORDS = {
+    'MARKET_ANALYSIS': [
+        ("fiyat", 1.0, False), ("trend", 1.0, False), ("analiz", 1.0, False), ("tahmin", 1.0, False),
+        ("grafik", 0.6, False), ("yukselir", 0.6, False), ("duser", 0.6, False), ("ne kadar", 0.5, True),
+        ("price", 1.0, False), ("forecast", 1.0, False), ("analysis", 1.0, False)
+    ],
+    'PORTFOLIO_ADVICE': [
+        ("portfoy", 1.0, False), ("yatirim", 0.8, False), ("tavsiye", 1.0, False), ("oneri", 0.8, False),
+        ("almali", 1.0, False), ("satmali", 1.0, False), ("alayim", 1.0, False), ("satayim", 1.0, False),
+        ("al", 0.4, True), ("sat", 0.4, True), ("tutmali", 0.8, False), ("portfolio", 1.0, False)
+    ],
+    'NEWS_QUERY': [
+        ("haber", 1.0, False), ("gelisme", 1.0, False), ("duyuru", 1.0, False), ("kap", 0.6, True),
+        ("news", 1.0, False)
+    ]
+}
+
+# Eşitlik durumunda öncelik sırası
+INTENT_ORDER = ['MARKET_ANALYSIS', 'PORTFOLIO_ADVICE', 'NEWS_QUERY']
+INTENT_THRESHOLD = 0.5
+
+_FOLD = str.maketrans("çğıöşüâîû", "cgiosuaiu")
+_APOSTROPHE_SUFFIX = re.compile(r"(?<=\w)['’‘`´]\w*")
+_WORD = re.compile(r"[^\W_]+")
+
+def fold(text):
+    """Türkçe büyük/küçük harf kurallarıyla küçültür ve aksanları katlar (İ->i, I->ı->i, ş->s...)"""
+    return text.replace('İ', 'i').replace('I', 'ı').lower().translate(_FOLD)
+
+def tokenize(message):
+    """Mesajı kesme işaretli ekleri atarak katlanmış kelimelere ayırır
+
+    (kelimeler, orijinalde tamamen büyük harfle yazılmış kelimelerin kümesi) döndürür.
+    """
+    words = []
+    upper = set()
+    for word in _WORD.findall(_APOSTROPHE_SUFFIX.sub("", message)):
+        folded = fold(word)
+        words.append(folded)
+        if word.isupper():
+            upper.add(folded)
+    return words, upper
+
+class _Automaton:
+    """Aho-Corasick çoklu desen otomatı; metin üzerinde tek geçişte tüm eşleşmeleri bulur"""
+
+    def __init__(self):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+
+    def add(self, pattern, payload):
+        node = 0
+        for char in pattern:
+            next_node = self.goto[node].get(char)
+            if next_node is None:
+                next_node = len(self.goto)
+                self.goto[node][char] = next_node
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            node = next_node
+        self.output[node].append(payload)
+
+    def build(self):
+        """Hata bağlantılarını genişlik öncelikli olarak kurar"""
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, next_node in self.goto[node].items():
+                queue.append(next_node)
+                fail = self.fail[node]
+                while fail and char not in self.goto[fail]:
+                    fail = self.fail[fail]
+                target = self.goto[fail].get(char, 0)
+                self.fail[next_node] = target if target != next_node else 0
+                self.output[next_node] = self.output[next_node] + self.output[self.fail[next_node]]
+
+    def search(self, text):
+        """(bitiş indeksi, yük) çiftlerini üretir"""
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(char, 0)
+            for payload in self.output[node]:
+                yield index, payload
+
+class Recognizer:
+    """Sembol ve amaç tanıyıcı: sembol evreni ve takma adlarla bir kez derlenir
+
+    Büyük harfle yazılmış semboller her zaman, küçük harfle yazılanlar yalnızca 5+ harfliyse
+    kabul edilir; kısa semboller için küçük harf eşleşmesi evrendeki takma adlarla tanımlanır
+    (ör. "btc", "eth"). Böylece "ada", "sol", "on" gibi sıradan kelimeler sembole dönüşmez.
+    """
+
+    def __init__(self, tickers, intent_keywords=None):
+        self.tickers = {}
+        self._automaton = _Automaton()
+
+        for entry in tickers:
+            symbol = entry['symbol'].upper()
+            self.tickers[symbol] = {
+                'symbol': symbol,
+                'asset_type': entry.get('asset_type', 'stock'),
+                'market': entry.get('market')
+            }
+            self._add('symbol', " ".join(tokenize(symbol)[0]), symbol, 1.0, exact=True, ticker=True)
+            for alias in entry.get('aliases', []):
+                pattern = " ".join(tokenize(alias)[0])
+                # Kısa takma adlar yalnızca tam kelime olarak, uzunlar ekli halleriyle de eşleşir
+                self._add('symbol', pattern, symbol, 0.9, exact=len(pattern) < 5)
+
+        for intent, keywords in (intent_keywords or INTENT_KEYWORDS).items():
+            for keyword, weight, exact in keywords:
+                self._add('intent', keyword, intent, weight, exact=exact)
+
+        self._automaton.build()
+
+    @classmethod
+    def from_file(cls, path=None):
+        """Sembol evrenini JSON dosyasından yükler"""
+        with open(path or DEFAULT_UNIVERSE_PATH, encoding='utf-8') as universe:
+            return cls(json.load(universe)['tickers'])
+
+    def _add(self, kind, pattern, value, weight, exact=False, ticker=False):
+        if pattern:
+            # Baştaki boşluk kelime başlangıcını garanti eder
+            self._automaton.add(" " + pattern, (kind, value, weight, exact, ticker, len(pattern)))
+
+    def asset_type(self, symbol):
+        """Evrendeki sembolün varlık tipini döndürür; bilinmiyorsa None"""
+        entry = self.tickers.get(symbol.upper())
+        return entry['asset_type'] if entry else None
+
+    def recognize(self, message):
+        """Mesajdaki sembol ve amaç adaylarını skorlarıyla birlikte tek geçişte bulur"""
+        words, upper = tokenize(message)
+        text = " " + " ".join(words) + " "
+
+        symbols = {}
+        intents = {}
+        for end, (kind, value, weight, exact, ticker, length) in self._automaton.search(text):
+            if exact and text[end + 1] != " ":
+                continue
+            start = end - length + 1
+            if kind == 'intent':
+                intents.setdefault(value, {})[text[start:end + 1]] = weight
+                continue
+
+            if ticker:
+                span = text[start:end + 1].split()
+                if all(word in upper for word in span):
+                    weight = 1.0
+                elif length >= 5:
+                    weight = 0.6
+                else:
+                    continue
+
+            candidate = symbols.get(value)
+            if candidate is None:
+                candidate = symbols[value] = {**self.tickers[value], 'score': weight, 'positions': set()}
+            candidate['score'] = max(candidate['score'], weight)
+            # Aynı konumdaki sembol ve takma ad eşleşmesi tek bahis sayılır
+            candidate['positions'].add(start)
+
+        for candidate in symbols.values():
+            positions = candidate.pop('positions')
+            candidate['mentions'] = len(positions)
+            candidate['position'] = min(positions)
+            candidate['score'] = round(min(1.0, candidate['score'] + 0.1 * (len(positions) - 1)), 3)
+
+        return {
+            'symbols': sorted(symbols.values(), key=lambda c: (-c['score'], c['position'])),
+            'intents': sorted(
+                ({'intent': intent, 'score': round(sum(matches.values()), 3)} for intent, matches in intents.items()),
+                key=lambda c: (-c['score'], INTENT_ORDER.index(c['intent']) if c['intent'] in INTENT_ORDER else len(INTENT_ORDER))
+            )
+        }
+
+    def best_intent(self, recognition):
+        """En yüksek skorlu amacı döndürür
+
+        Eşiği geçen amaç yoksa, mesajda sembol geçiyorsa ("THYAO hakkında ne düşünüyorsun")
+        MARKET_ANALYSIS, geçmiyorsa GENERAL döner.
+        """
+        intents = recognition['intents']
+        if intents and intents[0]['score'] >= INTENT_THRESHOLD:
+            return intents[0]['intent']
+        if recognition['symbols']:
+            return "MARKET_ANALYSIS"
+        return "GENERAL"
+
+    def best_symbol(self, recognition):
+        """En yüksek skorlu sembolü döndürür; yoksa None"""
+        symbols = recognition['symbols']
+        return symbols[0]['symbol'] if symbols else None
+
+# Süreç genelinde bir kez derlenen tanıyıcı
+_recognizer = None
+
+def get_recognizer():
+    """Config.TICKER_UNIVERSE_PATH (boşsa paketteki evren) ile derlenmiş paylaşılan tanıyıcıyı döndürür"""
+    global _recognizer
+    if _recognizer is None:
+        _recognizer = Recognizer.from_file(Config.TICKER_UNIVERSE_PATH or None)
+    return _recognizer
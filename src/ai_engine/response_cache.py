@@ -0,0 +1,121 @@
+import asyncio
+import time
+from collections import OrderedDict
+from src.config import Config
+
+# Yanıtı kullanıcıya özel veriye dayanan amaçlar; bu amaçlar kullanıcılar arasında paylaşılmaz
+USER_SCOPED_INTENTS = {'PORTFOLIO_ADVICE'}
+
+class ResponseCache:
+    """Deterministik sohbet yanıtları için (amaç, sembol, veri sürümü, kullanıcı) anahtarlı TTL önbellek
+
+    Sembolün verisi değiştiğinde invalidate() sürümü artırır; eski sürümlü kayıtlar bir daha
+    eşleşmez ve LRU ile düşer. Aynı anahtar için eşzamanlı hesaplamalar tek çağrıda birleşir.
+    """
+
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries or Config.RESPONSE_CACHE_MAX_ENTRIES
+        # anahtar -> (yanıt, son geçerlilik zamanı)
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._inflight = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def _key(self, intent, symbol, user_id):
+        if intent in USER_SCOPED_INTENTS and user_id is None:
+            raise ValueError(f"{intent} yanıtları kullanıcıya özeldir, user_id gerekli")
+        if intent not in USER_SCOPED_INTENTS:
+            user_id = None
+        symbol = symbol.upper()
+        return intent, symbol, self._versions.get(symbol, 0), user_id
+
+    def get(self, intent, symbol, user_id=None):
+        """Süresi dolmamış yanıtı döndürür; yoksa None"""
+        key = self._key(intent, symbol, user_id)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() >= entry[1]:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def set(self, intent, symbol, response, ttl, user_id=None):
+        """Yanıtı ttl saniye için saklar, kapasite aşılırsa en eski kullanılanı çıkarır"""
+        if ttl <= 0:
+            return
+        key = self._key(intent, symbol, user_id)
+        self._entries[key] = (response, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_compute(self, intent, symbol, compute, user_id=None):
+        """Önbellekteki yanıtı döndürür; yoksa compute() ile (yanıt, ttl) üretip saklar"""
+        response = self.get(intent, symbol, user_id)
+        if response is not None:
+            self.hits += 1
+            return response
+
+        key = self._key(intent, symbol, user_id)
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(inflight)
+
+        self.misses += 1
+        task = asyncio.ensure_future(self._compute_and_store(key, compute))
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    async def _compute_and_store(self, key, compute):
+        intent, symbol, version, user_id = key
+        try:
+            response, ttl = await compute()
+            # Hesaplama sürerken veri yenilendiyse eski sürümlü yanıt saklanmaz
+            if response is not None and self._versions.get(symbol, 0) == version:
+                self.set(intent, symbol, response, ttl, user_id)
+            return response
+        finally:
+            self._inflight.pop(key, None)
+
+    def invalidate(self, symbols):
+        """Sembollerin veri sürümünü artırır; önbellekteki eski yanıtlar geçersiz olur"""
+        for symbol in symbols:
+            symbol = symbol.upper()
+            self._versions[symbol] = self._versions.get(symbol, 0) + 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        """Önbellek sayaçlarını döndürür"""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            'size': len(self._entries),
+            'max_entries': self.max_entries,
+            'inflight': len(self._inflight),
+            'hits': self.hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'evictions': self.evictions,
+            'hit_ratio': (self.hits + self.coalesced) / lookups if lookups else 0.0
+        }
+
+# Süreç genelinde tüm sohbet botlarıyla paylaşılan önbellek
+_response_cache = None
+
+def get_response_cache():
+    """Paylaşılan sohbet yanıt önbelleğini döndürür"""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache()
+    return _response_cache
@@ -0,0 +1,152 @@
+import asyncio
+import hashlib
+import os
+import re
+import sqlite3
+import time
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from src.config import Config
+
+class SentimentCache:
+    """Normalize edilmiş metin ve model kimliğinin özetiyle anahtarlanan iki katmanlı duygu önbelleği
+
+    Bellekte LRU katmanı, diskte yeniden başlatmalardan sonra da kalıcı olan bir SQLite deposu tutar.
+    """
+
+    def __init__(self, model_id, path=None, max_memory_entries=None):
+        self.model_id = model_id
+        self.path = path or Config.SENTIMENT_CACHE_PATH
+        self.max_memory_entries = max_memory_entries or Config.SENTIMENT_CACHE_MEMORY_ENTRIES
+        self._memory = OrderedDict()
+        # SQLite erişimi tek bir iş parçacığında sıralanır
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._conn = None
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize(text):
+        """Önemsiz farklılıkları (boşluk, büyük/küçük harf, unicode biçimi) giderir"""
+        text = unicodedata.normalize('NFKC', text or '')
+        return re.sub(r'\s+', ' ', text).strip().casefold()
+
+    def key(self, text):
+        """Metnin model kimliğiyle birlikte içerik özetini döndürür"""
+        payload = f"{self.model_id}\x00{self.normalize(text)}".encode('utf-8')
+        return hashlib.sha256(payload).hexdigest()
+
+    def _connect(self):
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sentiment_cache ("
+                "key TEXT PRIMARY KEY, model_id TEXT NOT NULL, label TEXT NOT NULL, "
+                "score REAL NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_sentiment_cache_model ON sentiment_cache (model_id)"
+            )
+            # Eski model sürümlerine ait kayıtlar artık eşleşmez; yer kaplamasınlar
+            self._conn.execute("DELETE FROM sentiment_cache WHERE model_id != ?", (self.model_id,))
+            self._conn.commit()
+        return self._conn
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _read_disk(self, keys):
+        conn = self._connect()
+        found = {}
+        # SQLite parametre sınırına takılmamak için parçalar halinde sorgula
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            rows = conn.execute(
+                f"SELECT key, label, score FROM sentiment_cache WHERE key IN ({placeholders})", chunk
+            ).fetchall()
+            for key, label, score in rows:
+                found[key] = {'label': label, 'score': score}
+        return found
+
+    def _write_disk(self, items):
+        conn = self._connect()
+        now = time.time()
+        conn.executemany(
+            "INSERT OR REPLACE INTO sentiment_cache (key, model_id, label, score, created_at) VALUES (?, ?, ?, ?, ?)",
+            [(key, self.model_id, value['label'], value['score'], now) for key, value in items.items()]
+        )
+        conn.commit()
+
+    async def _in_executor(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def get_many(self, texts):
+        """Metinlerin önbellekteki sonuçlarını aynı sırada döndürür; bulunmayanlar None"""
+        keys = [self.key(text) for text in texts]
+        results = [None] * len(keys)
+        disk_lookup = []
+
+        for i, key in enumerate(keys):
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                results[i] = value
+            else:
+                disk_lookup.append(i)
+
+        if disk_lookup:
+            found = await self._in_executor(self._read_disk, list({keys[i] for i in disk_lookup}))
+            for i in disk_lookup:
+                value = found.get(keys[i])
+                if value is not None:
+                    self.disk_hits += 1
+                    self._remember(keys[i], value)
+                    results[i] = value
+                else:
+                    self.misses += 1
+        return results
+
+    async def put_many(self, texts, values):
+        """Yeni sonuçları her iki katmana yazar"""
+        items = {}
+        for text, value in zip(texts, values):
+            key = self.key(text)
+            self._remember(key, value)
+            items[key] = value
+        if items:
+            await self._in_executor(self._write_disk, items)
+
+    async def invalidate(self, model_id=None):
+        """Önbelleği temizler; model_id verilirse yalnızca o modele ait kayıtları siler"""
+        self._memory.clear()
+
+        def _delete():
+            conn = self._connect()
+            if model_id is None:
+                conn.execute("DELETE FROM sentiment_cache")
+            else:
+                conn.execute("DELETE FROM sentiment_cache WHERE model_id = ?", (model_id,))
+            conn.commit()
+
+        await self._in_executor(_delete)
+
+    def stats(self):
+        """Önbellek sayaçlarını döndürür"""
+        return {
+            'memory_size': len(self._memory),
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses
+        }
@@ -0,0 +1,45 @@
+from src.config import Config
+from src.ai_engine.batching import MicroBatcher
+
+class SentimentInferenceService:
+    """FinBERT çağrılarını mikro partilerde toplayıp ayrı bir iş parçacığında çalıştırır"""
+
+    def __init__(self, get_pipeline, max_batch_size=None, max_wait_ms=None):
+        # Model işçi iş parçacığında, ilk partide yüklenir
+        self.get_pipeline = get_pipeline
+        self.max_chars = Config.SENTIMENT_MAX_CHARS
+        self.max_tokens = Config.SENTIMENT_MAX_TOKENS
+        self.pipeline_batch_size = Config.SENTIMENT_PIPELINE_BATCH_SIZE
+        self.batcher = MicroBatcher(
+            self._predict_batch,
+            max_batch_size=max_batch_size or Config.SENTIMENT_MAX_BATCH_SIZE,
+            max_wait=(max_wait_ms or Config.SENTIMENT_MAX_WAIT_MS) / 1000.0,
+            name='finbert'
+        )
+
+    async def analyze(self, text):
+        """Tek bir metnin duygu sonucunu döndürür; metin diğer çağrılarla aynı partide işlenir"""
+        return await self.batcher.submit(text[:self.max_chars])
+
+    def _predict_batch(self, texts):
+        """Metinleri uzunluğa göre sıralayıp modele verir, sonuçları orijinal sırada döndürür"""
+        # Benzer uzunluktaki metinler aynı alt partiye düşer; dolgu (padding) israfı azalır
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        outputs = self.get_pipeline()(
+            [texts[i] for i in order],
+            batch_size=self.pipeline_batch_size,
+            truncation=True,
+            max_length=self.max_tokens
+        )
+
+        results = [None] * len(texts)
+        for i, output in zip(order, outputs):
+            results[i] = {
+                'label': output['label'],
+                'score': float(output['score'])
+            }
+        return results
+
+    def stats(self):
+        """Parti sayaçlarını döndürür"""
+        return self.batcher.stats()
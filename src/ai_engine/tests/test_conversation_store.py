@@ -0,0 +1,80 @@
+import asyncio
+from datetime import timedelta
+from src.ai_engine import conversation_store
+from src.ai_engine.conversation_store import ConversationStore
+
+class BrokenEngine:
+    def begin(self):
+        raise RuntimeError("veritabanı kapalı")
+
+def test_failed_flush_keeps_rows_for_retry():
+    store = ConversationStore(engine=BrokenEngine(), max_users=1, max_turns=2)
+    store.record(1, 'user', 'a')
+    store.record(1, 'assistant', 'b')
+    asyncio.run(store.flush())
+    assert store.stats()['pending'] == 2
+    assert store.flush_errors == 1
+
+    # Kuyruk hafıza kapasitesini aşarsa en eski turlar atılır
+    store.record(1, 'user', 'c')
+    asyncio.run(store.flush())
+    assert [row['content'] for row in store._pending] == ['b', 'c']
+    assert store.dropped == 1
+
+def test_first_load_merges_already_flushed_turns(monkeypatch):
+    store = ConversationStore(max_turns=10)
+    store.record(7, 'user', 'soru')
+    store.record(7, 'assistant', 'cevap')
+    flushed = list(store._buffers[7])
+    older = {'role': 'user', 'content': 'eski', 'created_at': flushed[0]['created_at'] - timedelta(minutes=5)}
+
+    async def history(user_id, limit=10):
+        # Veritabanı yeniden eskiye döndürür; son iki tur zaten yazılmış
+        return [dict(turn) for turn in reversed([older] + flushed)]
+    monkeypatch.setattr(conversation_store, 'get_user_chat_history', history)
+
+    turns = asyncio.run(store.turns(7))
+    assert [turn['content'] for turn in turns] == ['eski', 'soru', 'cevap']
+
+def test_fit_keeps_newest_turns_and_summarizes_older_questions():
+    store = ConversationStore(token_budget=30, summary_tokens=12, count_tokens=lambda text: len(text.split()))
+    turns = [{'role': 'user', 'content': f"soru {i} " + "kelime " * 8} for i in range(5)]
+
+    context = store.fit(turns)
+    assert context[0]['role'] == 'summary'
+    assert context[-1] == turns[-1]
+    assert sum(len(turn['content'].split()) for turn in context) <= 30
+
+
+def test_flush_persists_api_turns_next_to_bot_turns_with_snowflake_ids(tmp_path):
+    from sqlalchemy import select
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from src.database.models import Base, ChatMessage, User
+
+    snowflake = 123456789012345678
+
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(User.__table__.insert(), [{'id': 1, 'username': 'api'}])
+
+        store = ConversationStore(engine=engine)
+        store.record(1, 'user', 'api soru')
+        store.record(snowflake, 'user', 'discord soru', platform='discord')
+        # Platformsuz kaydedilmiş büyük kimlik de toplu yazmayı bozmaz
+        store.record(snowflake, 'user', 'kayıp soru')
+        store.record(1, 'assistant', 'api cevap')
+        await store.flush()
+
+        async with engine.connect() as conn:
+            rows = (await conn.execute(select(ChatMessage.user_id, ChatMessage.content).order_by(ChatMessage.id))).all()
+        bot_turns = await store.turns(snowflake, platform='discord')
+        await engine.dispose()
+        return rows, bot_turns, store.stats()
+
+    rows, bot_turns, stats = asyncio.run(run())
+    assert [tuple(row) for row in rows] == [(1, 'api soru'), (1, 'api cevap')]
+    assert [turn['content'] for turn in bot_turns] == ['discord soru']
+    assert stats['written'] == 2 and stats['memory_only'] == 2
+    assert stats['flush_errors'] == 0 and stats['pending'] == 0
@@ -0,0 +1,59 @@
+import asyncio
+from src.ai_engine.forecast_job import ForecastJob
+
+class FakeAnalyzer:
+    """Her çağrıda istenen sembolleri kaydeder; ilk çağrıda bekleyerek tur sırasında sinyal gelmesine izin verir"""
+
+    def __init__(self):
+        self.calls = []
+        self.first_call = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def analyze_trends(self, symbols, use_forecasts=True, with_indicators=True):
+        self.calls.append(list(symbols))
+        if len(self.calls) == 1:
+            self.first_call.set()
+            await self.release.wait()
+        return {symbol: {'trend': 'UP', 'confidence': 0.6, 'prediction': 1.0} for symbol in symbols}
+
+class FakeStore:
+    def __init__(self):
+        self.written = []
+
+    async def write(self, forecasts):
+        self.written.append(sorted(forecasts))
+
+def test_dirty_symbol_marked_during_a_run_is_refreshed_promptly():
+    async def scenario():
+        analyzer, store = FakeAnalyzer(), FakeStore()
+
+        async def tracked():
+            return ['thyao']
+        job = ForecastJob(analyzer, store, symbols_loader=tracked, interval=3600, debounce=0)
+        job.start()
+        await analyzer.first_call.wait()
+        job.mark_dirty('btc')
+        analyzer.release.set()
+        for _ in range(100):
+            if len(analyzer.calls) > 1:
+                break
+            await asyncio.sleep(0.01)
+        await job.stop()
+        return analyzer.calls
+
+    assert asyncio.run(scenario())[:2] == [['THYAO'], ['BTC']]
+
+def test_run_once_merges_dirty_symbols_and_notifies():
+    async def scenario():
+        analyzer, store = FakeAnalyzer(), FakeStore()
+        analyzer.release.set()
+        written = []
+        job = ForecastJob(analyzer, store, on_written=written.extend)
+        job.mark_dirty('eth')
+        await job.run_once({'BTC'})
+        return store.written, sorted(written), job.stats()
+
+    store_writes, notified, stats = asyncio.run(scenario())
+    assert store_writes == [['BTC', 'ETH']]
+    assert notified == ['BTC', 'ETH']
+    assert stats['pending_dirty'] == 0 and stats['forecasts_written'] == 2
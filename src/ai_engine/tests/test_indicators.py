@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta
+import numpy as np
+import pytest
+from src.ai_engine import indicators as indicators_module
+from src.ai_engine.indicators import IndicatorEngine
+
+def engine(**kwargs):
+    params = dict(window=5, ema_period=5, rsi_period=3, macd_fast=3, macd_slow=6, macd_signal=3, bollinger_std=2.0)
+    params.update(kwargs)
+    return IndicatorEngine(**params)
+
+def prices(count=40, seed=1):
+    return 100 + np.cumsum(np.random.default_rng(seed).normal(0, 1, count))
+
+def test_sma_and_bollinger_match_window():
+    indicators = engine()
+    series = prices()
+    for price in series:
+        indicators.update('abc', price)
+    snapshot = indicators.snapshot('ABC')
+
+    window = series[-5:]
+    assert snapshot['sma'] == pytest.approx(window.mean(), abs=1e-6)
+    assert snapshot['bollinger_upper'] == pytest.approx(window.mean() + 2 * window.std(), abs=1e-5)
+    assert snapshot['last_price'] == pytest.approx(series[-1], abs=1e-6)
+    assert snapshot['samples'] == len(series)
+
+def test_indicators_are_none_until_enough_samples():
+    indicators = engine()
+    for price in (1.0, 2.0, 3.0):
+        indicators.update('ABC', price)
+    snapshot = indicators.snapshot('ABC')
+
+    assert snapshot['sma'] is None
+    assert snapshot['macd'] is None
+    assert snapshot['rsi'] is None
+    assert indicators.snapshot('XYZ') is None
+
+def test_rsi_of_rising_series_is_100():
+    indicators = engine()
+    for price in range(1, 11):
+        indicators.update('ABC', float(price))
+
+    assert indicators.snapshot('ABC')['rsi'] == 100.0
+
+def test_bootstrap_matches_tick_by_tick_updates():
+    series = prices(300)
+    start = datetime(2026, 1, 5, 9)
+    timestamps = [start + timedelta(minutes=i) for i in range(len(series))]
+    volumes = np.cumsum(np.full(len(series), 10.0))
+
+    incremental = engine()
+    for price, volume, timestamp in zip(series, volumes, timestamps):
+        incremental.update('ABC', price, volume, timestamp)
+    bootstrapped = engine()
+    bootstrapped.bootstrap('ABC', series, volumes, np.array(timestamps, dtype='datetime64[us]'))
+
+    expected = incremental.snapshot('ABC')
+    actual = bootstrapped.snapshot('ABC')
+    for name, value in expected.items():
+        assert actual[name] == pytest.approx(value, abs=1e-4), name
+
+def test_stale_ticks_are_ignored():
+    indicators = engine()
+    now = datetime(2026, 1, 5, 9)
+    assert indicators.update('ABC', 10.0, timestamp=now)
+    assert not indicators.update('ABC', 11.0, timestamp=now)
+    assert indicators.snapshot('ABC')['last_price'] == 10.0
+
+def test_vwap_uses_cumulative_session_volume():
+    indicators = engine()
+    day = datetime(2026, 1, 5, 9)
+    indicators.update('ABC', 10.0, 100, day)
+    indicators.update('ABC', 20.0, 300, day + timedelta(minutes=1))
+
+    assert indicators.snapshot('ABC')['vwap'] == pytest.approx((10 * 100 + 20 * 200) / 300)
+
+    # Yeni seansta birikim sıfırlanır
+    indicators.update('ABC', 30.0, 50, day + timedelta(days=1))
+    assert indicators.snapshot('ABC')['vwap'] == pytest.approx(30.0)
+
+def test_least_recently_updated_symbol_is_evicted(monkeypatch):
+    ticks = iter(range(100))
+    monkeypatch.setattr(indicators_module.time, 'monotonic', lambda: float(next(ticks)))
+    indicators = engine(max_symbols=2, initial_capacity=2)
+    indicators.update('A', 1.0)
+    indicators.update('B', 1.0)
+    indicators.update('A', 2.0)
+    indicators.update('C', 1.0)
+
+    assert 'B' not in indicators
+    assert 'A' in indicators and 'C' in indicators
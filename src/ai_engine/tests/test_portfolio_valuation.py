@@ -0,0 +1,48 @@
+import asyncio
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from src.ai_engine.portfolio_valuation import PortfolioValuationEngine
+from src.database.models import Base, Portfolio, User
+from src.database.queries import load_portfolios
+
+class FakeCollector:
+    def __init__(self, prices):
+        self.prices = prices
+        self.calls = []
+
+    async def get_stock_data(self, symbol):
+        self.calls.append(symbol)
+        price = self.prices.get(symbol)
+        return None if price is None else {'symbol': symbol, 'price': price}
+
+    async def get_crypto_data(self, symbol):
+        return await self.get_stock_data(symbol)
+
+def test_value_users_loads_portfolios_once_and_fetches_each_symbol_once(tmp_path):
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            session.add_all([User(id=1, username='a'), User(id=2, username='b'), User(id=3, username='c')])
+            session.add_all([
+                Portfolio(user_id=1, asset_type='stock', symbol='AAPL', quantity=2, purchase_price=100),
+                Portfolio(user_id=1, asset_type='crypto', symbol='BTC', quantity=1, purchase_price=50),
+                Portfolio(user_id=2, asset_type='stock', symbol='aapl', quantity=1, purchase_price=150),
+                Portfolio(user_id=3, asset_type='stock', symbol='XYZ', quantity=1, purchase_price=10),
+            ])
+            await session.commit()
+
+            collector = FakeCollector({'AAPL': 120.0, 'BTC': 70.0})
+            valuation = PortfolioValuationEngine(collector, portfolio_loader=lambda ids: load_portfolios(ids, session))
+            results = await valuation.value_users([1, 2])
+        await engine.dispose()
+        return results, collector.calls
+
+    results, calls = asyncio.run(scenario())
+    assert sorted(calls) == ['AAPL', 'BTC']
+    assert set(results) == {1, 2}
+    assert results[1]['summary']['market_value'] == pytest.approx(310.0)
+    assert results[1]['summary']['profit_loss'] == pytest.approx(60.0)
+    assert results[2]['positions'][0]['profit_loss'] == pytest.approx(-30.0)
+    assert results[2]['positions'][0]['weight'] == pytest.approx(1.0)
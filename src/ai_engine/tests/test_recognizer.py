@@ -0,0 +1,57 @@
+import pytest
+from src.ai_engine.recognizer import Recognizer, fold, tokenize
+
+TICKERS = [
+    {'symbol': 'THYAO', 'asset_type': 'stock', 'market': 'BIST', 'aliases': ['türk hava yolları']},
+    {'symbol': 'BTC', 'asset_type': 'crypto', 'market': 'CRYPTO', 'aliases': ['bitcoin', 'btc']},
+    {'symbol': 'SOL', 'asset_type': 'crypto', 'market': 'CRYPTO', 'aliases': ['solana']},
+]
+
+@pytest.fixture(scope='module')
+def recognizer():
+    return Recognizer(TICKERS)
+
+def test_fold_handles_turkish_casing():
+    assert fold("İSTANBUL ŞİŞLİ") == "istanbul sisli"
+    assert fold("IĞDIR") == "igdir"
+
+def test_tokenize_drops_apostrophe_suffixes_and_tracks_uppercase():
+    words, upper = tokenize("THYAO'nun fiyatı")
+    assert words == ['thyao', 'fiyati']
+    assert upper == {'thyao'}
+
+@pytest.mark.parametrize('message, symbol, intent', [
+    ("THYAO'nun fiyatı ne olur?", 'THYAO', 'MARKET_ANALYSIS'),
+    ("Bitcoin almalı mıyım?", 'BTC', 'PORTFOLIO_ADVICE'),
+    ("btc ile ilgili haberler", 'BTC', 'NEWS_QUERY'),
+    ("Türk Hava Yollarının analizini yapar mısın", 'THYAO', 'MARKET_ANALYSIS'),
+    ("SOL hakkında ne düşünüyorsun", 'SOL', 'MARKET_ANALYSIS'),
+])
+def test_recognizes_symbol_and_intent(recognizer, message, symbol, intent):
+    recognition = recognizer.recognize(message)
+    assert recognizer.best_symbol(recognition) == symbol
+    assert recognizer.best_intent(recognition) == intent
+
+def test_short_lowercase_tickers_are_not_symbols(recognizer):
+    recognition = recognizer.recognize("sol tarafta ne var")
+    assert recognizer.best_symbol(recognition) is None
+    assert recognizer.best_intent(recognition) == 'GENERAL'
+
+def test_lowercase_long_ticker_has_lower_score(recognizer):
+    upper = recognizer.recognize("THYAO")['symbols'][0]
+    lower = recognizer.recognize("thyao")['symbols'][0]
+    assert upper['score'] == 1.0
+    assert lower['score'] < upper['score']
+
+def test_repeated_mentions_raise_score(recognizer):
+    candidate = recognizer.recognize("bitcoin mi solana mı, bitcoin bence")['symbols'][0]
+    assert candidate['symbol'] == 'BTC'
+    assert candidate['mentions'] == 2
+
+def test_asset_type_lookup(recognizer):
+    assert recognizer.asset_type('btc') == 'crypto'
+    assert recognizer.asset_type('SPY') is None
+
+def test_packaged_universe_loads():
+    recognizer = Recognizer.from_file()
+    assert recognizer.asset_type('THYAO') == 'stock'
@@ -0,0 +1,46 @@
+import numpy as np
+from src.config import Config
+from src.ai_engine.batching import MicroBatcher
+
+class TrendInferenceService:
+    """Eşzamanlı isteklerin fiyat pencerelerini tek bir partili LSTM geçişinde tahmin eder"""
+
+    def __init__(self, get_model, window=None, max_batch_size=None, max_wait_ms=None):
+        # Model işçi iş parçacığında, ilk partide yüklenir
+        self.get_model = get_model
+        self.window = window or Config.TREND_WINDOW
+        self.batcher = MicroBatcher(
+            self._predict_batch,
+            max_batch_size=max_batch_size or Config.TREND_MAX_BATCH_SIZE,
+            max_wait=(max_wait_ms or Config.TREND_MAX_WAIT_MS) / 1000.0,
+            name='lstm'
+        )
+
+    @staticmethod
+    def scale(window):
+        """Pencereyi kendi min/max değerleriyle [0, 1] aralığına ölçekler
+
+        Ölçek parametreleri her çağrıda yerel olarak hesaplanır; istekler arasında paylaşılmaz.
+        """
+        low = float(window.min())
+        span = float(window.max()) - low
+        if span == 0:
+            span = 1.0
+        return (window - low) / span, low, span
+
+    async def predict_next(self, prices):
+        """Son `window` fiyattan bir sonraki fiyatı tahmin eder"""
+        window = np.asarray(prices, dtype=np.float32)[-self.window:]
+        scaled, low, span = self.scale(window)
+        scaled_prediction = await self.batcher.submit(scaled)
+        return low + scaled_prediction * span
+
+    def _predict_batch(self, windows):
+        """Ölçeklenmiş pencereleri (N, window, 1) dizisi olarak tek geçişte modele verir"""
+        batch = np.stack(windows)[..., np.newaxis]
+        predictions = self.get_model().predict_on_batch(batch)
+        return [float(value) for value in np.asarray(predictions).reshape(-1)]
+
+    def stats(self):
+        """Parti sayaçlarını döndürür"""
+        return self.batcher.stats()
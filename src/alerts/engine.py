@@ -0,0 +1,292 @@
+import asyncio
+from collections import defaultdict
+from src.config import Config
+from src.alerts.index import AlertIndex
+from src.database.alert_store import AlertStore
+from src.data_collectors.poller import HotSymbolPoller
+from src.utils.rate_limit import TokenBucket
+
+# Kullanıcının yazabileceği yön ifadeleri
+DIRECTIONS = {
+    '>': 'above', '>=': 'above', 'ustu': 'above', 'üstü': 'above', 'above': 'above',
+    '<': 'below', '<=': 'below', 'alti': 'below', 'altı': 'below', 'below': 'below'
+}
+DIRECTION_SYMBOLS = {'above': '≥', 'below': '≤'}
+# Alarm bildirimi gönderebilen bot platformları
+ALERT_PLATFORMS = ('telegram', 'discord')
+
+ALERT_USAGE = (
+    "Kullanım:\n"
+    "{prefix}alarm SEMBOL > FİYAT - fiyat eşiğin üzerine çıkınca haber verir\n"
+    "{prefix}alarm SEMBOL < FİYAT - fiyat eşiğin altına inince haber verir\n"
+    "{prefix}alarm liste - aktif alarmlarınız\n"
+    "{prefix}alarm sil ID - alarmı siler"
+)
+
+def normalize_alert(symbol, direction, threshold):
+    """Alarm girdilerini doğrular; (sembol, yön, eşik) döndürür, geçersizse ValueError fırlatır"""
+    symbol = str(symbol or '').strip().upper()
+    if not symbol.isalnum():
+        raise ValueError("Geçerli bir sembol girin")
+    direction = DIRECTIONS.get(str(direction or '').strip().lower())
+    if direction is None:
+        raise ValueError("Yön '>' ya da '<' olmalıdır")
+    try:
+        threshold = float(str(threshold).replace(',', '.')) if isinstance(threshold, str) else float(threshold)
+    except (TypeError, ValueError):
+        raise ValueError("Eşik sayı olmalıdır")
+    if not threshold > 0:
+        raise ValueError("Eşik sıfırdan büyük olmalıdır")
+    return symbol, direction, threshold
+
+def parse_alert_command(args):
+    """Bot komut argümanlarını ('add', (sembol, yön, eşik)), ('list', None) ya da ('remove', id) olarak çözer
+
+    "THYAO > 300" ve "THYAO >300" biçimleri kabul edilir; anlaşılmazsa ValueError fırlatılır.
+    """
+    args = [arg for arg in args if arg]
+    if not args:
+        raise ValueError("Eksik argüman")
+    command = args[0].lower()
+    if command in ('liste', 'list') and len(args) == 1:
+        return 'list', None
+    if command in ('sil', 'delete') and len(args) == 2:
+        if not args[1].isdigit():
+            raise ValueError("Alarm ID sayı olmalıdır")
+        return 'remove', int(args[1])
+
+    rest = "".join(args[1:])
+    for operator in ('>=', '<=', '>', '<'):
+        if rest.startswith(operator):
+            return 'add', normalize_alert(args[0], operator, rest[len(operator):])
+    if len(args) == 3:
+        return 'add', normalize_alert(args[0], args[1], args[2])
+    raise ValueError("Anlaşılamayan alarm komutu")
+
+def format_alert(alert):
+    """Alarmı tek satır olarak biçimlendirir"""
+    return f"#{alert['id']} {alert['symbol']} {DIRECTION_SYMBOLS[alert['direction']]} {alert['threshold']:g}"
+
+class AlertEngine:
+    """Bir bot platformunun fiyat alarmlarını izler ve tetiklenenleri toplu olarak gönderir
+
+    - Aktif alarmlar sembol başına sıralı eşik indeksinde tutulur; her fiyat ikili aramayla eşleşir.
+    - Alarmı olan semboller arka planda yoklanır; yeni fiyatlar on_quote dinleyicisine gelir.
+    - Tetiklenen alarmlar kısa aralıklarla toplanır, veritabanında tek işlemde tetiklenmiş işaretlenir
+      ve sohbet başına tek mesajda, jeton kovasıyla hız sınırlanarak gönderilir.
+    - API üzerinden eklenen alarmlar periyodik senkronizasyonla (id > son görülen id) indekse alınır.
+    """
+
+    def __init__(self, platform, send, collector=None, store=None, max_length=4096, rate=None, burst=None,
+                 concurrency=None, delivery_interval=None, sync_interval=None, max_per_user=None):
+        self.platform = platform
+        # send(chat_id, text) bir awaitable döndürür
+        self.send = send
+        self.store = store or AlertStore()
+        self.index = AlertIndex()
+        self.max_length = max_length
+        self.bucket = TokenBucket(rate or Config.ALERT_SEND_RATE, burst or Config.ALERT_SEND_BURST)
+        self.concurrency = concurrency or Config.ALERT_SEND_CONCURRENCY
+        self.delivery_interval = delivery_interval or Config.ALERT_DELIVERY_INTERVAL
+        self.sync_interval = sync_interval or Config.ALERT_SYNC_INTERVAL
+        self.max_per_user = max_per_user or Config.ALERT_MAX_PER_USER
+
+        self.collector = collector
+        self.poller = None
+        if collector is not None:
+            collector.add_listener(self.on_quote)
+            self.poller = HotSymbolPoller(collector, portfolio_loader=self.watched_symbols)
+
+        self._triggered = []
+        self._last_id = 0
+        self._wakeup = None
+        self._tasks = []
+
+        self.matched = 0
+        self.delivered = 0
+        self.messages = 0
+        self.failed = 0
+        self.rate_limited = 0
+        self.syncs = 0
+
+    async def start(self):
+        """Aktif alarmları yükler; gönderim, senkronizasyon ve yoklama görevlerini başlatır"""
+        await self.sync()
+        self._wakeup = asyncio.Event()
+        self._tasks = [
+            asyncio.ensure_future(self._delivery_loop()),
+            asyncio.ensure_future(self._sync_loop())
+        ]
+        if self.poller is not None:
+            self.poller.start()
+
+    async def stop(self):
+        """Görevleri durdurur ve bekleyen tetiklenmiş alarmları gönderir"""
+        if self.poller is not None:
+            await self.poller.stop()
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+        await self.deliver_pending()
+
+    async def sync(self):
+        """Son senkronizasyondan sonra eklenen aktif alarmları sayfa sayfa indekse alır"""
+        while True:
+            rows = await self.store.load_active(self.platform, self._last_id, Config.ALERT_LOAD_BATCH)
+            for row in rows:
+                self.index.add(row)
+            if rows:
+                self._last_id = rows[-1]['id']
+            if len(rows) < Config.ALERT_LOAD_BATCH:
+                break
+        self.syncs += 1
+
+    async def add(self, user_id, chat_id, symbol, direction, threshold, asset_type=None):
+        """Alarmı doğrulayıp kaydeder ve indekse ekler; kayıt sözlüğünü döndürür"""
+        symbol, direction, threshold = normalize_alert(symbol, direction, threshold)
+        if await self.store.count_active(self.platform, user_id) >= self.max_per_user:
+            raise ValueError(f"En fazla {self.max_per_user} aktif alarm tanımlanabilir")
+        alert = await self.store.add({
+            'platform': self.platform,
+            'user_id': user_id,
+            'chat_id': chat_id,
+            'asset_type': asset_type or 'stock',
+            'symbol': symbol,
+            'direction': direction,
+            'threshold': threshold
+        })
+        self.index.add(alert)
+        return alert
+
+    async def remove(self, user_id, alert_id):
+        """Kullanıcının alarmını siler; silindiyse True döndürür"""
+        removed = await self.store.remove(self.platform, user_id, alert_id)
+        if removed:
+            self.index.remove(alert_id)
+        return removed
+
+    async def list(self, user_id):
+        """Kullanıcının aktif alarmlarını döndürür"""
+        return await self.store.list_active(self.platform, user_id)
+
+    async def watched_symbols(self):
+        """Yoklayıcı için alarmı olan (varlık tipi, sembol) çiftleri"""
+        return self.index.symbols()
+
+    def on_quote(self, quote):
+        """Fiyat dinleyicisi: tetiklenen alarmları indeksten çıkarıp gönderim kuyruğuna alır"""
+        triggered = self.index.match(quote['symbol'], quote['price'])
+        if not triggered:
+            return
+        self.matched += len(triggered)
+        self._triggered.extend((alert, quote['price']) for alert in triggered)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _delivery_loop(self):
+        while True:
+            await self._wakeup.wait()
+            # Aynı anda tetiklenen alarmlar kısa bir süre toplanıp birlikte gönderilir
+            await asyncio.sleep(self.delivery_interval)
+            self._wakeup.clear()
+            try:
+                await self.deliver_pending()
+            except Exception as e:
+                print(f"Alarm gönderim hatası: {e}")
+
+    async def _sync_loop(self):
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                await self.sync()
+            except Exception as e:
+                print(f"Alarm senkronizasyon hatası: {e}")
+
+    async def deliver_pending(self):
+        """Bekleyen tetiklenmiş alarmları işaretler ve sohbet başına birleştirerek gönderir"""
+        if not self._triggered:
+            return
+        batch, self._triggered = self._triggered, []
+        try:
+            claimed = await self.store.claim([alert['id'] for alert, _ in batch])
+        except Exception as e:
+            print(f"Alarm işaretleme hatası: {e}")
+            # Bir sonraki turda yeniden denenir
+            self._triggered = batch + self._triggered
+            return
+
+        by_chat = defaultdict(list)
+        for alert, price in batch:
+            if alert['id'] in claimed:
+                by_chat[alert['chat_id']].append((alert, price))
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def deliver(chat_id, alerts):
+            async with semaphore:
+                for text in self._messages(alerts):
+                    await self._send(chat_id, text)
+                self.delivered += len(alerts)
+
+        await asyncio.gather(*(deliver(chat_id, alerts) for chat_id, alerts in by_chat.items()))
+
+    def _messages(self, alerts):
+        """Sohbetin alarmlarını platformun mesaj uzunluğu sınırına göre bölünmüş metinlere çevirir"""
+        header = "🔔 Fiyat alarmı tetiklendi:"
+        lines = [f"{format_alert(alert)} → güncel fiyat {price:g}" for alert, price in alerts]
+        messages, current = [], header
+        for line in lines:
+            if len(current) + len(line) + 1 > self.max_length:
+                messages.append(current)
+                current = header
+            current += "\n" + line
+        messages.append(current)
+        return messages
+
+    async def _send(self, chat_id, text):
+        """Kova izin verene kadar bekleyip mesajı gönderir; platform limit bildirirse bir kez yeniden dener"""
+        for attempt in range(2):
+            while not self.bucket.try_acquire():
+                await asyncio.sleep(self.bucket.wait_time())
+            try:
+                await self.send(chat_id, text)
+                self.messages += 1
+                return
+            except Exception as e:
+                retry_after = _retry_after(e)
+                if retry_after is None or attempt:
+                    print(f"Alarm mesajı gönderilemedi ({chat_id}): {e}")
+                    self.failed += 1
+                    return
+                self.rate_limited += 1
+                self.bucket.drain()
+                await asyncio.sleep(retry_after)
+
+    def stats(self):
+        """Alarm ve gönderim sayaçlarını döndürür"""
+        return {
+            'platform': self.platform,
+            'active_alerts': len(self.index),
+            'symbols': len(self.index.symbols()),
+            'pending': len(self._triggered),
+            'matched': self.matched,
+            'delivered': self.delivered,
+            'messages': self.messages,
+            'failed': self.failed,
+            'rate_limited': self.rate_limited,
+            'syncs': self.syncs
+        }
+
+def _retry_after(error):
+    """Platform hız sınırı hatasındaki bekleme süresini saniye olarak döndürür; hız sınırı değilse None"""
+    retry_after = getattr(error, 'retry_after', None)
+    if retry_after is None:
+        return None
+    if hasattr(retry_after, 'total_seconds'):
+        return retry_after.total_seconds()
+    return float(retry_after)
@@ -0,0 +1,97 @@
+from bisect import bisect_left, bisect_right
+
+class _SymbolBook:
+    """Bir sembolün yukarı ve aşağı yönlü eşiklerini artan sırada, alarm id'leriyle paralel tutar"""
+
+    __slots__ = ('asset_type', 'above', 'above_ids', 'below', 'below_ids')
+
+    def __init__(self, asset_type):
+        self.asset_type = asset_type
+        self.above = []
+        self.above_ids = []
+        self.below = []
+        self.below_ids = []
+
+    def lists(self, direction):
+        if direction == 'above':
+            return self.above, self.above_ids
+        return self.below, self.below_ids
+
+    def __len__(self):
+        return len(self.above) + len(self.below)
+
+class AlertIndex:
+    """Sembol başına sıralı eşik indeksi
+
+    Fiyat `p` geldiğinde tetiklenen alarmlar ikili aramayla bulunur: yukarı yönlü alarmlar
+    eşiği <= p olan önek, aşağı yönlü alarmlar eşiği >= p olan sonektir. Tetiklenen
+    alarmlar indeksten tek dilim silmeyle çıkarılır.
+    """
+
+    def __init__(self):
+        self._books = {}
+        self._alerts = {}
+
+    def __len__(self):
+        return len(self._alerts)
+
+    def __contains__(self, alert_id):
+        return alert_id in self._alerts
+
+    def add(self, alert):
+        """Alarmı ekler; alarm id, symbol, direction ('above'/'below') ve threshold içermelidir"""
+        if alert['id'] in self._alerts:
+            return
+        symbol = alert['symbol'].upper()
+        book = self._books.get(symbol)
+        if book is None:
+            book = self._books[symbol] = _SymbolBook(alert.get('asset_type') or 'stock')
+        thresholds, ids = book.lists(alert['direction'])
+        position = bisect_right(thresholds, alert['threshold'])
+        thresholds.insert(position, alert['threshold'])
+        ids.insert(position, alert['id'])
+        self._alerts[alert['id']] = alert
+
+    def remove(self, alert_id):
+        """Alarmı indeksten çıkarır ve döndürür; yoksa None"""
+        alert = self._alerts.pop(alert_id, None)
+        if alert is None:
+            return None
+        symbol = alert['symbol'].upper()
+        book = self._books[symbol]
+        thresholds, ids = book.lists(alert['direction'])
+        # Aynı eşikteki alarmlar arasında id aranır
+        low = bisect_left(thresholds, alert['threshold'])
+        high = bisect_right(thresholds, alert['threshold'])
+        position = low + ids[low:high].index(alert_id)
+        del thresholds[position]
+        del ids[position]
+        if not book:
+            del self._books[symbol]
+        return alert
+
+    def match(self, symbol, price):
+        """Fiyatla tetiklenen alarmları indeksten çıkarıp döndürür"""
+        symbol = symbol.upper()
+        book = self._books.get(symbol)
+        if book is None:
+            return []
+
+        crossed = bisect_right(book.above, price)
+        triggered = book.above_ids[:crossed]
+        del book.above[:crossed], book.above_ids[:crossed]
+
+        crossed = bisect_left(book.below, price)
+        triggered += book.below_ids[crossed:]
+        del book.below[crossed:], book.below_ids[crossed:]
+
+        if not book:
+            del self._books[symbol]
+        return [self._alerts.pop(alert_id) for alert_id in triggered]
+
+    def symbols(self):
+        """Alarmı olan (varlık tipi, sembol) çiftlerini döndürür"""
+        return {(book.asset_type, symbol) for symbol, book in self._books.items()}
+
+    def get(self, alert_id):
+        return self._alerts.get(alert_id)
@@ -0,0 +1,31 @@
+import pytest
+from src.alerts.engine import format_alert, normalize_alert, parse_alert_command
+
+@pytest.mark.parametrize('args, expected', [
+    (['THYAO', '>', '300'], ('add', ('THYAO', 'above', 300.0))),
+    (['thyao', '>300'], ('add', ('THYAO', 'above', 300.0))),
+    (['BTC', '<=', '25000,5'], ('add', ('BTC', 'below', 25000.5))),
+    (['AAPL', 'altı', '150'], ('add', ('AAPL', 'below', 150.0))),
+    (['liste'], ('list', None)),
+    (['sil', '12'], ('remove', 12)),
+])
+def test_parse_alert_command(args, expected):
+    assert parse_alert_command(args) == expected
+
+@pytest.mark.parametrize('args', [
+    [],
+    ['sil', 'abc'],
+    ['THYAO', '=', '300'],
+    ['THYAO', '>', 'yüz'],
+    ['THYAO', '>', '-5'],
+    ['TH-YAO', '>', '5'],
+])
+def test_parse_alert_command_rejects_invalid_input(args):
+    with pytest.raises(ValueError):
+        parse_alert_command(args)
+
+def test_normalize_alert_accepts_numbers():
+    assert normalize_alert(' thyao ', '<', 12) == ('THYAO', 'below', 12.0)
+
+def test_format_alert():
+    assert format_alert({'id': 7, 'symbol': 'THYAO', 'direction': 'above', 'threshold': 300.0}) == "#7 THYAO ≥ 300"
@@ -0,0 +1,46 @@
+from src.alerts.index import AlertIndex
+
+def alert(alert_id, direction, threshold, symbol='THYAO'):
+    return {'id': alert_id, 'symbol': symbol, 'direction': direction, 'threshold': threshold}
+
+def test_match_triggers_crossed_thresholds_only():
+    index = AlertIndex()
+    for item in (alert(1, 'above', 100), alert(2, 'above', 110), alert(3, 'below', 90), alert(4, 'below', 80)):
+        index.add(item)
+
+    assert [a['id'] for a in index.match('thyao', 105)] == [1]
+    assert [a['id'] for a in index.match('THYAO', 85)] == [3]
+    assert len(index) == 2
+    assert 1 not in index and 3 not in index
+
+def test_match_on_exact_threshold_triggers_both_directions():
+    index = AlertIndex()
+    index.add(alert(1, 'above', 100))
+    index.add(alert(2, 'below', 100))
+
+    assert sorted(a['id'] for a in index.match('THYAO', 100)) == [1, 2]
+    assert index.symbols() == set()
+
+def test_match_ignores_other_symbols():
+    index = AlertIndex()
+    index.add(alert(1, 'above', 10, symbol='BTC'))
+
+    assert index.match('THYAO', 1000) == []
+    assert len(index) == 1
+
+def test_remove_picks_the_right_alert_among_equal_thresholds():
+    index = AlertIndex()
+    for alert_id in (1, 2, 3):
+        index.add(alert(alert_id, 'above', 100))
+
+    assert index.remove(2)['id'] == 2
+    assert index.remove(2) is None
+    assert [a['id'] for a in index.match('THYAO', 100)] == [1, 3]
+
+def test_add_is_idempotent_and_symbols_keep_asset_type():
+    index = AlertIndex()
+    index.add({**alert(1, 'above', 100, symbol='btc'), 'asset_type': 'crypto'})
+    index.add({**alert(1, 'above', 100, symbol='btc'), 'asset_type': 'crypto'})
+
+    assert len(index) == 1
+    assert index.symbols() == {('crypto', 'BTC')}
@@ -1,16 +1,6 @@
-from sqlalchemy.orm import Session
-from src.database.models import Base
-from sqlalchemy import create_engine
-from src.config import Config
+from src.database.session import get_session
 
-# Veritabanı bağlantısı
-engine = create_engine(Config.DATABASE_URL)
-Base.metadata.create_all(bind=engine)
-
-def get_db():
+async def get_db():
     """Veritabanı bağlantısı için dependency"""
-    db = Session(engine)
-    try:
-        yield db
-    finally:
-        db.close() 
\ No newline at end of file
+    async with get_session() as db:
+        yield db 
\ No newline at end of file
@@ -1,14 +1,46 @@
-from fastapi import FastAPI, HTTPException, Depends
+# Açılış süresi ölçümü ilk import ile başlar
+from src.utils.startup import get_startup_report, warm_up_models
+from fastapi import FastAPI, HTTPException, Depends, Query, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse, JSONResponse, PlainTextResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import datetime
+import asyncio
+import json
 
+from src.config import Config
 from src.database.models import User, Portfolio, MarketData
 from src.ai_engine.market_analyzer import MarketAnalyzer
 from src.data_collectors.news_collector import NewsCollector
 from src.data_collectors.market_data import MarketDataCollector
+from src.data_collectors.http_client import close_http_client
+from src.data_collectors.quote_cache import get_quote_cache
+from src.data_collectors.scheduler import get_scheduler, QuotaExceededError
+from src.data_collectors.poller import HotSymbolPoller
+from src.data_collectors.ingestion import IngestionPipeline
+from src.data_collectors.quote_hub import QuoteHub
+from src.api.dependencies import get_db
+from src.database.session import init_db, close_db
+from src.database.queries import get_user_portfolio, get_user_chat_history, load_portfolio_symbols, load_portfolios
 from src.ai_engine.chat_engine import FinancialChatBot
+from src.ai_engine.response_cache import get_response_cache
+from src.ai_engine.conversation_store import get_conversation_store
+from src.ai_engine.portfolio_valuation import PortfolioValuationEngine
+from src.ai_engine.model_registry import get_model_registry
+from src.ai_engine.forecast_job import ForecastJob
+from src.database.timeseries import TimeSeriesMaintenance
+from src.database.alert_store import AlertStore
+from src.alerts.engine import ALERT_PLATFORMS, normalize_alert
+from src.api.middleware import TracingMiddleware
+from src.utils.metrics import get_metrics
+from src.utils.tracing import get_tracer
+from src.utils.loop_monitor import EventLoopMonitor
+
+# Ağır kütüphaneler (torch, tensorflow, transformers) burada yüklenmez; modeller ilk
+# kullanımda ya da sunucu açıldıktan sonra arka planda yüklenir
+startup_report = get_startup_report()
+startup_report.checkpoint("imports")
 
 app = FastAPI(title="Fintelli API", version="1.0.0")
 
@@ -19,73 +51,317 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Request-ID"],
 )
+# Her istek request ID'li bir iz içinde çalışır; rota bazında süre ve durum kodu ölçülür
+app.add_middleware(TracingMiddleware)
 
-# Servis örnekleri
-market_analyzer = MarketAnalyzer()
-news_collector = NewsCollector()
+# Servis örnekleri (modeller süreç genelinde tek bir kayıt defterinden paylaşılır)
+model_registry = get_model_registry()
+news_collector = NewsCollector(registry=model_registry)
+market_analyzer = MarketAnalyzer(model_registry, news_collector=news_collector)
 market_data_collector = MarketDataCollector()
-chatbot = FinancialChatBot()
+chatbot = FinancialChatBot(market_analyzer, news_collector, model_registry)
+portfolio_engine = PortfolioValuationEngine(market_data_collector, portfolio_loader=load_portfolios)
+# Alarmlar burada yalnızca yönetilir; izleme ve gönderim ilgili bot sürecinde yapılır
+alert_store = AlertStore()
+hot_symbol_poller = HotSymbolPoller(
+    market_data_collector,
+    portfolio_loader=load_portfolio_symbols
+)
+
+async def _load_tracked_symbols():
+    """Tahmin işi için portföylerdeki ve son sorgulanan sembolleri döndürür"""
+    portfolio_symbols = await load_portfolio_symbols()
+    hot_symbols = market_data_collector.hot_symbols.snapshot()
+    return {symbol for _, symbol in portfolio_symbols} | {symbol for _, symbol in hot_symbols}
+
+# Yeni tahminler yazıldığında bu sembollerin önbellekteki sohbet yanıtları geçersiz olur
+forecast_job = ForecastJob(
+    market_analyzer, market_analyzer.forecast_store, _load_tracked_symbols,
+    on_written=get_response_cache().invalidate
+)
+timeseries_maintenance = TimeSeriesMaintenance(market_analyzer.timeseries)
+
+# Upstream'den gelen fiyatlar toplu olarak veritabanına akar; yeni günlük bar tahmini tetikler
+ingestion_pipeline = IngestionPipeline(on_new_bar=forecast_job.mark_dirty)
+market_data_collector.add_listener(ingestion_pipeline.publish)
+# Teknik göstergeler her yeni fiyatla artımlı güncellenir
+market_data_collector.add_listener(market_analyzer.on_quote)
+# Canlı fiyat abonelerine dağıtım; her sembol abone sayısından bağımsız olarak bir kez takip edilir
+quote_hub = QuoteHub(market_data_collector)
+# Event loop'u bloke eden kod yakalanıp raporlanır
+loop_monitor = EventLoopMonitor()
+
+# Önbellek ve kuyruk göstergeleri /metrics kazındığında bileşenlerin stats() çıktısından okunur
+metrics = get_metrics()
+metrics.register_stats("quote_cache", lambda: get_quote_cache().stats())
+metrics.register_stats("scheduler", lambda: get_scheduler().stats())
+metrics.register_stats("poller", hot_symbol_poller.stats)
+metrics.register_stats("forecast_job", forecast_job.stats)
+metrics.register_stats("ingestion", ingestion_pipeline.stats)
+metrics.register_stats("response_cache", lambda: get_response_cache().stats())
+metrics.register_stats("conversations", lambda: get_conversation_store().stats())
+metrics.register_stats("indicators", market_analyzer.indicators.stats)
+metrics.register_stats("quote_hub", quote_hub.stats)
+metrics.register_stats("sentiment_batcher", news_collector.sentiment_service.stats)
+metrics.register_stats("sentiment_cache", news_collector.sentiment_cache.stats)
+metrics.register_stats("trend_batcher", market_analyzer.trend_service.stats)
+metrics.register_stats("chat_engine", chatbot.engine_stats)
+metrics.register_stats("event_loop", loop_monitor.stats)
+startup_report.checkpoint("services")
+
+# Hazır olma koşulları: veritabanı, arka plan görevleri ve (isteğe bağlı) ön yüklenen modeller
+startup_report.expect("database", "background_tasks")
+if Config.READINESS_REQUIRE_MODELS:
+    startup_report.expect(*[f"model:{name}" for name in Config.MODEL_WARMUP])
+_warmup_task = None
+
+@app.on_event("startup")
+async def startup():
+    """Veritabanını hazırlar ve arka plan görevlerini başlatır; modeller port açıldıktan sonra yüklenir"""
+    global _warmup_task
+    with startup_report.phase("init_db"):
+        await init_db()
+    startup_report.complete("database")
+    
+    with startup_report.phase("background_tasks"):
+        loop_monitor.start()
+        get_scheduler().start()
+        ingestion_pipeline.start()
+        hot_symbol_poller.start()
+        quote_hub.start()
+        forecast_job.start()
+        timeseries_maintenance.start()
+        get_conversation_store().start()
+    startup_report.complete("background_tasks")
+    
+    if Config.MODEL_WARMUP:
+        _warmup_task = asyncio.ensure_future(
+            warm_up_models(model_registry, Config.MODEL_WARMUP, startup_report, chatbot)
+        )
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Uygulama kapanırken paylaşılan kaynakları serbest bırakır"""
+    if _warmup_task is not None:
+        _warmup_task.cancel()
+    await quote_hub.stop()
+    await hot_symbol_poller.stop()
+    await asyncio.to_thread(chatbot.close)
+    await forecast_job.stop()
+    await timeseries_maintenance.stop()
+    await ingestion_pipeline.stop()
+    await get_conversation_store().stop()
+    await get_scheduler().stop()
+    await loop_monitor.stop()
+    await close_http_client()
+    await close_db()
+
+@app.get("/health/live")
+async def liveness():
+    """Süreç ayakta ve event loop yanıt veriyor"""
+    return {"status": "alive"}
+
+@app.get("/health/ready")
+async def readiness():
+    """Trafik almaya hazır olma durumu; hazır değilse bekleyen bileşenlerle 503 döner"""
+    state = startup_report.readiness()
+    return JSONResponse(state, status_code=200 if state['ready'] else 503)
+
+@app.get("/api/v1/system/startup")
+async def get_startup_stats():
+    """Açılış süresinin aşamalara göre dağılımını döndürür"""
+    return startup_report.report()
+
+def _quota_error():
+    """Upstream kotası dolduğunda döndürülecek hatayı oluşturur"""
+    return HTTPException(
+        status_code=503,
+        detail="Veri sağlayıcı kotası doldu, lütfen daha sonra tekrar deneyin",
+        headers={"Retry-After": "60"}
+    )
+
+async def _with_deadline(name, coro, timeout):
+    """Bileşeni kendi süre sınırıyla ve kendi span'ı içinde çalıştırır; (durum, sonuç) döndürür"""
+    with get_tracer().span(f"analysis.{name}", timeout=timeout) as span:
+        try:
+            return "ok", await asyncio.wait_for(coro, timeout=timeout)
+        except asyncio.TimeoutError:
+            span.fail("timeout")
+            return "timeout", None
+        except QuotaExceededError:
+            span.fail("quota_exceeded")
+            return "quota_exceeded", None
+        except Exception as e:
+            span.fail(e)
+            print(f"Analiz bileşeni hatası ({name}) [{span.request_id}]: {e}")
+            return "error", None
 
 @app.get("/api/v1/market/analysis/{symbol}")
 async def get_market_analysis(symbol: str):
     """Piyasa analizi endpoint'i"""
     try:
-        # Piyasa verilerini topla
-        market_data = await market_data_collector.get_stock_data(symbol)
-        if not market_data:
-            market_data = await market_data_collector.get_crypto_data(symbol)
-            
-        if not market_data:
+        # Fiyat, trend ve haberleri eşzamanlı topla; her bileşenin kendi süre sınırı var
+        (quote_status, market_data), (trend_status, trend_analysis), (news_status, news) = await asyncio.gather(
+            _with_deadline("quote", market_data_collector.get_quote(symbol), Config.ANALYSIS_QUOTE_TIMEOUT),
+            _with_deadline("trend", market_analyzer.analyze_trend(symbol), Config.ANALYSIS_TREND_TIMEOUT),
+            _with_deadline("news", news_collector.get_financial_news(symbol, days=3), Config.ANALYSIS_NEWS_TIMEOUT)
+        )
+        
+        if quote_status == "ok" and not market_data:
             raise HTTPException(status_code=404, detail="Veri bulunamadı")
             
-        # Trend analizi yap
-        trend_analysis = await market_analyzer.analyze_trend(symbol)
-        
-        # Haberleri topla
-        news = await news_collector.get_financial_news(symbol, days=3)
+        components = {
+            "current_data": quote_status,
+            "trend_analysis": trend_status,
+            "related_news": news_status
+        }
         
         return {
             "current_data": market_data,
             "trend_analysis": trend_analysis,
-            "related_news": news
+            "related_news": news,
+            "partial": any(status != "ok" for status in components.values()),
+            "components": components
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/api/v1/portfolio/{user_id}")
-async def get_portfolio(user_id: int):
-    """Kullanıcı portföyü endpoint'i"""
+@app.get("/api/v1/market/trends")
+async def get_market_trends(symbols: str):
+    """Virgülle ayrılmış semboller için trend analizini tek partide döndürür"""
+    symbol_list = [symbol.strip().upper() for symbol in symbols.split(',') if symbol.strip()]
+    if not symbol_list:
+        raise HTTPException(status_code=400, detail="En az bir sembol girilmelidir")
+    return await market_analyzer.analyze_trends(symbol_list)
+
+@app.get("/api/v1/market/indicators/{symbol}")
+async def get_market_indicators(symbol: str):
+    """Sembolün artımlı hesaplanan teknik göstergelerini döndürür"""
+    try:
+        indicators = await market_analyzer.get_indicators(symbol)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    if not indicators or not indicators['samples']:
+        raise HTTPException(status_code=404, detail="Gösterge için veri bulunamadı")
+    return {"symbol": symbol.upper(), **indicators}
+
+def _alert_platform(platform):
+    if platform not in ALERT_PLATFORMS:
+        raise HTTPException(status_code=400, detail=f"Platform {', '.join(ALERT_PLATFORMS)} olmalıdır")
+    return platform
+
+@app.post("/api/v1/alerts/{user_id}")
+async def create_alert(user_id: int, alert: dict):
+    """Fiyat alarmı kurar; bildirim ilgili bot tarafından chat_id'ye gönderilir"""
+    platform = _alert_platform(alert.get('platform'))
+    try:
+        symbol, direction, threshold = normalize_alert(alert.get('symbol'), alert.get('direction'), alert.get('threshold'))
+        chat_id = int(alert.get('chat_id', user_id))
+    except (TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+        
     try:
-        portfolio = await get_user_portfolio(user_id)
+        if await alert_store.count_active(platform, user_id) >= Config.ALERT_MAX_PER_USER:
+            raise HTTPException(status_code=400, detail=f"En fazla {Config.ALERT_MAX_PER_USER} aktif alarm tanımlanabilir")
+        return await alert_store.add({
+            'platform': platform,
+            'user_id': user_id,
+            'chat_id': chat_id,
+            'asset_type': chatbot.recognizer.asset_type(symbol) or 'stock',
+            'symbol': symbol,
+            'direction': direction,
+            'threshold': threshold
+        })
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/v1/alerts/{user_id}")
+async def list_alerts(user_id: int, platform: str):
+    """Kullanıcının aktif fiyat alarmlarını döndürür"""
+    try:
+        return await alert_store.list_active(_alert_platform(platform), user_id)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.delete("/api/v1/alerts/{user_id}/{alert_id}")
+async def delete_alert(user_id: int, alert_id: int, platform: str):
+    """Kullanıcının aktif fiyat alarmını siler"""
+    try:
+        removed = await alert_store.remove(_alert_platform(platform), user_id, alert_id)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    if not removed:
+        raise HTTPException(status_code=404, detail="Alarm bulunamadı")
+    return {"deleted": alert_id}
+
+@app.websocket("/api/v1/ws/quotes")
+async def quotes_socket(websocket: WebSocket, symbols: str = ""):
+    """Canlı fiyat akışı: {"action": "subscribe"|"unsubscribe", "symbols": [...]} mesajlarıyla abonelik yönetilir"""
+    await websocket.accept()
+    client = quote_hub.connect(websocket.send_json)
+    if client is None:
+        await websocket.close(code=1013, reason="Bağlantı sınırı dolu")
+        return
+        
+    async def subscribe(requested):
+        try:
+            subscribed = await quote_hub.subscribe(client, requested)
+            await websocket.send_json({"type": "subscribed", "symbols": subscribed})
+        except ValueError as e:
+            await websocket.send_json({"type": "error", "detail": str(e)})
+            
+    try:
+        if symbols:
+            await subscribe(symbols.split(','))
+        while True:
+            message = await websocket.receive_json()
+            requested = message.get('symbols') or []
+            if message.get('action') == 'subscribe':
+                await subscribe(requested)
+            elif message.get('action') == 'unsubscribe':
+                quote_hub.unsubscribe(client, requested)
+                await websocket.send_json({"type": "subscribed", "symbols": sorted(client.symbols)})
+    except (WebSocketDisconnect, ValueError):
+        pass
+    finally:
+        await quote_hub.disconnect(client)
+
+async def _value_portfolio(user_id, db):
+    """Kullanıcı portföyünü pozisyonlar ve özet olarak değerler"""
+    try:
+        portfolio = await get_user_portfolio(user_id, db)
         if not portfolio:
             raise HTTPException(status_code=404, detail="Portföy bulunamadı")
             
-        # Her varlık için güncel değerleri al
-        enriched_portfolio = []
-        for asset in portfolio:
-            current_price = None
-            if asset.asset_type == "stock":
-                data = await market_data_collector.get_stock_data(asset.symbol)
-            else:
-                data = await market_data_collector.get_crypto_data(asset.symbol)
-                
-            if data:
-                current_price = data['price']
-                
-            enriched_portfolio.append({
-                "symbol": asset.symbol,
-                "type": asset.asset_type,
-                "quantity": asset.quantity,
-                "purchase_price": asset.purchase_price,
-                "current_price": current_price,
-                "profit_loss": (current_price - asset.purchase_price) * asset.quantity if current_price else None
-            })
-            
-        return enriched_portfolio
+        # Fiyatlar tekil semboller için tek partide çekilir, hesaplama vektörel yapılır
+        return await portfolio_engine.value(portfolio)
+    except HTTPException:
+        raise
+    except QuotaExceededError:
+        raise _quota_error()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/v1/portfolio/{user_id}")
+async def get_portfolio(user_id: int, db: AsyncSession = Depends(get_db)):
+    """Kullanıcı portföyü endpoint'i (pozisyon listesi)"""
+    return (await _value_portfolio(user_id, db))['positions']
+
+@app.get("/api/v1/portfolio/{user_id}/summary")
+async def get_portfolio_summary(user_id: int, db: AsyncSession = Depends(get_db)):
+    """Portföy toplamları endpoint'i: piyasa değeri, maliyet, kâr/zarar ve fiyatlanamayan pozisyon sayısı"""
+    return (await _value_portfolio(user_id, db))['summary']
+
 @app.get("/api/v1/advice/{user_id}/{symbol}")
 async def get_investment_advice(user_id: int, symbol: str):
     """Yatırım tavsiyesi endpoint'i"""
@@ -110,11 +386,87 @@ async def chat_with_ai(user_id: int, message: dict):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/v1/chat/{user_id}/stream")
+async def stream_chat_with_ai(user_id: int, message: dict):
+    """Yapay zeka yanıtını üretildikçe Server-Sent Events olarak gönderir"""
+    async def events():
+        async for chunk in chatbot.stream_response(
+            user_id=user_id,
+            message=message['text'],
+            context=message.get('context', [])
+        ):
+            yield f"data: {json.dumps({'token': chunk}, ensure_ascii=False)}\n\n"
+        yield "event: done\ndata: {}\n\n"
+        
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.get("/api/v1/chat/history/{user_id}")
-async def get_chat_history(user_id: int, limit: int = 10):
-    """Kullanıcının sohbet geçmişini getirir"""
+async def get_chat_history(
+    user_id: int,
+    limit: int = Query(10, ge=1, le=100),
+    before_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """Kullanıcının sohbet geçmişini imleçli sayfalama ile getirir
+
+    Sonraki (daha eski) sayfa için yanıttaki next_cursor değeri before_id olarak gönderilir.
+    """
     try:
-        history = await get_user_chat_history(user_id, limit)
-        return history
+        # Henüz yazılmamış son turlar da geçmişte görünsün
+        await get_conversation_store().flush()
+        history = await get_user_chat_history(user_id, limit, db, before_id=before_id)
+        return {
+            "messages": history,
+            "next_cursor": history[-1]['id'] if len(history) == limit else None
+        }
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/v1/system/cache")
+async def get_cache_stats():
+    """Önbellek sayaçlarını döndürür"""
+    return {
+        "quotes": get_quote_cache().stats(),
+        "scheduler": get_scheduler().stats(),
+        "poller": hot_symbol_poller.stats(),
+        "forecasts": forecast_job.stats(),
+        "ingestion": ingestion_pipeline.stats(),
+        "chat_responses": get_response_cache().stats(),
+        "conversations": get_conversation_store().stats(),
+        "indicators": market_analyzer.indicators.stats(),
+        "live_quotes": quote_hub.stats()
+    }
+
+@app.get("/metrics")
+async def get_metrics_text():
+    """Gecikme histogramları, hata sayaçları ve önbellek/kuyruk göstergeleri (Prometheus metin formatı)"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.get("/api/v1/system/traces")
+async def get_recent_traces(limit: int = Query(20, ge=1, le=200), min_duration_ms: float = 0):
+    """Son tamamlanan isteklerin izlerini en çok süre harcanan span'larla birlikte döndürür"""
+    return get_tracer().recent(limit, min_duration_ms / 1000)
+
+@app.get("/api/v1/system/traces/{request_id}")
+async def get_trace(request_id: str):
+    """Request ID'ye ait izin tüm span'larını döndürür"""
+    trace = get_tracer().get(request_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail="İz bulunamadı")
+    return trace
+
+@app.get("/api/v1/system/event-loop")
+async def get_event_loop_stats():
+    """Event loop gecikme dağılımı ve son blokaj raporları (bloke eden çağrı yığınıyla)"""
+    return loop_monitor.stats()
+
+@app.get("/api/v1/system/models")
+async def get_model_stats():
+    """Yüklü modellerin bellek kullanımını ve sohbet üretim motoru sayaçlarını döndürür"""
+    report = model_registry.memory_report()
+    report['chat_engine'] = chatbot.engine_stats()
+    return report 
\ No newline at end of file
@@ -0,0 +1,61 @@
+import re
+import time
+from src.utils.metrics import get_metrics
+from src.utils.tracing import get_tracer
+
+REQUEST_ID_HEADER = b'x-request-id'
+# Dışarıdan gelen request ID yalnızca güvenli karakterlerden oluşuyorsa kullanılır
+_REQUEST_ID_PATTERN = re.compile(r'^[A-Za-z0-9._-]{1,64}$')
+
+class TracingMiddleware:
+    """Her HTTP isteğini bir iz içinde çalıştırır ve rota bazında süre ile durum kodunu ölçer
+
+    İstemci X-Request-ID gönderirse aynı kimlik kullanılır; yanıtta her zaman X-Request-ID döner.
+    Saf ASGI ara katmanıdır; akış (SSE) yanıtlarında gövdenin tamamı izin içinde kalır.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        metrics = get_metrics()
+        self._seconds = metrics.histogram(
+            'http_request_seconds', "HTTP istek süresi", ('method', 'route', 'status')
+        )
+        self._in_flight = metrics.gauge('http_requests_in_flight', "İşlenmekte olan HTTP istekleri")
+        self._active = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        request_id = dict(scope.get('headers') or []).get(REQUEST_ID_HEADER, b'').decode('latin-1')
+        if not _REQUEST_ID_PATTERN.match(request_id):
+            request_id = None
+        status = {'code': 500}
+
+        with get_tracer().trace(scope['method'], request_id=request_id) as root:
+            async def send_with_request_id(message):
+                if message['type'] == 'http.response.start':
+                    status['code'] = message['status']
+                    message['headers'] = list(message.get('headers', [])) + [
+                        (REQUEST_ID_HEADER, root.request_id.encode('latin-1'))
+                    ]
+                await send(message)
+
+            self._active += 1
+            self._in_flight.set(self._active)
+            started = time.perf_counter()
+            try:
+                await self.app(scope, receive, send_with_request_id)
+            finally:
+                self._active -= 1
+                self._in_flight.set(self._active)
+                # Yol parametreleri etikete girmesin diye eşleşen rota şablonu kullanılır
+                route = getattr(scope.get('route'), 'path', None) or 'unmatched'
+                root.name = f"{scope['method']} {route}"
+                root.set(path=scope['path'], status=status['code'])
+                if status['code'] >= 500:
+                    root.fail(f"http_{status['code']}")
+                self._seconds.observe(
+                    time.perf_counter() - started, method=scope['method'], route=route, status=status['code']
+                )
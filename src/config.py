@@ -7,18 +7,184 @@ class Config:
     # API Anahtarları
     ALPHA_VANTAGE_API_KEY = os.getenv('ALPHA_VANTAGE_API_KEY')
     NEWS_API_KEY = os.getenv('NEWS_API_KEY')
+    # Upstream adresleri (kıyaslama ve testlerde yerel stub sunuculara yönlendirilebilir)
+    ALPHA_VANTAGE_BASE_URL = os.getenv('ALPHA_VANTAGE_BASE_URL', 'https://www.alphavantage.co')
+    NEWS_API_BASE_URL = os.getenv('NEWS_API_BASE_URL', 'https://newsapi.org')
     
     # Veritabanı Yapılandırması
     DATABASE_URL = os.getenv('DATABASE_URL')
+    # Boş bırakılırsa DATABASE_URL asenkron sürücüye çevrilerek kullanılır
+    ASYNC_DATABASE_URL = os.getenv('ASYNC_DATABASE_URL')
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 10))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 20))
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 30))
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true'
+    
+    # Zaman Serisi Saklama Ayarları
+    TIMESERIES_RAW_RETENTION_DAYS = int(os.getenv('TIMESERIES_RAW_RETENTION_DAYS', 7))
+    TIMESERIES_MINUTE_RETENTION_DAYS = int(os.getenv('TIMESERIES_MINUTE_RETENTION_DAYS', 30))
+    TIMESERIES_ROLLUP_INTERVAL = float(os.getenv('TIMESERIES_ROLLUP_INTERVAL', 60))
+    
+    # Veri Akışı (Ingestion) Ayarları
+    INGESTION_QUEUE_SIZE = int(os.getenv('INGESTION_QUEUE_SIZE', 10000))
+    INGESTION_BATCH_SIZE = int(os.getenv('INGESTION_BATCH_SIZE', 500))
+    INGESTION_FLUSH_INTERVAL = float(os.getenv('INGESTION_FLUSH_INTERVAL', 1.0))
+    INGESTION_PUBLISH_TIMEOUT = float(os.getenv('INGESTION_PUBLISH_TIMEOUT', 0.05))
+    
+    # HTTP İstemci Ayarları
+    HTTP_TIMEOUT = float(os.getenv('HTTP_TIMEOUT', 10))
+    HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', 3))
+    HTTP_MAX_RETRIES = int(os.getenv('HTTP_MAX_RETRIES', 3))
+    HTTP_BACKOFF_BASE = float(os.getenv('HTTP_BACKOFF_BASE', 0.5))
+    HTTP_BACKOFF_MAX = float(os.getenv('HTTP_BACKOFF_MAX', 8))
+    HTTP_POOL_LIMIT = int(os.getenv('HTTP_POOL_LIMIT', 100))
+    HTTP_POOL_LIMIT_PER_HOST = int(os.getenv('HTTP_POOL_LIMIT_PER_HOST', 10))
+    HTTP_KEEPALIVE_TIMEOUT = float(os.getenv('HTTP_KEEPALIVE_TIMEOUT', 30))
+    
+    # Fiyat Önbelleği Ayarları (saniye)
+    QUOTE_TTL_STOCK = float(os.getenv('QUOTE_TTL_STOCK', 60))
+    QUOTE_TTL_CRYPTO = float(os.getenv('QUOTE_TTL_CRYPTO', 15))
+    QUOTE_CACHE_MAX_ENTRIES = int(os.getenv('QUOTE_CACHE_MAX_ENTRIES', 5000))
+    QUOTE_CACHE_SERVE_STALE = os.getenv('QUOTE_CACHE_SERVE_STALE', 'true').lower() == 'true'
+    QUOTE_CACHE_MAX_STALE = float(os.getenv('QUOTE_CACHE_MAX_STALE', 300))
+    
+    # Alpha Vantage Kota Ayarları
+    ALPHA_VANTAGE_CALLS_PER_MINUTE = int(os.getenv('ALPHA_VANTAGE_CALLS_PER_MINUTE', 5))
+    ALPHA_VANTAGE_CALLS_PER_DAY = int(os.getenv('ALPHA_VANTAGE_CALLS_PER_DAY', 500))
+    # Kota kovaları süreç içindedir: API ve bot süreçleri aynı anahtarı paylaştığında her süreç kotanın
+    # yalnızca bu payını harcar; çalışan süreçlerin payları toplamı 1'i aşmamalıdır (varsayılan: API + iki bot)
+    ALPHA_VANTAGE_QUOTA_SHARE = float(os.getenv('ALPHA_VANTAGE_QUOTA_SHARE', 0.6))
+    BOT_ALPHA_VANTAGE_QUOTA_SHARE = float(os.getenv('BOT_ALPHA_VANTAGE_QUOTA_SHARE', 0.2))
+    SCHEDULER_INTERACTIVE_RESERVE = int(os.getenv('SCHEDULER_INTERACTIVE_RESERVE', 1))
+    SCHEDULER_INTERACTIVE_MAX_WAIT = float(os.getenv('SCHEDULER_INTERACTIVE_MAX_WAIT', 5))
+    SCHEDULER_BACKGROUND_MAX_WAIT = float(os.getenv('SCHEDULER_BACKGROUND_MAX_WAIT', 120))
+    
+    # Sıcak Sembol Yoklayıcı Ayarları
+    HOT_SYMBOL_POLL_INTERVAL = float(os.getenv('HOT_SYMBOL_POLL_INTERVAL', 30))
+    HOT_SYMBOL_RECENT_TTL = float(os.getenv('HOT_SYMBOL_RECENT_TTL', 900))
+    HOT_SYMBOL_MAX = int(os.getenv('HOT_SYMBOL_MAX', 200))
+    HOT_SYMBOL_REFRESH_RATIO = float(os.getenv('HOT_SYMBOL_REFRESH_RATIO', 0.8))
+    
+    # Analiz Endpoint'i Bileşen Süre Sınırları (saniye)
+    ANALYSIS_QUOTE_TIMEOUT = float(os.getenv('ANALYSIS_QUOTE_TIMEOUT', 4))
+    ANALYSIS_TREND_TIMEOUT = float(os.getenv('ANALYSIS_TREND_TIMEOUT', 3))
+    ANALYSIS_NEWS_TIMEOUT = float(os.getenv('ANALYSIS_NEWS_TIMEOUT', 5))
     
     # Model Parametreleri
     MODEL_PATH = 'models/'
     SENTIMENT_MODEL_NAME = 'sentiment_model'
+    CHAT_MODEL_NAME = os.getenv('CHAT_MODEL_NAME', 'mistralai/Mistral-7B-Instruct-v0.2')
+    CHAT_MAX_NEW_TOKENS = int(os.getenv('CHAT_MAX_NEW_TOKENS', 256))
+    CHAT_STREAM_TIMEOUT = float(os.getenv('CHAT_STREAM_TIMEOUT', 120))
+    # Sohbet modeli CPU sunumu: float32, bfloat16 veya int8 (dinamik nicemleme)
+    CHAT_MODEL_PRECISION = os.getenv('CHAT_MODEL_PRECISION', 'bfloat16')
+    CHAT_NUM_THREADS = int(os.getenv('CHAT_NUM_THREADS', 0))
+    CHAT_MAX_BATCH_SIZE = int(os.getenv('CHAT_MAX_BATCH_SIZE', 4))
+    CHAT_MAX_PENDING = int(os.getenv('CHAT_MAX_PENDING', 32))
+    CHAT_MAX_INPUT_TOKENS = int(os.getenv('CHAT_MAX_INPUT_TOKENS', 2048))
+    CHAT_TEMPERATURE = float(os.getenv('CHAT_TEMPERATURE', 0.0))
+    # Sunucu açıldıktan sonra arka planda önceden yüklenecek modeller (virgülle ayrılmış, boşsa tembel yükleme)
+    MODEL_WARMUP = [
+        name.strip()
+        for name in os.getenv('MODEL_WARMUP', 'sentiment,market_predictor,chat_llm').split(',')
+        if name.strip()
+    ]
+    # true ise /health/ready, MODEL_WARMUP modelleri yüklenene kadar 503 döner
+    READINESS_REQUIRE_MODELS = os.getenv('READINESS_REQUIRE_MODELS', 'true').lower() == 'true'
+    
+    # Duygu Analizi Çıkarım Ayarları
+    SENTIMENT_MODEL_ID = os.getenv('SENTIMENT_MODEL_ID', 'finbert-sentiment')
+    SENTIMENT_MAX_BATCH_SIZE = int(os.getenv('SENTIMENT_MAX_BATCH_SIZE', 32))
+    SENTIMENT_MAX_WAIT_MS = float(os.getenv('SENTIMENT_MAX_WAIT_MS', 10))
+    SENTIMENT_PIPELINE_BATCH_SIZE = int(os.getenv('SENTIMENT_PIPELINE_BATCH_SIZE', 16))
+    SENTIMENT_MAX_CHARS = int(os.getenv('SENTIMENT_MAX_CHARS', 1000))
+    SENTIMENT_MAX_TOKENS = int(os.getenv('SENTIMENT_MAX_TOKENS', 128))
+    SENTIMENT_CACHE_PATH = os.getenv('SENTIMENT_CACHE_PATH', 'cache/sentiment_cache.sqlite3')
+    SENTIMENT_CACHE_MEMORY_ENTRIES = int(os.getenv('SENTIMENT_CACHE_MEMORY_ENTRIES', 20000))
+    
+    # Trend Tahmini Çıkarım Ayarları
+    TREND_WINDOW = int(os.getenv('TREND_WINDOW', 60))
+    TREND_MAX_BATCH_SIZE = int(os.getenv('TREND_MAX_BATCH_SIZE', 64))
+    TREND_MAX_WAIT_MS = float(os.getenv('TREND_MAX_WAIT_MS', 5))
+    
+    # Toplu Tahmin İşi Ayarları (saniye)
+    FORECAST_INTERVAL = float(os.getenv('FORECAST_INTERVAL', 900))
+    FORECAST_MAX_AGE = float(os.getenv('FORECAST_MAX_AGE', 3600))
+    FORECAST_DIRTY_DEBOUNCE = float(os.getenv('FORECAST_DIRTY_DEBOUNCE', 2))
+    
+    # Artımlı Teknik Gösterge Ayarları (SMA/Bollinger penceresi, EMA, RSI, MACD periyotları)
+    INDICATOR_WINDOW = int(os.getenv('INDICATOR_WINDOW', 20))
+    INDICATOR_EMA_PERIOD = int(os.getenv('INDICATOR_EMA_PERIOD', 20))
+    INDICATOR_RSI_PERIOD = int(os.getenv('INDICATOR_RSI_PERIOD', 14))
+    INDICATOR_MACD_FAST = int(os.getenv('INDICATOR_MACD_FAST', 12))
+    INDICATOR_MACD_SLOW = int(os.getenv('INDICATOR_MACD_SLOW', 26))
+    INDICATOR_MACD_SIGNAL = int(os.getenv('INDICATOR_MACD_SIGNAL', 9))
+    INDICATOR_BOLLINGER_STD = float(os.getenv('INDICATOR_BOLLINGER_STD', 2.0))
+    INDICATOR_MAX_SYMBOLS = int(os.getenv('INDICATOR_MAX_SYMBOLS', 5000))
+    # Geçmişten başlatmada okunacak ham tik aralığı ve en fazla tik sayısı
+    INDICATOR_BOOTSTRAP_DAYS = float(os.getenv('INDICATOR_BOOTSTRAP_DAYS', 2))
+    INDICATOR_BOOTSTRAP_POINTS = int(os.getenv('INDICATOR_BOOTSTRAP_POINTS', 500))
+    
+    # Canlı Fiyat Yayını Ayarları (istemci başına saniyede en fazla güncelleme, sembol ve bağlantı sınırları)
+    QUOTE_HUB_MAX_RATE = float(os.getenv('QUOTE_HUB_MAX_RATE', 2))
+    QUOTE_HUB_MAX_SYMBOLS = int(os.getenv('QUOTE_HUB_MAX_SYMBOLS', 50))
+    QUOTE_HUB_MAX_CONNECTIONS = int(os.getenv('QUOTE_HUB_MAX_CONNECTIONS', 1000))
+    QUOTE_HUB_KEEPALIVE_INTERVAL = float(os.getenv('QUOTE_HUB_KEEPALIVE_INTERVAL', 60))
+    
+    # Fiyat Alarmı Ayarları (gönderim hızı mesaj/saniye, aralıklar saniye)
+    ALERT_SEND_RATE = float(os.getenv('ALERT_SEND_RATE', 25))
+    ALERT_SEND_BURST = int(os.getenv('ALERT_SEND_BURST', 25))
+    ALERT_SEND_CONCURRENCY = int(os.getenv('ALERT_SEND_CONCURRENCY', 8))
+    ALERT_DELIVERY_INTERVAL = float(os.getenv('ALERT_DELIVERY_INTERVAL', 0.5))
+    ALERT_SYNC_INTERVAL = float(os.getenv('ALERT_SYNC_INTERVAL', 30))
+    ALERT_LOAD_BATCH = int(os.getenv('ALERT_LOAD_BATCH', 10000))
+    ALERT_MAX_PER_USER = int(os.getenv('ALERT_MAX_PER_USER', 50))
+    
+    # Sembol evreni (BIST, ABD hisseleri, kripto) JSON dosyası; boşsa paketteki varsayılan kullanılır
+    TICKER_UNIVERSE_PATH = os.getenv('TICKER_UNIVERSE_PATH', '')
+    
+    # Sohbet Hafızası Ayarları
+    CONVERSATION_MAX_TURNS = int(os.getenv('CONVERSATION_MAX_TURNS', 20))
+    CONVERSATION_MAX_USERS = int(os.getenv('CONVERSATION_MAX_USERS', 10000))
+    CONVERSATION_TOKEN_BUDGET = int(os.getenv('CONVERSATION_TOKEN_BUDGET', 1024))
+    CONVERSATION_SUMMARY_TOKENS = int(os.getenv('CONVERSATION_SUMMARY_TOKENS', 128))
+    CONVERSATION_BATCH_SIZE = int(os.getenv('CONVERSATION_BATCH_SIZE', 100))
+    CONVERSATION_FLUSH_INTERVAL = float(os.getenv('CONVERSATION_FLUSH_INTERVAL', 1.0))
+    
+    # Sohbet Yanıt Önbelleği Ayarları (saniye)
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', 2048))
+    RESPONSE_CACHE_MIN_TTL = float(os.getenv('RESPONSE_CACHE_MIN_TTL', 5))
+    RESPONSE_CACHE_MAX_TTL = float(os.getenv('RESPONSE_CACHE_MAX_TTL', 300))
+    
+    # İzleme Ayarları: tamponda tutulan son iz sayısı, iz başına span sınırı ve yavaş istek eşiği (saniye)
+    TRACE_BUFFER_SIZE = int(os.getenv('TRACE_BUFFER_SIZE', 500))
+    TRACE_MAX_SPANS = int(os.getenv('TRACE_MAX_SPANS', 200))
+    TRACE_SLOW_THRESHOLD = float(os.getenv('TRACE_SLOW_THRESHOLD', 2.0))
+    # Event loop gecikme ölçüm aralığı ve blokaj raporlama eşiği (saniye)
+    LOOP_MONITOR_INTERVAL = float(os.getenv('LOOP_MONITOR_INTERVAL', 0.1))
+    LOOP_MONITOR_THRESHOLD = float(os.getenv('LOOP_MONITOR_THRESHOLD', 0.1))
+    LOOP_MONITOR_MAX_REPORTS = int(os.getenv('LOOP_MONITOR_MAX_REPORTS', 20))
+    LOOP_MONITOR_STACK_DEPTH = int(os.getenv('LOOP_MONITOR_STACK_DEPTH', 8))
     
     # API Yapılandırması
     API_VERSION = 'v1'
     BASE_URL = 'http://localhost:8000'
     
+    # Bot mesajlarının akış sırasında düzenlenme aralığı (saniye)
+    BOT_STREAM_EDIT_INTERVAL = float(os.getenv('BOT_STREAM_EDIT_INTERVAL', 1.0))
+    
+    # Bot Mesaj Ağ Geçidi Ayarları (kullanıcı hızı mesaj/saniye, süreler saniye)
+    BOT_USER_MESSAGE_RATE = float(os.getenv('BOT_USER_MESSAGE_RATE', 0.2))
+    BOT_USER_MESSAGE_BURST = int(os.getenv('BOT_USER_MESSAGE_BURST', 3))
+    BOT_GATEWAY_WORKERS = int(os.getenv('BOT_GATEWAY_WORKERS', 4))
+    BOT_GATEWAY_QUEUE_SIZE = int(os.getenv('BOT_GATEWAY_QUEUE_SIZE', 100))
+    BOT_GATEWAY_MAX_PENDING_PER_USER = int(os.getenv('BOT_GATEWAY_MAX_PENDING_PER_USER', 1))
+    BOT_GATEWAY_MAX_WAIT = float(os.getenv('BOT_GATEWAY_MAX_WAIT', 60))
+    # Aynı mesajın tekrarı bu süre içinde yok sayılır (0 ise tekrar denetimi kapalı)
+    BOT_GATEWAY_DUPLICATE_WINDOW = float(os.getenv('BOT_GATEWAY_DUPLICATE_WINDOW', 10))
+    BOT_GATEWAY_MAX_USERS = int(os.getenv('BOT_GATEWAY_MAX_USERS', 10000))
+    
     # Telegram Bot Ayarları
     TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
     
@@ -0,0 +1,90 @@
+import asyncio
+import random
+import aiohttp
+from src.config import Config
+
+# Yeniden denenmesi güvenli olan HTTP durum kodları
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class HTTPClient:
+    """Tüm veri toplayıcıların paylaştığı, kalıcı bağlantılı asenkron HTTP istemcisi"""
+
+    def __init__(self, timeout=None, connect_timeout=None, max_retries=None,
+                 backoff_base=None, backoff_max=None, limit=None,
+                 limit_per_host=None, keepalive_timeout=None):
+        self.timeout = timeout if timeout is not None else Config.HTTP_TIMEOUT
+        self.connect_timeout = connect_timeout if connect_timeout is not None else Config.HTTP_CONNECT_TIMEOUT
+        self.max_retries = max_retries if max_retries is not None else Config.HTTP_MAX_RETRIES
+        self.backoff_base = backoff_base if backoff_base is not None else Config.HTTP_BACKOFF_BASE
+        self.backoff_max = backoff_max if backoff_max is not None else Config.HTTP_BACKOFF_MAX
+        self.limit = limit if limit is not None else Config.HTTP_POOL_LIMIT
+        self.limit_per_host = limit_per_host if limit_per_host is not None else Config.HTTP_POOL_LIMIT_PER_HOST
+        self.keepalive_timeout = keepalive_timeout if keepalive_timeout is not None else Config.HTTP_KEEPALIVE_TIMEOUT
+        self._session = None
+
+    def _get_session(self):
+        """Oturumu ilk kullanımda, çalışan event loop üzerinde oluşturur"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout, connect=self.connect_timeout)
+            )
+        return self._session
+
+    def _backoff(self, attempt, retry_after=None):
+        """Deneme sayısına göre jitter'lı üstel bekleme süresini hesaplar"""
+        if retry_after is not None:
+            try:
+                return min(self.backoff_max, float(retry_after))
+            except ValueError:
+                pass
+        cap = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, cap)
+
+    async def get_json(self, url, params=None):
+        """GET isteği atar ve JSON yanıtı döndürür; geçici hatalarda yeniden dener"""
+        session = self._get_session()
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with session.get(url, params=params) as response:
+                    if response.status in RETRY_STATUSES and attempt < self.max_retries:
+                        await asyncio.sleep(self._backoff(attempt, response.headers.get('Retry-After')))
+                        continue
+
+                    response.raise_for_status()
+                    return await response.json(content_type=None)
+
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt >= self.max_retries:
+                    raise
+                await asyncio.sleep(self._backoff(attempt))
+
+    async def close(self):
+        """Açık bağlantıları kapatır"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+# Süreç genelinde paylaşılan istemci
+_http_client = None
+
+def get_http_client():
+    """Paylaşılan HTTP istemcisini döndürür"""
+    global _http_client
+    if _http_client is None:
+        _http_client = HTTPClient()
+    return _http_client
+
+async def close_http_client():
+    """Paylaşılan HTTP istemcisini kapatır (uygulama kapanışında çağrılır)"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.close()
+        _http_client = None
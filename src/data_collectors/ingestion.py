@@ -0,0 +1,220 @@
+import asyncio
+import time
+from datetime import datetime
+from sqlalchemy import insert, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from src.config import Config
+from src.database.models import MarketData
+from src.database.session import get_engine
+
+class IngestionPipeline:
+    """Toplayıcıların yayınladığı fiyatları tamponlayıp toplu çoklu satır insert ile veritabanına yazar
+
+    Kuyruk dolduğunda publish() bekler (geri basınç); tampon boyut ya da süre eşiğinde boşaltılır
+    ve (sembol, zaman) çiftine göre tekilleştirilir.
+    """
+
+    def __init__(self, engine=None, max_queue=None, batch_size=None, flush_interval=None,
+                 publish_timeout=None, on_new_bar=None):
+        self._engine = engine
+        self.max_queue = max_queue or Config.INGESTION_QUEUE_SIZE
+        self.batch_size = batch_size or Config.INGESTION_BATCH_SIZE
+        self.flush_interval = flush_interval or Config.INGESTION_FLUSH_INTERVAL
+        self.publish_timeout = Config.INGESTION_PUBLISH_TIMEOUT if publish_timeout is None else publish_timeout
+        # Bir sembol için yeni günlük bar başladığında çağrılır
+        self.on_new_bar = on_new_bar
+        self._last_day = {}
+
+        self._queue = None
+        self._writer = None
+        # Yazıcının sürmekte olan toplu yazması; durdurulurken iptal edilmez, beklenir
+        self._flushing = None
+        # Yazılmayı bekleyen tampon: (sembol, zaman) -> satır
+        self._pending = {}
+
+        self.published = 0
+        self.dropped = 0
+        self.duplicates = 0
+        self.written = 0
+        self.flushes = 0
+        self.flush_errors = 0
+        self.last_flush_seconds = 0.0
+        self.last_lag_seconds = 0.0
+        self.max_lag_seconds = 0.0
+        self.throughput = 0.0
+
+    @property
+    def engine(self):
+        return self._engine or get_engine()
+
+    def start(self):
+        """Yazıcı görevini başlatır"""
+        if self._writer is None or self._writer.done():
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._writer = asyncio.ensure_future(self._write_loop())
+
+    async def stop(self):
+        """Yazıcıyı durdurur, sürmekte olan yazmayı bekler ve kalan kayıtları yazar"""
+        if self._writer is None:
+            return
+        self._writer.cancel()
+        try:
+            await self._writer
+        except asyncio.CancelledError:
+            pass
+        self._writer = None
+        if self._flushing is not None:
+            await self._flushing
+            self._flushing = None
+
+        while not self._queue.empty():
+            self._buffer(self._pending, self._queue.get_nowait())
+        if self._pending:
+            buffer, self._pending = self._pending, {}
+            await self._flush(buffer)
+
+    async def publish(self, quote):
+        """Fiyatı kuyruğa ekler; veritabanı geride kaldıysa en fazla publish_timeout kadar bekler"""
+        if self._queue is None:
+            return False
+        row = (
+            quote['symbol'].upper(),
+            quote['timestamp'].replace(microsecond=0),
+            float(quote['price']),
+            quote.get('volume'),
+            time.monotonic()
+        )
+        try:
+            await asyncio.wait_for(self._queue.put(row), timeout=self.publish_timeout)
+        except asyncio.TimeoutError:
+            self.dropped += 1
+            return False
+        self.published += 1
+        return True
+
+    def _buffer(self, buffer, row):
+        key = (row[0], row[1])
+        if key in buffer:
+            self.duplicates += 1
+        buffer[key] = row
+
+    async def _write_loop(self):
+        deadline = None
+        retrying = False
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                row = await asyncio.wait_for(self._queue.get(), timeout=timeout)
+            except asyncio.TimeoutError:
+                row = None
+
+            if row is not None:
+                self._buffer(self._pending, row)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+
+            # Başarısız yazmadan sonra tampon dolu olsa da yeniden deneme flush_interval kadar bekler
+            full = len(self._pending) >= self.batch_size and not retrying
+            if self._pending and (full or time.monotonic() >= deadline):
+                # Yazma bitene kadar kuyruk tüketilmez; dolunca publish() geri basınç uygular
+                buffer, self._pending = self._pending, {}
+                deadline = None
+                # Yazıcı iptal edilse de yazma yarıda kesilmez; stop() onu bekler
+                self._flushing = asyncio.ensure_future(self._flush(buffer))
+                retrying = not await asyncio.shield(self._flushing)
+                self._flushing = None
+                if retrying:
+                    deadline = time.monotonic() + self.flush_interval
+
+    async def _flush(self, buffer):
+        """Tamponu yazar; başarısız olursa satırları tampona geri koyar ve False döndürür"""
+        rows = list(buffer.values())
+        started = time.monotonic()
+        try:
+            inserted = await self._write(rows)
+        except Exception as e:
+            print(f"Toplu yazma hatası: {e}")
+            self.flush_errors += 1
+            self._requeue(buffer)
+            return False
+
+        finished = time.monotonic()
+        elapsed = finished - started
+        self.flushes += 1
+        self.written += inserted
+        self.duplicates += len(rows) - inserted
+        self.last_flush_seconds = elapsed
+        self.last_lag_seconds = finished - min(row[4] for row in rows)
+        self.max_lag_seconds = max(self.max_lag_seconds, self.last_lag_seconds)
+        # Üstel hareketli ortalama ile satır/saniye
+        rate = len(rows) / elapsed if elapsed > 0 else float(len(rows))
+        self.throughput = rate if self.flushes == 1 else 0.8 * self.throughput + 0.2 * rate
+
+        self._detect_new_bars(rows)
+        return True
+
+    def _requeue(self, buffer):
+        """Yazılamayan satırları tamponun başına geri alır; kuyruk kapasitesini aşan en eski satırlar atılır"""
+        # Tamponda aynı (sembol, zaman) için daha yeni bir satır varsa o korunur
+        buffer.update(self._pending)
+        overflow = len(buffer) - self.max_queue
+        if overflow > 0:
+            for key in list(buffer)[:overflow]:
+                del buffer[key]
+            self.dropped += overflow
+        self._pending = buffer
+
+    async def _write(self, rows):
+        """Satırları tek bir çoklu satır insert ile yazar; var olan (sembol, zaman) çiftleri atlanır"""
+        values = [
+            {'symbol': symbol, 'timestamp': timestamp, 'price': price, 'volume': volume}
+            for symbol, timestamp, price, volume, _ in rows
+        ]
+        table = MarketData.__table__
+        dialect = self.engine.dialect.name
+
+        async with self.engine.begin() as conn:
+            if dialect in ('postgresql', 'sqlite'):
+                builder = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+                statement = builder(table).on_conflict_do_nothing(index_elements=['symbol', 'timestamp'])
+                result = await conn.execute(statement, values)
+                return result.rowcount if result.rowcount >= 0 else len(values)
+
+            # Diğer veritabanlarında var olan anahtarlar önce tek sorguyla elenir
+            keys = [(value['symbol'], value['timestamp']) for value in values]
+            existing = set((await conn.execute(
+                select(table.c.symbol, table.c.timestamp).where(tuple_(table.c.symbol, table.c.timestamp).in_(keys))
+            )).all())
+            values = [value for value in values if (value['symbol'], value['timestamp']) not in existing]
+            if values:
+                await conn.execute(insert(table), values)
+            return len(values)
+
+    def _detect_new_bars(self, rows):
+        if self.on_new_bar is None:
+            return
+        for symbol, timestamp, _, _, _ in rows:
+            day = timestamp.date()
+            previous = self._last_day.get(symbol)
+            if previous is None or day > previous:
+                self._last_day[symbol] = day
+                if previous is not None:
+                    self.on_new_bar(symbol)
+
+    def stats(self):
+        """Akış ve gecikme ölçümlerini döndürür"""
+        return {
+            'queue_depth': self._queue.qsize() if self._queue is not None else 0,
+            'buffered': len(self._pending),
+            'queue_capacity': self.max_queue,
+            'published': self.published,
+            'dropped': self.dropped,
+            'duplicates': self.duplicates,
+            'written': self.written,
+            'flushes': self.flushes,
+            'flush_errors': self.flush_errors,
+            'rows_per_second': self.throughput,
+            'last_flush_seconds': self.last_flush_seconds,
+            'last_lag_seconds': self.last_lag_seconds,
+            'max_lag_seconds': self.max_lag_seconds
+        }
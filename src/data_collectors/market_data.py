@@ -1,14 +1,114 @@
-import requests
+import inspect
 from datetime import datetime
 from src.config import Config
+from src.data_collectors.http_client import get_http_client
+from src.data_collectors.quote_cache import get_quote_cache
+from src.data_collectors.scheduler import (
+    get_scheduler, PRIORITY_INTERACTIVE, QuotaExceededError, UpstreamRateLimitError
+)
+from src.data_collectors.poller import HotSymbols
+from src.utils.tracing import get_tracer
 
 class MarketDataCollector:
-    def __init__(self):
+    def __init__(self, http_client=None, quote_cache=None, scheduler=None):
         self.api_key = Config.ALPHA_VANTAGE_API_KEY
+        self.http = http_client or get_http_client()
+        self.cache = quote_cache or get_quote_cache()
+        self.scheduler = scheduler or get_scheduler()
+        self.hot_symbols = HotSymbols()
+        # Upstream'den gelen her yeni fiyat bu dinleyicilere iletilir
+        self._listeners = []
         
     async def get_stock_data(self, symbol):
+        """Hisse senedi verilerini önbellek üzerinden döndürür"""
+        data = await self.cache.get('stock', symbol, lambda: self._fetch_stock_data(symbol))
+        if data:
+            self.hot_symbols.touch('stock', symbol)
+        return data
+        
+    async def get_crypto_data(self, symbol):
+        """Kripto para verilerini önbellek üzerinden döndürür"""
+        data = await self.cache.get('crypto', symbol, lambda: self._fetch_crypto_data(symbol))
+        if data:
+            self.hot_symbols.touch('crypto', symbol)
+        return data
+        
+    async def get_quote(self, symbol):
+        """Sembolü bilinen varlık tipiyle, bilinmiyorsa önce hisse sonra kripto olarak arar
+
+        Aramalar sıralıdır; her deneme bir upstream kota hakkı harcadığından ikinci tip
+        yalnızca ilki sonuç vermezse denenir.
+        """
+        for asset_type in ('stock', 'crypto'):
+            cached = self.cache.peek(asset_type, symbol)
+            if cached:
+                return cached
+                
+        fetchers = {'stock': self.get_stock_data, 'crypto': self.get_crypto_data}
+        known = self._known_asset_type(symbol)
+        order = [known] + [asset_type for asset_type in fetchers if asset_type != known] if known else list(fetchers)
+        for asset_type in order:
+            result = await fetchers[asset_type](symbol)
+            if result:
+                return result
+        return None
+        
+    def _known_asset_type(self, symbol):
+        """Önbellekte (süresi dolmuş olsa da) ya da son sorgularda görülen varlık tipi"""
+        for asset_type in ('stock', 'crypto'):
+            if self.cache.age(asset_type, symbol) is not None:
+                return asset_type
+        return self.hot_symbols.asset_type(symbol)
+        
+    async def refresh(self, asset_type, symbol, priority=PRIORITY_INTERACTIVE):
+        """Sembolü upstream'den yeniden çekip önbelleğe yazar"""
+        if asset_type == 'crypto':
+            data = await self._fetch_crypto_data(symbol, priority)
+        else:
+            data = await self._fetch_stock_data(symbol, priority)
+            
+        if data:
+            self.cache.set(asset_type, symbol, data)
+        return data
+        
+    def add_listener(self, listener):
+        """Yeni fiyatlar için dinleyici ekler; dinleyici senkron ya da asenkron olabilir"""
+        self._listeners.append(listener)
+        
+    async def _publish(self, quote):
+        """Upstream'den gelen fiyatı dinleyicilere iletir ve fiyatı geri döndürür"""
+        for listener in self._listeners:
+            try:
+                result = listener(quote)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                print(f"Fiyat dinleyici hatası: {e}")
+        return quote
+        
+    async def _query(self, params, priority):
+        """Alpha Vantage isteğini kota zamanlayıcısı üzerinden gönderir"""
+        endpoint = f"{Config.ALPHA_VANTAGE_BASE_URL}/query"
+        tracer = get_tracer()
+        function = params['function']
+        
+        # Kota kuyruğunda bekleme dahil süre; asıl HTTP çağrısı ayrı bir dış servis span'ıdır
+        with tracer.span(f"scheduler.{function}", priority=priority) as scheduled:
+            async def call():
+                # Zamanlayıcı çağrıyı kendi görevinde çalıştırır; ebeveyn span açıkça aktarılır
+                with tracer.span(f"alpha_vantage.{function}", kind='external', parent=scheduled):
+                    return await self.http.get_json(endpoint, params=params)
+                    
+            data = await self.scheduler.submit(call, priority)
+            
+            # Alpha Vantage limit aşımını 200 yanıtı içinde 'Note'/'Information' ile bildirir
+            if 'Note' in data or 'Information' in data:
+                self.scheduler.penalize()
+                raise UpstreamRateLimitError(data.get('Note') or data.get('Information'))
+        return data
+        
+    async def _fetch_stock_data(self, symbol, priority=PRIORITY_INTERACTIVE):
         """Hisse senedi verilerini Alpha Vantage'dan çeker"""
-        endpoint = f'https://www.alphavantage.co/query'
         params = {
             'function': 'GLOBAL_QUOTE',
             'symbol': symbol,
@@ -16,24 +116,24 @@ class MarketDataCollector:
         }
         
         try:
-            response = requests.get(endpoint, params=params)
-            data = response.json()
+            data = await self._query(params, priority)
             
-            if 'Global Quote' in data:
-                return {
+            if data.get('Global Quote'):
+                return await self._publish({
                     'symbol': symbol,
                     'price': float(data['Global Quote']['05. price']),
                     'volume': float(data['Global Quote']['06. volume']),
-                    'timestamp': datetime.now()
-                }
+                    'timestamp': datetime.utcnow()
+                })
             return None
+        except QuotaExceededError:
+            raise
         except Exception as e:
             print(f"Veri çekme hatası: {e}")
             return None
             
-    async def get_crypto_data(self, symbol):
+    async def _fetch_crypto_data(self, symbol, priority=PRIORITY_INTERACTIVE):
         """Kripto para verilerini Alpha Vantage'dan çeker"""
-        endpoint = f'https://www.alphavantage.co/query'
         params = {
             'function': 'CURRENCY_EXCHANGE_RATE',
             'from_currency': symbol,
@@ -42,16 +142,17 @@ class MarketDataCollector:
         }
         
         try:
-            response = requests.get(endpoint, params=params)
-            data = response.json()
+            data = await self._query(params, priority)
             
             if 'Realtime Currency Exchange Rate' in data:
-                return {
+                return await self._publish({
                     'symbol': symbol,
                     'price': float(data['Realtime Currency Exchange Rate']['5. Exchange Rate']),
-                    'timestamp': datetime.now()
-                }
+                    'timestamp': datetime.utcnow()
+                })
             return None
+        except QuotaExceededError:
+            raise
         except Exception as e:
             print(f"Veri çekme hatası: {e}")
             return None 
\ No newline at end of file
@@ -1,17 +1,30 @@
-import requests
+import asyncio
 from datetime import datetime, timedelta
 from src.config import Config
-from transformers import pipeline
+from src.data_collectors.http_client import get_http_client
+from src.ai_engine.sentiment_service import SentimentInferenceService
+from src.ai_engine.sentiment_cache import SentimentCache
+from src.ai_engine.model_registry import get_model_registry
+from src.utils.tracing import get_tracer
 
 class NewsCollector:
-    def __init__(self):
+    def __init__(self, http_client=None, registry=None):
         self.api_key = Config.NEWS_API_KEY
-        # Duygu analizi modeli yükleniyor
-        self.sentiment_analyzer = pipeline("sentiment-analysis", model="finbert-sentiment")
+        self.http = http_client or get_http_client()
+        self.registry = registry or get_model_registry()
+        # Eşzamanlı çağrılar tek bir model geçişinde toplanır
+        self.sentiment_service = SentimentInferenceService(lambda: self.registry.get('sentiment'))
+        # Aynı haberler günlerce tekrar geldiği için sonuçlar kalıcı olarak önbelleklenir
+        self.sentiment_cache = SentimentCache(Config.SENTIMENT_MODEL_ID)
+        
+    @property
+    def sentiment_analyzer(self):
+        """FinBERT pipeline'ı paylaşılan kayıt defterinden ilk kullanımda yüklenir"""
+        return self.registry.get('sentiment')
         
     async def get_financial_news(self, symbol=None, days=1):
         """Finansal haberleri toplar"""
-        endpoint = "https://newsapi.org/v2/everything"
+        endpoint = f"{Config.NEWS_API_BASE_URL}/v2/everything"
         
         # Tarih aralığı belirleme
         end_date = datetime.now()
@@ -30,15 +43,22 @@ class NewsCollector:
         }
         
         try:
-            response = requests.get(endpoint, params=params)
-            news_data = response.json()
-            
+            with get_tracer().span("newsapi.everything", kind='external') as span:
+                news_data = await self.http.get_json(endpoint, params=params)
+                if news_data.get('status') != 'ok':
+                    span.fail(news_data.get('code') or 'error')
+                    
             if news_data['status'] == 'ok':
+                articles = news_data['articles']
+                
+                # Önbellekte olmayan haberler tek seferde modele gönderilir
+                sentiments = await self.analyze_sentiments([
+                    f"{article['title'] or ''} {article['description'] or ''}"
+                    for article in articles
+                ])
+                
                 processed_news = []
-                for article in news_data['articles']:
-                    # Her haber için duygu analizi yapılıyor
-                    sentiment = await self.analyze_sentiment(article['title'] + " " + article['description'])
-                    
+                for article, sentiment in zip(articles, sentiments):
                     processed_news.append({
                         'title': article['title'],
                         'description': article['description'],
@@ -56,12 +76,43 @@ class NewsCollector:
     
     async def analyze_sentiment(self, text):
         """Metin üzerinde duygu analizi yapar"""
+        return (await self.analyze_sentiments([text]))[0]
+        
+    async def analyze_sentiments(self, texts):
+        """Metinlerin duygu analizini önbellek üzerinden yapar; yalnızca eksikler modele gider"""
+        tracer = get_tracer()
         try:
-            result = self.sentiment_analyzer(text)[0]
-            return {
-                'label': result['label'],
-                'score': float(result['score'])
-            }
+            with tracer.span("sentiment_cache.get_many", kind='db', texts=len(texts)):
+                results = await self.sentiment_cache.get_many(texts)
         except Exception as e:
-            print(f"Duygu analizi hatası: {e}")
-            return {'label': 'NEUTRAL', 'score': 0.5} 
\ No newline at end of file
+            print(f"Duygu önbelleği okuma hatası: {e}")
+            results = [None] * len(texts)
+            
+        missing = [i for i, result in enumerate(results) if result is None]
+        if not missing:
+            return results
+            
+        # Servis eşzamanlı istekleri partiler
+        with tracer.span("sentiment.inference", texts=len(missing)):
+            outputs = await asyncio.gather(
+                *[self.sentiment_service.analyze(texts[i]) for i in missing],
+                return_exceptions=True
+            )
+        
+        fresh_texts, fresh_values = [], []
+        for i, output in zip(missing, outputs):
+            if isinstance(output, Exception):
+                print(f"Duygu analizi hatası: {output}")
+                results[i] = {'label': 'NEUTRAL', 'score': 0.5}
+            else:
+                results[i] = output
+                fresh_texts.append(texts[i])
+                fresh_values.append(output)
+                
+        try:
+            with tracer.span("sentiment_cache.put_many", kind='db', texts=len(fresh_texts)):
+                await self.sentiment_cache.put_many(fresh_texts, fresh_values)
+        except Exception as e:
+            print(f"Duygu önbelleği yazma hatası: {e}")
+            
+        return results 
\ No newline at end of file
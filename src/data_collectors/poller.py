@@ -0,0 +1,115 @@
+import asyncio
+import time
+from src.config import Config
+from src.data_collectors.scheduler import PRIORITY_BACKGROUND
+
+class HotSymbols:
+    """Son zamanlarda sorgulanan sembolleri zaman damgasıyla tutar"""
+
+    def __init__(self, ttl=None, max_size=None):
+        self.ttl = ttl or Config.HOT_SYMBOL_RECENT_TTL
+        self.max_size = max_size or Config.HOT_SYMBOL_MAX
+        self._last_seen = {}
+
+    def touch(self, asset_type, symbol):
+        """Sembolün sorgulandığını kaydeder"""
+        self._last_seen[(asset_type, symbol.upper())] = time.monotonic()
+        if len(self._last_seen) > self.max_size:
+            self._prune()
+
+    def asset_type(self, symbol):
+        """Sembolün en son hangi varlık tipiyle bulunduğunu döndürür; bilinmiyorsa None"""
+        symbol = symbol.upper()
+        seen = [(last_seen, asset_type) for (asset_type, name), last_seen in self._last_seen.items() if name == symbol]
+        return max(seen)[1] if seen else None
+
+    def _prune(self):
+        cutoff = time.monotonic() - self.ttl
+        fresh = sorted(
+            ((seen, key) for key, seen in self._last_seen.items() if seen >= cutoff),
+            reverse=True
+        )[:self.max_size]
+        self._last_seen = {key: seen for seen, key in fresh}
+
+    def snapshot(self):
+        """Süresi dolmamış (varlık tipi, sembol) çiftlerini döndürür"""
+        self._prune()
+        return set(self._last_seen)
+
+class HotSymbolPoller:
+    """Portföylerdeki ve son sorgulanan sembollerin fiyatlarını arka planda taze tutar"""
+
+    def __init__(self, collector, portfolio_loader=None, interval=None, refresh_ratio=None):
+        self.collector = collector
+        self.portfolio_loader = portfolio_loader
+        self.interval = interval or Config.HOT_SYMBOL_POLL_INTERVAL
+        self.refresh_ratio = refresh_ratio or Config.HOT_SYMBOL_REFRESH_RATIO
+        self._task = None
+
+        self.cycles = 0
+        self.refreshed = 0
+        self.failed = 0
+
+    def start(self):
+        """Yoklama döngüsünü başlatır"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        """Yoklama döngüsünü durdurur"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _load_portfolio_symbols(self):
+        if self.portfolio_loader is None:
+            return set()
+        try:
+            return set(await self.portfolio_loader())
+        except Exception as e:
+            print(f"Portföy sembolleri okunamadı: {e}")
+            return set()
+
+    def _needs_refresh(self, asset_type, symbol):
+        age = self.collector.cache.age(asset_type, symbol)
+        if age is None:
+            return True
+        ttl = self.collector.cache.ttls.get(asset_type, self.collector.cache.default_ttl)
+        return age >= ttl * self.refresh_ratio
+
+    async def poll_once(self):
+        """Süresi dolmak üzere olan sıcak sembolleri arka plan önceliğiyle yeniler"""
+        hot = self.collector.hot_symbols.snapshot() | await self._load_portfolio_symbols()
+        due = [(asset_type, symbol) for asset_type, symbol in hot if self._needs_refresh(asset_type, symbol)]
+
+        results = await asyncio.gather(
+            *[self.collector.refresh(asset_type, symbol, priority=PRIORITY_BACKGROUND) for asset_type, symbol in due],
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception) or result is None:
+                self.failed += 1
+            else:
+                self.refreshed += 1
+        self.cycles += 1
+
+    async def _run(self):
+        while True:
+            try:
+                await self.poll_once()
+            except Exception as e:
+                print(f"Sıcak sembol yoklama hatası: {e}")
+            await asyncio.sleep(self.interval)
+
+    def stats(self):
+        """Yoklayıcı sayaçlarını döndürür"""
+        return {
+            'hot_symbols': len(self.collector.hot_symbols.snapshot()),
+            'cycles': self.cycles,
+            'refreshed': self.refreshed,
+            'failed': self.failed
+        }
@@ -0,0 +1,139 @@
+import asyncio
+import time
+from collections import OrderedDict
+from src.config import Config
+
+class QuoteCache:
+    """Fiyat verileri için varlık sınıfına göre TTL'li, LRU sınırlı ve istek birleştirmeli önbellek"""
+
+    def __init__(self, ttls=None, max_entries=None, serve_stale=None, max_stale=None):
+        self.ttls = ttls or {
+            'stock': Config.QUOTE_TTL_STOCK,
+            'crypto': Config.QUOTE_TTL_CRYPTO
+        }
+        self.default_ttl = min(self.ttls.values())
+        self.max_entries = max_entries or Config.QUOTE_CACHE_MAX_ENTRIES
+        self.serve_stale = Config.QUOTE_CACHE_SERVE_STALE if serve_stale is None else serve_stale
+        self.max_stale = Config.QUOTE_CACHE_MAX_STALE if max_stale is None else max_stale
+
+        # (varlık tipi, sembol) -> (değer, kayıt zamanı)
+        self._entries = OrderedDict()
+        # Devam eden upstream istekleri: (varlık tipi, sembol) -> Task
+        self._inflight = {}
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(asset_type, symbol):
+        return asset_type, symbol.upper()
+
+    async def get(self, asset_type, symbol, fetch):
+        """Önbellekten değer döndürür; yoksa fetch() ile tek bir upstream isteği yapar"""
+        key = self._key(asset_type, symbol)
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            value, stored_at = entry
+            age = time.monotonic() - stored_at
+            ttl = self.ttls.get(asset_type, self.default_ttl)
+
+            if age < ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+            # Süresi dolmuş değeri döndür, yenilemeyi arka planda yap
+            if self.serve_stale and age < ttl + self.max_stale:
+                self._entries.move_to_end(key)
+                self.stale_hits += 1
+                if key not in self._inflight:
+                    self._start_fetch(key, fetch)
+                return value
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(inflight)
+
+        self.misses += 1
+        return await asyncio.shield(self._start_fetch(key, fetch))
+
+    def _start_fetch(self, key, fetch):
+        """Anahtar için tek bir upstream isteği başlatır ve bekleyenlerle paylaşır"""
+        task = asyncio.ensure_future(self._fetch_and_store(key, fetch))
+        # Arka plan yenilemelerinde sahipsiz kalan hataları sessizce tüket
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._inflight[key] = task
+        return task
+
+    async def _fetch_and_store(self, key, fetch):
+        try:
+            value = await fetch()
+            if value is not None:
+                self.set(key[0], key[1], value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def set(self, asset_type, symbol, value):
+        """Değeri önbelleğe yazar, kapasite aşılırsa en eski kullanılanı çıkarır"""
+        key = self._key(asset_type, symbol)
+        self._entries[key] = (value, time.monotonic())
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def peek(self, asset_type, symbol):
+        """Sayaçları etkilemeden, süresi dolmamış değeri döndürür"""
+        entry = self._entries.get(self._key(asset_type, symbol))
+        if entry is None:
+            return None
+        value, stored_at = entry
+        if time.monotonic() - stored_at < self.ttls.get(asset_type, self.default_ttl):
+            return value
+        return None
+
+    def age(self, asset_type, symbol):
+        """Kaydın yaşını (saniye) döndürür; kayıt yoksa None"""
+        entry = self._entries.get(self._key(asset_type, symbol))
+        if entry is None:
+            return None
+        return time.monotonic() - entry[1]
+
+    def invalidate(self, asset_type=None, symbol=None):
+        """Belirli bir sembolü ya da tüm önbelleği temizler"""
+        if asset_type is None or symbol is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(self._key(asset_type, symbol), None)
+
+    def stats(self):
+        """Önbellek boyutlandırması için sayaçları döndürür"""
+        lookups = self.hits + self.stale_hits + self.misses + self.coalesced
+        return {
+            'size': len(self._entries),
+            'max_entries': self.max_entries,
+            'inflight': len(self._inflight),
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'evictions': self.evictions,
+            'hit_ratio': (self.hits + self.stale_hits + self.coalesced) / lookups if lookups else 0.0
+        }
+
+# Süreç genelinde paylaşılan önbellek
+_quote_cache = None
+
+def get_quote_cache():
+    """Paylaşılan fiyat önbelleğini döndürür"""
+    global _quote_cache
+    if _quote_cache is None:
+        _quote_cache = QuoteCache()
+    return _quote_cache
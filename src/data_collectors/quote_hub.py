@@ -0,0 +1,251 @@
+import asyncio
+import time
+from collections import defaultdict, deque
+from src.config import Config
+
+class _RateMeter:
+    """Son `window` saniyedeki olay sayısından saniye başına oranı hesaplar"""
+
+    def __init__(self, window=60):
+        self.window = window
+        self._buckets = deque()
+
+    def mark(self, count=1):
+        second = int(time.monotonic())
+        if self._buckets and self._buckets[-1][0] == second:
+            self._buckets[-1][1] += count
+        else:
+            self._buckets.append([second, count])
+        self._trim(second)
+
+    def _trim(self, now):
+        while self._buckets and self._buckets[0][0] <= now - self.window:
+            self._buckets.popleft()
+
+    def rate(self):
+        self._trim(int(time.monotonic()))
+        return sum(count for _, count in self._buckets) / self.window
+
+class QuoteSubscriber:
+    """Tek bir istemcinin abonelikleri ve henüz gönderilmemiş güncellemeleri
+
+    Bekleyen güncellemeler sembol başına tek değerdir (son değer kazanır); istemci yavaşsa
+    kuyruk büyümez, ara değerler birleştirilir. Gönderimler en fazla saniyede `max_rate` kez yapılır.
+    """
+
+    def __init__(self, send, max_rate, on_sent):
+        # send(mesaj sözlüğü) bir awaitable döndürür
+        self.send = send
+        self.interval = 1.0 / max_rate
+        self.symbols = set()
+        self.on_sent = on_sent
+        self._pending = {}
+        self._ready = asyncio.Event()
+        self._task = asyncio.ensure_future(self._run())
+
+        self.connected_at = time.monotonic()
+        self.messages = 0
+        self.updates = 0
+        self.coalesced = 0
+
+    def offer(self, quote):
+        """Güncellemeyi bekleyenlere koyar; aynı sembolün gönderilmemiş eski değeri atılır"""
+        if quote['symbol'] in self._pending:
+            self.coalesced += 1
+        self._pending[quote['symbol']] = quote
+        self._ready.set()
+
+    async def _run(self):
+        while True:
+            await self._ready.wait()
+            self._ready.clear()
+            batch, self._pending = self._pending, {}
+            try:
+                await self.send({'type': 'quotes', 'data': [_serialize(quote) for quote in batch.values()]})
+            except Exception:
+                # Bağlantı kapanmış; okuma döngüsü aboneliği sonlandırır
+                return
+            self.messages += 1
+            self.updates += len(batch)
+            self.on_sent(len(batch))
+            await asyncio.sleep(self.interval)
+
+    async def close(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+class QuoteHub:
+    """Canlı fiyatları abonelere dağıtan süreç içi yayın merkezi
+
+    Her sembol abone sayısından bağımsız olarak bir kez takip edilir: abone olunan semboller
+    sıcak sembol olarak işaretlenir ve HotSymbolPoller tarafından tek seferde yenilenir; toplayıcıya
+    gelen her yeni fiyat o sembolün tüm abonelerine iletilir.
+    """
+
+    def __init__(self, collector, max_rate=None, max_symbols=None, max_connections=None, keepalive_interval=None):
+        self.collector = collector
+        self.max_rate = max_rate or Config.QUOTE_HUB_MAX_RATE
+        self.max_symbols = max_symbols or Config.QUOTE_HUB_MAX_SYMBOLS
+        self.max_connections = max_connections or Config.QUOTE_HUB_MAX_CONNECTIONS
+        self.keepalive_interval = keepalive_interval or Config.QUOTE_HUB_KEEPALIVE_INTERVAL
+        collector.add_listener(self.publish)
+
+        self._clients = set()
+        self._subscribers = defaultdict(set)
+        self._latest = {}
+        self._asset_types = {}
+        self._fetches = {}
+        self._task = None
+
+        self.connections = 0
+        self.published = 0
+        self.rejected = 0
+        self.messages_sent = 0
+        self.updates_sent = 0
+        self._closed_coalesced = 0
+        self._published_rate = _RateMeter()
+        self._sent_rate = _RateMeter()
+
+    def start(self):
+        """Abone olunan sembolleri sıcak tutan görevi başlatır"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._keepalive())
+
+    async def stop(self):
+        """Görevi durdurur ve tüm istemcileri kapatır"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for client in list(self._clients):
+            await self.disconnect(client)
+
+    def connect(self, send):
+        """Yeni istemci kaydeder; bağlantı sınırı doluysa None döndürür"""
+        if len(self._clients) >= self.max_connections:
+            self.rejected += 1
+            return None
+        client = QuoteSubscriber(send, self.max_rate, self._on_sent)
+        self._clients.add(client)
+        self.connections += 1
+        return client
+
+    async def disconnect(self, client):
+        """İstemcinin tüm aboneliklerini kaldırır"""
+        self.unsubscribe(client, list(client.symbols))
+        if client in self._clients:
+            self._clients.discard(client)
+            self._closed_coalesced += client.coalesced
+        await client.close()
+
+    async def subscribe(self, client, symbols):
+        """İstemciyi sembollere abone eder ve bilinen son fiyatları hemen gönderir"""
+        symbols = [symbol.strip().upper() for symbol in symbols if symbol and symbol.strip().isalnum()]
+        new = [symbol for symbol in dict.fromkeys(symbols) if symbol not in client.symbols]
+        if len(client.symbols) + len(new) > self.max_symbols:
+            raise ValueError(f"En fazla {self.max_symbols} sembole abone olunabilir")
+
+        for symbol in new:
+            client.symbols.add(symbol)
+            self._subscribers[symbol].add(client)
+
+        # Fiyatı bilinmeyen semboller önbellek üzerinden bir kez çekilir; gelen fiyat publish ile dağılır
+        unknown = [symbol for symbol in new if symbol not in self._latest]
+        results = await asyncio.gather(*[self._fetch_once(symbol) for symbol in unknown], return_exceptions=True)
+        for symbol, result in zip(unknown, results):
+            if isinstance(result, Exception):
+                print(f"Canlı fiyat aboneliği hatası ({symbol}): {result}")
+
+        # Zaten takip edilen sembollerin son fiyatı yeni aboneye hemen gönderilir
+        for symbol in set(new) - set(unknown):
+            if symbol in self._latest:
+                client.offer(self._latest[symbol])
+        return sorted(client.symbols)
+
+    def unsubscribe(self, client, symbols):
+        """İstemcinin sembol aboneliklerini kaldırır; abonesi kalmayan sembol takipten çıkar"""
+        for symbol in symbols:
+            symbol = symbol.strip().upper()
+            client.symbols.discard(symbol)
+            subscribers = self._subscribers.get(symbol)
+            if subscribers is None:
+                continue
+            subscribers.discard(client)
+            if not subscribers:
+                del self._subscribers[symbol]
+                self._latest.pop(symbol, None)
+                self._asset_types.pop(symbol, None)
+
+    async def _fetch_once(self, symbol):
+        """Aynı sembol için eşzamanlı abonelikler tek bir çekimi bekler"""
+        task = self._fetches.get(symbol)
+        if task is None:
+            task = self._fetches[symbol] = asyncio.ensure_future(self._snapshot(symbol))
+            task.add_done_callback(lambda _: self._fetches.pop(symbol, None))
+        await asyncio.shield(task)
+
+    async def _snapshot(self, symbol):
+        quote = await self.collector.get_quote(symbol)
+        if not quote:
+            return
+        for asset_type in ('stock', 'crypto'):
+            if self.collector.cache.peek(asset_type, symbol):
+                self._asset_types[symbol] = asset_type
+                break
+        # Önbellekten gelen fiyat dinleyicilere yayınlanmamış olabilir
+        if symbol not in self._latest:
+            self.publish(quote)
+
+    def publish(self, quote):
+        """Toplayıcı dinleyicisi: fiyatı sembolün tüm abonelerine iletir"""
+        symbol = quote['symbol'].upper()
+        subscribers = self._subscribers.get(symbol)
+        if not subscribers:
+            return
+        quote = {**quote, 'symbol': symbol}
+        self._latest[symbol] = quote
+        for client in subscribers:
+            client.offer(quote)
+        self.published += 1
+        self._published_rate.mark()
+
+    def _on_sent(self, updates):
+        self.messages_sent += 1
+        self.updates_sent += updates
+        self._sent_rate.mark()
+
+    async def _keepalive(self):
+        while True:
+            # Abone olunan semboller yoklayıcının sıcak sembol listesinde tutulur
+            for symbol in list(self._subscribers):
+                asset_type = self._asset_types.get(symbol)
+                if asset_type is not None:
+                    self.collector.hot_symbols.touch(asset_type, symbol)
+            await asyncio.sleep(self.keepalive_interval)
+
+    def stats(self):
+        """Bağlantı, abonelik ve mesaj hızı sayaçlarını döndürür"""
+        return {
+            'connections': len(self._clients),
+            'total_connections': self.connections,
+            'rejected_connections': self.rejected,
+            'symbols': len(self._subscribers),
+            'subscriptions': sum(len(clients) for clients in self._subscribers.values()),
+            'published': self.published,
+            'published_per_second': round(self._published_rate.rate(), 3),
+            'messages_sent': self.messages_sent,
+            'updates_sent': self.updates_sent,
+            'messages_per_second': round(self._sent_rate.rate(), 3),
+            'coalesced_updates': self._closed_coalesced + sum(client.coalesced for client in self._clients),
+            'max_rate_per_client': self.max_rate
+        }
+
+def _serialize(quote):
+    timestamp = quote.get('timestamp')
+    return {**quote, 'timestamp': timestamp.isoformat() if hasattr(timestamp, 'isoformat') else timestamp}
@@ -0,0 +1,170 @@
+import asyncio
+import itertools
+from src.config import Config
+from src.utils.rate_limit import TokenBucket
+
+# Küçük değer önce işlenir
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+class QuotaExceededError(Exception):
+    """Upstream kotası nedeniyle istek zamanında gönderilemedi"""
+
+class UpstreamRateLimitError(QuotaExceededError):
+    """Upstream servis istek limitinin aşıldığını bildirdi"""
+
+class _Job:
+    __slots__ = ('factory', 'future', 'dispatched')
+
+    def __init__(self, factory, future, dispatched):
+        self.factory = factory
+        self.future = future
+        # İş kuyruktan çıkıp çalıştırılmaya başlandığında tamamlanır
+        self.dispatched = dispatched
+
+class UpstreamScheduler:
+    """Alpha Vantage çağrılarını kota kovaları ve öncelik kuyruğu üzerinden sıraya koyar"""
+
+    def __init__(self, calls_per_minute=None, calls_per_day=None, interactive_reserve=None,
+                 interactive_max_wait=None, background_max_wait=None, quota_share=None):
+        # Anahtarın kotası süreçler arasında paylaşılır; bu süreç yalnızca kendi payını kullanır
+        self.quota_share = Config.ALPHA_VANTAGE_QUOTA_SHARE if quota_share is None else quota_share
+        calls_per_minute = calls_per_minute or Config.ALPHA_VANTAGE_CALLS_PER_MINUTE * self.quota_share
+        calls_per_day = calls_per_day or Config.ALPHA_VANTAGE_CALLS_PER_DAY * self.quota_share
+
+        self.buckets = [
+            TokenBucket(rate=calls_per_minute / 60.0, capacity=max(1, calls_per_minute)),
+            TokenBucket(rate=calls_per_day / 86400.0, capacity=max(1, calls_per_day))
+        ]
+        # Arka plan işleri etkileşimli istekler için bu kadar token'ı bırakır; kovaya sığmayan rezerv
+        # arka plan işlerini hiç çalıştırmazdı
+        reserve = Config.SCHEDULER_INTERACTIVE_RESERVE if interactive_reserve is None else interactive_reserve
+        self.interactive_reserve = min(reserve, int(min(bucket.capacity for bucket in self.buckets)) - 1)
+        # 0 geçerli bir değerdir: iş kuyrukta hiç bekletilmez
+        self.max_waits = {
+            PRIORITY_INTERACTIVE: Config.SCHEDULER_INTERACTIVE_MAX_WAIT if interactive_max_wait is None else interactive_max_wait,
+            PRIORITY_BACKGROUND: Config.SCHEDULER_BACKGROUND_MAX_WAIT if background_max_wait is None else background_max_wait
+        }
+
+        self._queue = None
+        self._wakeup = None
+        self._dispatcher = None
+        # Event loop görevlere yalnızca zayıf referans tutar; çalışan çağrılar burada saklanır
+        self._running = set()
+        self._counter = itertools.count()
+
+        self.dispatched = 0
+        self.expired = 0
+        self.rate_limited = 0
+
+    def start(self):
+        """Dağıtıcı görevini çalışan event loop üzerinde başlatır"""
+        if self._dispatcher is None or self._dispatcher.done():
+            self._queue = asyncio.PriorityQueue()
+            self._wakeup = asyncio.Event()
+            self._dispatcher = asyncio.ensure_future(self._dispatch_loop())
+
+    async def stop(self):
+        """Dağıtıcıyı durdurur, bekleyen işleri iptal eder"""
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+
+        while self._queue is not None and not self._queue.empty():
+            _, _, job = self._queue.get_nowait()
+            job.dispatched.cancel()
+            job.future.cancel()
+
+    async def submit(self, factory, priority=PRIORITY_INTERACTIVE):
+        """factory() ile üretilen çağrıyı kota izin verdiğinde çalıştırır ve sonucunu döndürür
+
+        Öncelik sınıfının azami bekleme süresi yalnızca kuyrukta geçen süreye uygulanır; gönderilmiş
+        bir çağrının yavaş yanıtı kota hatasına dönüşmez.
+        """
+        self.start()
+        loop = asyncio.get_running_loop()
+        job = _Job(factory, loop.create_future(), loop.create_future())
+        self._queue.put_nowait((priority, next(self._counter), job))
+        self._wakeup.set()
+
+        max_wait = self.max_waits.get(priority, Config.SCHEDULER_BACKGROUND_MAX_WAIT)
+        try:
+            await asyncio.wait_for(asyncio.shield(job.dispatched), timeout=max_wait)
+        except asyncio.TimeoutError:
+            if not job.dispatched.done():
+                job.dispatched.cancel()
+                job.future.cancel()
+                self.expired += 1
+                raise QuotaExceededError("Upstream kotası doldu, istek zamanında gönderilemedi")
+        return await job.future
+
+    def penalize(self):
+        """Upstream limit bildirdiğinde dakika kovasını boşaltır"""
+        self.rate_limited += 1
+        self.buckets[0].drain()
+
+    def _wait_time(self, tokens):
+        return max(bucket.wait_time(tokens) for bucket in self.buckets)
+
+    async def _dispatch_loop(self):
+        while True:
+            priority, seq, job = await self._queue.get()
+            if job.future.done():
+                continue
+
+            needed = 1 if priority <= PRIORITY_INTERACTIVE else 1 + self.interactive_reserve
+            wait = self._wait_time(needed)
+            if wait > 0:
+                # İşi geri koy; token birikmesini ya da daha öncelikli bir işin gelmesini bekle
+                self._queue.put_nowait((priority, seq, job))
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            for bucket in self.buckets:
+                bucket.try_acquire()
+            self.dispatched += 1
+            job.dispatched.set_result(None)
+            task = asyncio.ensure_future(self._run(job))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, job):
+        try:
+            result = await job.factory()
+        except Exception as e:
+            if not job.future.done():
+                job.future.set_exception(e)
+        else:
+            if not job.future.done():
+                job.future.set_result(result)
+
+    def stats(self):
+        """Kota ve kuyruk durumunu döndürür"""
+        return {
+            'queued': self._queue.qsize() if self._queue is not None else 0,
+            'running': len(self._running),
+            'tokens_minute': self.buckets[0].available(),
+            'tokens_day': self.buckets[1].available(),
+            'quota_share': self.quota_share,
+            'dispatched': self.dispatched,
+            'expired': self.expired,
+            'rate_limited': self.rate_limited
+        }
+
+# Süreç genelinde paylaşılan zamanlayıcı
+_scheduler = None
+
+def get_scheduler(quota_share=None):
+    """Paylaşılan upstream zamanlayıcısını döndürür; kota payı yalnızca ilk çağrıda uygulanır"""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = UpstreamScheduler(quota_share=quota_share)
+    return _scheduler
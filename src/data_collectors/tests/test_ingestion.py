@@ -0,0 +1,59 @@
+import asyncio
+from datetime import datetime, timedelta
+from src.data_collectors.ingestion import IngestionPipeline
+
+START = datetime(2024, 1, 2, 10, 0, 0)
+
+def quote(symbol, seconds, price=1.0):
+    return {'symbol': symbol, 'timestamp': START + timedelta(seconds=seconds), 'price': price}
+
+class RecordingPipeline(IngestionPipeline):
+    """Veritabanı yerine yazılan satırları biriktirir; ilk `failures` yazma hata verir"""
+
+    def __init__(self, failures=0, delay=0.0, **kwargs):
+        super().__init__(**kwargs)
+        self.failures = failures
+        self.delay = delay
+        self.rows = []
+
+    async def _write(self, rows):
+        await asyncio.sleep(self.delay)
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("veritabanı kapalı")
+        self.rows.extend(rows)
+        return len(rows)
+
+def test_failed_flush_requeues_rows_up_to_queue_capacity():
+    async def run():
+        pipeline = RecordingPipeline(failures=1, max_queue=3)
+        failed = {}
+        for i in range(3):
+            pipeline._buffer(failed, (f"S{i}", START, 1.0, None, 0.0))
+        # Yazma sürerken tampona gelen yeni satır korunur, en eski satır atılır
+        pipeline._buffer(pipeline._pending, ("NEW", START, 2.0, None, 0.0))
+        assert not await pipeline._flush(failed)
+        return pipeline
+
+    pipeline = asyncio.run(run())
+    assert list(pipeline._pending) == [('S1', START), ('S2', START), ('NEW', START)]
+    stats = pipeline.stats()
+    assert stats['dropped'] == 1 and stats['flush_errors'] == 1 and stats['written'] == 0
+
+def test_stop_waits_for_in_flight_flush_and_retries_failed_rows():
+    async def run():
+        pipeline = RecordingPipeline(failures=1, delay=0.05, batch_size=2, flush_interval=60)
+        pipeline.start()
+        await pipeline.publish(quote('BTC', 0))
+        await pipeline.publish(quote('ETH', 0))
+        # İlk yazma sürerken durdurulur; yazma iptal edilmez, başarısız satırlar son yazmada tekrar denenir
+        await asyncio.sleep(0.01)
+        await pipeline.publish(quote('BTC', 1))
+        await pipeline.stop()
+        return pipeline
+
+    pipeline = asyncio.run(run())
+    assert sorted((row[0], row[1]) for row in pipeline.rows) == [
+        ('BTC', START), ('BTC', START + timedelta(seconds=1)), ('ETH', START)
+    ]
+    assert pipeline.stats()['buffered'] == 0
@@ -0,0 +1,48 @@
+import asyncio
+from src.data_collectors.market_data import MarketDataCollector
+from src.data_collectors.quote_cache import QuoteCache
+
+class Upstream:
+    """Sembolleri yalnızca bilinen varlık tipinde bulan sahte Alpha Vantage"""
+
+    def __init__(self, stocks=(), crypto=()):
+        self.known = {'stock': set(stocks), 'crypto': set(crypto)}
+        self.calls = []
+
+    def fetcher(self, asset_type):
+        async def fetch(symbol, priority=None):
+            self.calls.append((asset_type, symbol))
+            if symbol in self.known[asset_type]:
+                return {'symbol': symbol, 'price': 1.0}
+            return None
+        return fetch
+
+def collector(upstream):
+    cache = QuoteCache(ttls={'stock': 60, 'crypto': 60}, max_entries=100, serve_stale=False, max_stale=0)
+    market = MarketDataCollector(http_client=object(), quote_cache=cache, scheduler=object())
+    market._fetch_stock_data = upstream.fetcher('stock')
+    market._fetch_crypto_data = upstream.fetcher('crypto')
+    return market
+
+def test_stock_hit_costs_one_upstream_call():
+    upstream = Upstream(stocks={'THYAO'})
+    assert asyncio.run(collector(upstream).get_quote('THYAO'))['symbol'] == 'THYAO'
+    assert upstream.calls == [('stock', 'THYAO')]
+
+def test_crypto_is_tried_only_after_stock_misses():
+    upstream = Upstream(crypto={'BTC'})
+    assert asyncio.run(collector(upstream).get_quote('BTC'))['symbol'] == 'BTC'
+    assert upstream.calls == [('stock', 'BTC'), ('crypto', 'BTC')]
+
+def test_known_asset_type_is_tried_first():
+    upstream = Upstream(crypto={'BTC'})
+    market = collector(upstream)
+
+    async def scenario():
+        await market.get_quote('BTC')
+        market.cache.invalidate()
+        upstream.calls.clear()
+        return await market.get_quote('BTC')
+
+    assert asyncio.run(scenario())['symbol'] == 'BTC'
+    assert upstream.calls == [('crypto', 'BTC')]
@@ -0,0 +1,101 @@
+import asyncio
+import pytest
+from src.data_collectors import quote_cache
+from src.data_collectors.quote_cache import QuoteCache
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(quote_cache.time, 'monotonic', lambda: now[0])
+    return now
+
+def counting_fetch(value='quote', delay=0.0):
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        if delay:
+            await asyncio.sleep(delay)
+        return f"{value}-{len(calls)}"
+    return fetch, calls
+
+def make_cache(**kwargs):
+    params = dict(ttls={'stock': 60, 'crypto': 10}, max_entries=100, serve_stale=False, max_stale=0)
+    params.update(kwargs)
+    return QuoteCache(**params)
+
+def test_fresh_value_is_served_until_ttl_expires(clock):
+    async def scenario():
+        cache = make_cache()
+        fetch, calls = counting_fetch()
+        assert await cache.get('stock', 'thyao', fetch) == 'quote-1'
+        clock[0] += 59
+        assert await cache.get('stock', 'THYAO', fetch) == 'quote-1'
+        clock[0] += 2
+        assert await cache.get('stock', 'THYAO', fetch) == 'quote-2'
+        return cache, calls
+
+    cache, calls = asyncio.run(scenario())
+    assert len(calls) == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+
+def test_ttl_depends_on_asset_type(clock):
+    async def scenario():
+        cache = make_cache()
+        cache.set('stock', 'AAA', 'stock')
+        cache.set('crypto', 'AAA', 'crypto')
+        clock[0] += 30
+        return cache.peek('stock', 'AAA'), cache.peek('crypto', 'AAA'), cache.age('crypto', 'AAA')
+
+    assert asyncio.run(scenario()) == ('stock', None, 30)
+
+def test_concurrent_misses_share_one_fetch():
+    async def scenario():
+        cache = make_cache()
+        fetch, calls = counting_fetch(delay=0.01)
+        results = await asyncio.gather(*[cache.get('stock', 'THYAO', fetch) for _ in range(10)])
+        return cache, calls, results
+
+    cache, calls, results = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert results == ['quote-1'] * 10
+    assert (cache.misses, cache.coalesced) == (1, 9)
+    assert cache.stats()['inflight'] == 0
+
+def test_failed_fetch_is_not_cached_and_reaches_every_waiter():
+    async def scenario():
+        cache = make_cache()
+
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream")
+        results = await asyncio.gather(*[cache.get('stock', 'X', failing) for _ in range(3)], return_exceptions=True)
+        return cache, results
+
+    cache, results = asyncio.run(scenario())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert cache.peek('stock', 'X') is None
+
+def test_stale_value_is_served_while_refreshing_in_background(clock):
+    async def scenario():
+        cache = make_cache(serve_stale=True, max_stale=30)
+        fetch, calls = counting_fetch()
+        await cache.get('stock', 'THYAO', fetch)
+        clock[0] += 70
+        stale = await cache.get('stock', 'THYAO', fetch)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        return stale, cache.peek('stock', 'THYAO'), cache.stale_hits
+
+    assert asyncio.run(scenario()) == ('quote-1', 'quote-2', 1)
+
+def test_least_recently_used_entry_is_evicted():
+    cache = make_cache(max_entries=2)
+    cache.set('stock', 'A', 1)
+    cache.set('stock', 'B', 2)
+    cache.set('stock', 'A', 3)
+    cache.set('stock', 'C', 4)
+
+    assert cache.peek('stock', 'B') is None
+    assert cache.peek('stock', 'A') == 3
+    assert cache.evictions == 1
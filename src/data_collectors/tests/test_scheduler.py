@@ -0,0 +1,85 @@
+import asyncio
+import pytest
+from src.config import Config
+from src.data_collectors.scheduler import (
+    UpstreamScheduler, QuotaExceededError, PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE
+)
+
+def scheduler(**kwargs):
+    params = dict(calls_per_minute=60, calls_per_day=10000, interactive_reserve=0,
+                  interactive_max_wait=1.0, background_max_wait=1.0)
+    params.update(kwargs)
+    return UpstreamScheduler(**params)
+
+def test_calls_run_within_quota():
+    async def scenario():
+        upstream = scheduler()
+
+        async def call():
+            return 'ok'
+        results = await asyncio.gather(*[upstream.submit(call) for _ in range(5)])
+        await upstream.stop()
+        return results, upstream.stats()
+
+    results, stats = asyncio.run(scenario())
+    assert results == ['ok'] * 5
+    assert stats['dispatched'] == 5 and stats['running'] == 0
+
+def test_explicit_zero_max_wait_is_not_replaced_by_default():
+    upstream = scheduler(interactive_max_wait=0, background_max_wait=0)
+    assert upstream.max_waits == {PRIORITY_INTERACTIVE: 0, PRIORITY_BACKGROUND: 0}
+
+def test_exhausted_quota_expires_waiting_calls():
+    async def scenario():
+        upstream = scheduler(calls_per_minute=1, interactive_max_wait=0.05)
+
+        async def call():
+            return 'ok'
+        first = await upstream.submit(call)
+        with pytest.raises(QuotaExceededError):
+            await upstream.submit(call)
+        await upstream.stop()
+        return first, upstream.expired
+
+    assert asyncio.run(scenario()) == ('ok', 1)
+
+def test_background_calls_leave_interactive_reserve():
+    async def scenario():
+        upstream = scheduler(calls_per_minute=2, interactive_reserve=1, background_max_wait=0.05)
+
+        async def call():
+            return 'ok'
+        await upstream.submit(call)
+        # Tek token kaldı; arka plan işi rezervi tüketemez, etkileşimli istek geçer
+        with pytest.raises(QuotaExceededError):
+            await upstream.submit(call, PRIORITY_BACKGROUND)
+        interactive = await upstream.submit(call, PRIORITY_INTERACTIVE)
+        await upstream.stop()
+        return interactive
+
+    assert asyncio.run(scenario()) == 'ok'
+
+
+def test_slow_dispatched_call_is_not_expired_by_queue_wait():
+    async def scenario():
+        upstream = scheduler(interactive_max_wait=0.02)
+
+        async def slow_call():
+            # Kuyrukta beklemeden gönderilir ama yanıtı azami bekleme süresinden uzun sürer
+            await asyncio.sleep(0.1)
+            return 'ok'
+        result = await upstream.submit(slow_call)
+        await upstream.stop()
+        return result, upstream.expired
+
+    assert asyncio.run(scenario()) == ('ok', 0)
+
+
+def test_process_quota_share_scales_configured_quota(monkeypatch):
+    monkeypatch.setattr(Config, 'ALPHA_VANTAGE_CALLS_PER_MINUTE', 5)
+    monkeypatch.setattr(Config, 'ALPHA_VANTAGE_CALLS_PER_DAY', 500)
+    upstream = UpstreamScheduler(quota_share=0.2, interactive_reserve=1)
+    assert upstream.buckets[0].rate * 60 == pytest.approx(1)
+    assert upstream.buckets[1].capacity == pytest.approx(100)
+    # Dakikada tek çağrılık payda rezerv bırakılırsa arka plan işleri hiç çalışamazdı
+    assert upstream.interactive_reserve == 0
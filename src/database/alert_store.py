@@ -0,0 +1,98 @@
+from datetime import datetime
+from sqlalchemy import select, delete, insert, update, func
+from src.database.models import PriceAlert
+from src.database.session import get_engine
+
+# Tek sorgudaki IN listesi uzunluğu
+CLAIM_CHUNK = 500
+
+ALERT_COLUMNS = ('id', 'platform', 'user_id', 'chat_id', 'asset_type', 'symbol', 'direction', 'threshold', 'created_at')
+
+class AlertStore:
+    """Fiyat alarmlarını price_alerts tablosunda okur ve yazar"""
+
+    def __init__(self, engine=None):
+        self._engine = engine
+
+    @property
+    def engine(self):
+        return self._engine or get_engine()
+
+    @staticmethod
+    def _columns():
+        table = PriceAlert.__table__
+        return [table.c[name] for name in ALERT_COLUMNS]
+
+    async def add(self, alert):
+        """Alarmı yazar ve id'si eklenmiş kaydı döndürür"""
+        row = {**alert, 'created_at': datetime.utcnow()}
+        async with self.engine.begin() as conn:
+            result = await conn.execute(insert(PriceAlert.__table__), [row])
+        return {**row, 'id': result.inserted_primary_key[0]}
+
+    async def count_active(self, platform, user_id):
+        """Kullanıcının tetiklenmemiş alarm sayısını döndürür"""
+        query = select(func.count()).select_from(PriceAlert.__table__).where(
+            PriceAlert.platform == platform,
+            PriceAlert.user_id == user_id,
+            PriceAlert.triggered_at.is_(None)
+        )
+        async with self.engine.connect() as conn:
+            return (await conn.execute(query)).scalar_one()
+
+    async def list_active(self, platform, user_id):
+        """Kullanıcının tetiklenmemiş alarmlarını sembol ve eşik sırasıyla döndürür"""
+        query = select(*self._columns()).where(
+            PriceAlert.platform == platform,
+            PriceAlert.user_id == user_id,
+            PriceAlert.triggered_at.is_(None)
+        ).order_by(PriceAlert.symbol, PriceAlert.threshold)
+        async with self.engine.connect() as conn:
+            return [dict(row) for row in (await conn.execute(query)).mappings().all()]
+
+    async def load_active(self, platform, after_id=0, limit=10000):
+        """Platformun id'si after_id'den büyük aktif alarmlarını id sırasıyla bir sayfa olarak döndürür"""
+        query = select(*self._columns()).where(
+            PriceAlert.platform == platform,
+            PriceAlert.triggered_at.is_(None),
+            PriceAlert.id > after_id
+        ).order_by(PriceAlert.id).limit(limit)
+        async with self.engine.connect() as conn:
+            return [dict(row) for row in (await conn.execute(query)).mappings().all()]
+
+    async def remove(self, platform, user_id, alert_id):
+        """Kullanıcının aktif alarmını siler; silindiyse True döndürür"""
+        query = delete(PriceAlert.__table__).where(
+            PriceAlert.id == alert_id,
+            PriceAlert.platform == platform,
+            PriceAlert.user_id == user_id,
+            PriceAlert.triggered_at.is_(None)
+        )
+        async with self.engine.begin() as conn:
+            return (await conn.execute(query)).rowcount > 0
+
+    async def claim(self, alert_ids, triggered_at=None):
+        """Hâlâ aktif olan alarmları tek işlemde tetiklenmiş işaretler ve işaretlenen id'leri döndürür
+
+        Bu arada silinmiş ya da zaten tetiklenmiş alarmlar dönmez, böylece iki kez bildirilmez.
+        """
+        if not alert_ids:
+            return set()
+        triggered_at = triggered_at or datetime.utcnow()
+        alert_ids = list(alert_ids)
+        claimed = set()
+        async with self.engine.begin() as conn:
+            # IN listesi sürücü parametre sınırını aşmasın diye parçalara bölünür
+            for start in range(0, len(alert_ids), CLAIM_CHUNK):
+                chunk = alert_ids[start:start + CLAIM_CHUNK]
+                active = list((await conn.execute(
+                    select(PriceAlert.id).where(PriceAlert.id.in_(chunk), PriceAlert.triggered_at.is_(None))
+                )).scalars())
+                if active:
+                    await conn.execute(
+                        update(PriceAlert.__table__)
+                        .where(PriceAlert.id.in_(active))
+                        .values(triggered_at=triggered_at)
+                    )
+                claimed.update(active)
+        return claimed
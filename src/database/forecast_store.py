@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+from sqlalchemy import select, delete, insert
+from src.database.models import Forecast
+from src.database.session import get_engine
+
+class ForecastStore:
+    """Önceden hesaplanmış trend tahminlerini forecasts tablosunda okur ve yazar"""
+
+    def __init__(self, engine=None):
+        self._engine = engine
+
+    @property
+    def engine(self):
+        return self._engine or get_engine()
+
+    async def read(self, symbols, max_age):
+        """max_age saniyeden yeni olan tahminleri sembol -> tahmin sözlüğü olarak döndürür"""
+        if not symbols:
+            return {}
+        # Tahmin işi sembolleri büyük harfle yazar
+        symbols = {symbol.upper() for symbol in symbols}
+        cutoff = datetime.utcnow() - timedelta(seconds=max_age)
+        query = select(Forecast.__table__).where(
+            Forecast.symbol.in_(list(symbols)),
+            Forecast.generated_at >= cutoff
+        )
+        async with self.engine.connect() as conn:
+            rows = (await conn.execute(query)).mappings().all()
+
+        return {
+            row['symbol']: {
+                'trend': row['trend'],
+                'confidence': row['confidence'],
+                'prediction': row['prediction'],
+                'generated_at': row['generated_at']
+            }
+            for row in rows
+        }
+
+    async def write(self, forecasts, generated_at=None):
+        """Tahminleri tek bir işlemde topluca yazar; sembolün eski tahmini değiştirilir"""
+        if not forecasts:
+            return
+        generated_at = generated_at or datetime.utcnow()
+        rows = [
+            {
+                'symbol': symbol,
+                'trend': forecast['trend'],
+                'confidence': forecast['confidence'],
+                'prediction': forecast['prediction'],
+                'generated_at': generated_at
+            }
+            for symbol, forecast in forecasts.items()
+        ]
+        async with self.engine.begin() as conn:
+            await conn.execute(delete(Forecast.__table__).where(Forecast.symbol.in_(list(forecasts))))
+            await conn.execute(insert(Forecast.__table__), rows)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, String, Float, DateTime, ForeignKey, Index, Text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -13,6 +13,7 @@ class User(Base):
     email = Column(String, unique=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     portfolio = relationship("Portfolio", back_populates="user")
+    chat_messages = relationship("ChatMessage", back_populates="user")
 
 class Portfolio(Base):
     __tablename__ = 'portfolios'
@@ -25,11 +26,72 @@ class Portfolio(Base):
     purchase_price = Column(Float)
     user = relationship("User", back_populates="portfolio")
 
+class ChatMessage(Base):
+    __tablename__ = 'chat_messages'
+    # Kullanıcı geçmişi id sırasıyla okunur
+    __table_args__ = (
+        Index('ix_chat_messages_user_id_id', 'user_id', 'id'),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey('users.id'))
+    role = Column(String)  # 'user' veya 'assistant'
+    content = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    user = relationship("User", back_populates="chat_messages")
+
 class MarketData(Base):
     __tablename__ = 'market_data'
+    # Sembol bazlı zaman aralığı okumaları ve toplu yazmada tekilleştirme için bileşik indeks
+    __table_args__ = (
+        Index('ix_market_data_symbol_timestamp', 'symbol', 'timestamp', unique=True),
+    )
     
     id = Column(Integer, primary_key=True)
     symbol = Column(String)
     price = Column(Float)
     timestamp = Column(DateTime, default=datetime.utcnow)
-    volume = Column(Float) 
\ No newline at end of file
+    volume = Column(Float)
+
+class OHLCVBar(Base):
+    __tablename__ = 'ohlcv_bars'
+    
+    # Ham tiklerden önceden toplanmış barlar; birincil anahtar aralık okumalarında indeks görevi görür
+    symbol = Column(String, primary_key=True)
+    resolution = Column(String, primary_key=True)  # '1m', '1h' veya '1d'
+    bucket_start = Column(DateTime, primary_key=True)
+    open = Column(Float)
+    high = Column(Float)
+    low = Column(Float)
+    close = Column(Float)
+    volume = Column(Float)
+    tick_count = Column(Integer)
+
+class Forecast(Base):
+    __tablename__ = 'forecasts'
+    
+    # Her sembol için en güncel tahmin tutulur
+    symbol = Column(String, primary_key=True)
+    trend = Column(String)
+    confidence = Column(Float)
+    prediction = Column(Float)
+    generated_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+class PriceAlert(Base):
+    __tablename__ = 'price_alerts'
+    # Bot süreçleri platformun aktif alarmlarını id sırasıyla sayfalar; kullanıcı listeleri ayrı indeksten okunur
+    __table_args__ = (
+        Index('ix_price_alerts_platform_triggered_id', 'platform', 'triggered_at', 'id'),
+        Index('ix_price_alerts_platform_user', 'platform', 'user_id'),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    platform = Column(String)  # 'telegram' veya 'discord'
+    user_id = Column(BigInteger)  # Platformdaki kullanıcı kimliği
+    chat_id = Column(BigInteger)  # Bildirimin gönderileceği sohbet/kanal
+    asset_type = Column(String)  # 'stock' veya 'crypto'
+    symbol = Column(String)
+    direction = Column(String)  # 'above' veya 'below'
+    threshold = Column(Float)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    triggered_at = Column(DateTime, nullable=True) 
\ No newline at end of file
@@ -0,0 +1,70 @@
+from contextlib import asynccontextmanager
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+from src.database.models import User, Portfolio, ChatMessage
+from src.database.session import get_session
+
+@asynccontextmanager
+async def _session_scope(session=None):
+    """Verilen oturumu kullanır, verilmediyse geçici bir oturum açar"""
+    if session is not None:
+        yield session
+    else:
+        async with get_session() as new_session:
+            yield new_session
+
+async def get_user_with_portfolio(user_id, session=None):
+    """Kullanıcıyı portföy satırlarıyla birlikte tek sorguda (JOIN) getirir"""
+    async with _session_scope(session) as db:
+        result = await db.execute(
+            select(User).options(joinedload(User.portfolio)).where(User.id == user_id)
+        )
+        return result.unique().scalar_one_or_none()
+
+async def get_user_portfolio(user_id, session=None, symbol=None):
+    """Kullanıcının portföy satırlarını döndürür; kullanıcı yoksa None"""
+    user = await get_user_with_portfolio(user_id, session)
+    if user is None:
+        return None
+    if symbol is None:
+        return list(user.portfolio)
+    return [asset for asset in user.portfolio if asset.symbol.upper() == symbol.upper()]
+
+async def get_user_chat_history(user_id, limit=10, session=None, before_id=None):
+    """Kullanıcının mesajlarını yeniden eskiye doğru döndürür
+
+    Sayfalama OFFSET yerine imleçle yapılır: before_id verilirse yalnızca o id'den eski
+    mesajlar okunur, böylece (user_id, id) indeksi üzerinde derin sayfalar da sabit maliyetlidir.
+    """
+    query = (
+        select(ChatMessage.id, ChatMessage.role, ChatMessage.content, ChatMessage.created_at)
+        .where(ChatMessage.user_id == user_id)
+    )
+    if before_id is not None:
+        query = query.where(ChatMessage.id < before_id)
+        
+    async with _session_scope(session) as db:
+        result = await db.execute(query.order_by(ChatMessage.id.desc()).limit(limit))
+        return [dict(row) for row in result.mappings().all()]
+
+async def load_portfolio_symbols(session=None):
+    """Portföylerde bulunan tüm (varlık tipi, sembol) çiftlerini döndürür"""
+    async with _session_scope(session) as db:
+        rows = (await db.execute(select(Portfolio.asset_type, Portfolio.symbol).distinct())).all()
+    return [(asset_type or 'stock', symbol.upper()) for asset_type, symbol in rows if symbol]
+
+async def load_portfolios(user_ids=None, session=None):
+    """Kullanıcıların portföy satırlarını tek sorguda okur: kullanıcı kimliği -> Portfolio satırları
+
+    user_ids verilmezse portföyü olan tüm kullanıcılar döndürülür.
+    """
+    query = select(Portfolio).order_by(Portfolio.user_id, Portfolio.id)
+    if user_ids is not None:
+        query = query.where(Portfolio.user_id.in_(list(user_ids)))
+        
+    async with _session_scope(session) as db:
+        rows = (await db.execute(query)).scalars().all()
+    portfolios = {}
+    for asset in rows:
+        portfolios.setdefault(asset.user_id, []).append(asset)
+    return portfolios
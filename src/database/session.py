@@ -0,0 +1,93 @@
+import re
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from src.config import Config
+from src.database.models import Base
+from src.utils.tracing import get_tracer
+
+# Senkron sürücülerin asenkron karşılıkları
+ASYNC_DRIVERS = {
+    'postgresql': 'postgresql+asyncpg',
+    'postgres': 'postgresql+asyncpg',
+    'sqlite': 'sqlite+aiosqlite',
+    'mysql': 'mysql+aiomysql'
+}
+
+# Sorgu metriklerinde işlem ve tablo adı etiket olarak kullanılır (parametreler değil)
+_TABLE_PATTERN = re.compile(r'\b(?:FROM|INTO|UPDATE|TABLE)\s+"?(\w+)', re.IGNORECASE)
+
+# Bağlantı havuzu ilk kullanımda kurulur
+_engine = None
+_session_factory = None
+
+def _async_url(url):
+    """DATABASE_URL'yi asenkron sürücü kullanan karşılığına çevirir"""
+    scheme, separator, rest = url.partition('://')
+    if '+' in scheme:
+        return url
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{separator}{rest}"
+
+def get_engine():
+    """Paylaşılan asenkron veritabanı motorunu döndürür"""
+    global _engine
+    if _engine is None:
+        url = Config.ASYNC_DATABASE_URL or _async_url(Config.DATABASE_URL)
+        options = {'pool_pre_ping': Config.DB_POOL_PRE_PING}
+        if not url.startswith('sqlite'):
+            options.update(
+                pool_size=Config.DB_POOL_SIZE,
+                max_overflow=Config.DB_MAX_OVERFLOW,
+                pool_recycle=Config.DB_POOL_RECYCLE,
+                pool_timeout=Config.DB_POOL_TIMEOUT
+            )
+        _engine = create_async_engine(url, **options)
+        _instrument(_engine)
+    return _engine
+
+def _operation(statement):
+    """SQL ifadesinden "SELECT market_data" biçiminde düşük kardinaliteli işlem adı çıkarır"""
+    verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else 'SQL'
+    table = _TABLE_PATTERN.search(statement)
+    return f"{verb} {table.group(1)}" if table else verb
+
+def _instrument(engine):
+    """Her sorguyu etkin istek izinde db span'ı olarak ölçer"""
+    tracer = get_tracer()
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('spans', []).append(
+            tracer.start_span(_operation(statement), kind='db', executemany=executemany)
+        )
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_execute(conn, cursor, statement, parameters, context, executemany):
+        spans = conn.info.get('spans')
+        if spans:
+            tracer.finish_span(spans.pop())
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def on_error(context):
+        spans = context.connection.info.get('spans') if context.connection is not None else None
+        if spans:
+            tracer.finish_span(spans.pop(), error=context.original_exception)
+
+def get_session():
+    """Yeni bir asenkron veritabanı oturumu açar (async with ile kullanılır)"""
+    global _session_factory
+    if _session_factory is None:
+        _session_factory = async_sessionmaker(get_engine(), expire_on_commit=False)
+    return _session_factory()
+
+async def init_db():
+    """Eksik tabloları oluşturur (uygulama açılışında bir kez çağrılır)"""
+    async with get_engine().begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+async def close_db():
+    """Havuzdaki bağlantıları kapatır"""
+    global _engine, _session_factory
+    if _engine is not None:
+        await _engine.dispose()
+    _engine = None
+    _session_factory = None
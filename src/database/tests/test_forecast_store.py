@@ -0,0 +1,35 @@
+import asyncio
+from sqlalchemy.ext.asyncio import create_async_engine
+from src.database.forecast_store import ForecastStore
+from src.database.models import Base
+
+async def make_engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return engine
+
+def test_read_is_case_insensitive_and_respects_max_age(tmp_path):
+    async def scenario():
+        engine = await make_engine(tmp_path)
+        store = ForecastStore(engine)
+        forecast = {'trend': 'UP', 'confidence': 0.7, 'prediction': 101.5}
+        await store.write({'THYAO': forecast})
+        fresh = await store.read(['thyao'], max_age=60)
+        await engine.dispose()
+        return fresh
+
+    fresh = asyncio.run(scenario())
+    assert fresh['THYAO']['prediction'] == 101.5
+
+def test_write_replaces_previous_forecast(tmp_path):
+    async def scenario():
+        engine = await make_engine(tmp_path)
+        store = ForecastStore(engine)
+        await store.write({'BTC': {'trend': 'UP', 'confidence': 0.6, 'prediction': 1.0}})
+        await store.write({'BTC': {'trend': 'DOWN', 'confidence': 0.8, 'prediction': 0.5}})
+        result = await store.read(['BTC'], max_age=60)
+        await engine.dispose()
+        return result
+
+    assert asyncio.run(scenario())['BTC']['trend'] == 'DOWN'
@@ -0,0 +1,74 @@
+import asyncio
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine
+from src.database.models import Base, MarketData
+from src.database.timeseries import TimeSeriesStore, TimeSeriesMaintenance
+
+START = datetime(2026, 1, 5, 9, 0)
+
+async def make_store(tmp_path, ticks):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(MarketData.__table__), ticks)
+    return engine, TimeSeriesStore(engine)
+
+def ticks(count=150, symbol='AAA'):
+    # Dakikada bir tik: 09:00-11:29
+    return [
+        {'symbol': symbol, 'price': 100.0 + i, 'volume': 2.0, 'timestamp': START + timedelta(minutes=i)}
+        for i in range(count)
+    ]
+
+def test_hourly_and_daily_bars_are_built_from_lower_resolutions(tmp_path):
+    async def scenario():
+        engine, store = await make_store(tmp_path, ticks())
+        counts = [await store.rollup(resolution, START) for resolution in ('1m', '1h', '1d')]
+        hourly = await store.read_bars('AAA', '1h', START)
+        daily = await store.read_bars('AAA', '1d', START - timedelta(hours=9))
+        await engine.dispose()
+        return counts, hourly, daily
+
+    counts, hourly, daily = asyncio.run(scenario())
+    assert counts == [150, 3, 1]
+    assert hourly['open'].tolist() == [100.0, 160.0, 220.0]
+    assert hourly['close'].tolist() == [159.0, 219.0, 249.0]
+    assert hourly['volume'].tolist() == [120.0, 120.0, 60.0]
+    assert (daily['open'][0], daily['high'][0], daily['low'][0], daily['close'][0]) == (100.0, 249.0, 100.0, 249.0)
+    assert daily['volume'][0] == pytest.approx(300.0)
+
+def test_rollup_replaces_existing_bars(tmp_path):
+    async def scenario():
+        engine, store = await make_store(tmp_path, ticks(10))
+        await store.rollup('1m', START)
+        await store.rollup('1m', START)
+        bars = await store.read_bars('AAA', '1m', START)
+        await engine.dispose()
+        return bars
+
+    assert len(asyncio.run(scenario())['close']) == 10
+
+def test_maintenance_applies_retention_once_per_day(tmp_path):
+    class CountingStore:
+        def __init__(self):
+            self.rollups = []
+            self.retention = 0
+
+        async def rollup(self, resolution, start, end=None):
+            self.rollups.append(resolution)
+
+        async def apply_retention(self):
+            self.retention += 1
+
+    async def scenario():
+        store = CountingStore()
+        maintenance = TimeSeriesMaintenance(store, interval=60)
+        for _ in range(3):
+            await maintenance.run_once()
+        return store
+
+    store = asyncio.run(scenario())
+    assert store.rollups == ['1m', '1h', '1d'] * 3
+    assert store.retention == 1
@@ -0,0 +1,262 @@
+import asyncio
+from datetime import datetime, timedelta
+import numpy as np
+from sqlalchemy import select, delete, insert, literal
+from src.config import Config
+from src.database.models import MarketData, OHLCVBar
+from src.database.session import get_engine
+
+# Bar çözünürlükleri ve saniye karşılıkları
+RESOLUTIONS = {'1m': 60, '1h': 3600, '1d': 86400}
+# Her çözünürlüğün toplandığı kaynak (None: ham tikler); barlar bir alt çözünürlükten üretilir
+ROLLUP_SOURCES = {'1m': None, '1h': '1m', '1d': '1h'}
+
+class TimeSeriesStore:
+    """MarketData tikleri ve OHLCV barları için NumPy dizisi döndüren zaman serisi katmanı"""
+
+    def __init__(self, engine=None):
+        self._engine = engine
+
+    @property
+    def engine(self):
+        return self._engine or get_engine()
+
+    async def _fetch_columns(self, query, count):
+        async with self.engine.connect() as conn:
+            rows = (await conn.execute(query)).all()
+        if not rows:
+            return [[] for _ in range(count)]
+        return list(zip(*rows))
+
+    @staticmethod
+    def _floats(values):
+        # None değerleri NaN olur
+        return np.asarray(values, dtype=np.float64)
+
+    @staticmethod
+    def _timestamps(values):
+        return np.asarray(values, dtype='datetime64[us]')
+
+    async def read_ticks(self, symbol, start, end=None):
+        """[start, end) aralığındaki ham tikleri sütun dizileri olarak döndürür"""
+        table = MarketData.__table__
+        query = select(table.c.timestamp, table.c.price, table.c.volume).where(
+            table.c.symbol == symbol.upper(),
+            table.c.timestamp >= start
+        )
+        if end is not None:
+            query = query.where(table.c.timestamp < end)
+        timestamps, prices, volumes = await self._fetch_columns(query.order_by(table.c.timestamp), 3)
+
+        return {
+            'timestamp': self._timestamps(timestamps),
+            'price': self._floats(prices),
+            'volume': self._floats(volumes)
+        }
+
+    async def read_bars(self, symbol, resolution, start, end=None):
+        """[start, end) aralığındaki barları sütun dizileri olarak döndürür"""
+        table = OHLCVBar.__table__
+        query = select(
+            table.c.bucket_start, table.c.open, table.c.high, table.c.low, table.c.close, table.c.volume
+        ).where(
+            table.c.symbol == symbol.upper(),
+            table.c.resolution == resolution,
+            table.c.bucket_start >= start
+        )
+        if end is not None:
+            query = query.where(table.c.bucket_start < end)
+        columns = await self._fetch_columns(query.order_by(table.c.bucket_start), 6)
+
+        bars = {'timestamp': self._timestamps(columns[0])}
+        for name, values in zip(('open', 'high', 'low', 'close', 'volume'), columns[1:]):
+            bars[name] = self._floats(values)
+        return bars
+
+    async def last_closes(self, symbol, count, resolution='1d'):
+        """Son `count` barın kapanış fiyatlarını eskiden yeniye sıralı döndürür"""
+        table = OHLCVBar.__table__
+        query = select(table.c.close).where(
+            table.c.symbol == symbol.upper(),
+            table.c.resolution == resolution
+        ).order_by(table.c.bucket_start.desc()).limit(count)
+        (closes,) = await self._fetch_columns(query, 1)
+        return self._floats(closes)[::-1]
+
+    async def rollup(self, resolution, start, end=None):
+        """[start, end) aralığını `resolution` barlarına toplar ve yazar
+
+        Dakikalık barlar ham tiklerden, saatlik barlar dakikalıklardan, günlük barlar saatliklerden
+        üretilir; böylece okunan satır sayısı tik hacmiyle değil kova sayısıyla büyür. Aralık bar
+        sınırına hizalanır; var olan barlar yeniden hesaplanıp değiştirilir.
+        """
+        seconds = RESOLUTIONS[resolution]
+        start = _align(start, seconds)
+        columns = await self._rollup_source(ROLLUP_SOURCES[resolution], start, end)
+        if not columns[0]:
+            return 0
+
+        # Toplama CPU yoğun; event loop'u bloklamaması için iş parçacığında yapılır
+        names, rows = await asyncio.to_thread(self._aggregate, resolution, seconds, *columns)
+
+        bars = OHLCVBar.__table__
+        async with self.engine.begin() as conn:
+            # Yalnızca tikleri hâlâ mevcut olan sembollerin barları yeniden yazılır
+            replace = delete(bars).where(
+                bars.c.symbol.in_(names),
+                bars.c.resolution == resolution,
+                bars.c.bucket_start >= start
+            )
+            if end is not None:
+                replace = replace.where(bars.c.bucket_start < end)
+            await conn.execute(replace)
+            await conn.execute(insert(bars), rows)
+        return len(rows)
+
+    async def _rollup_source(self, source, start, end):
+        """Toplanacak satırları (sembol, zaman) sıralı sütunlar olarak okur
+
+        Tikler tek fiyatlı bar gibi döndürülür: (sembol, zaman, açılış, yüksek, düşük, kapanış, hacim, adet).
+        """
+        if source is None:
+            table = MarketData.__table__
+            time_column = table.c.timestamp
+            query = select(
+                table.c.symbol, time_column,
+                table.c.price.label('open'), table.c.price.label('high'),
+                table.c.price.label('low'), table.c.price.label('close'),
+                table.c.volume, literal(1).label('tick_count')
+            )
+        else:
+            table = OHLCVBar.__table__
+            time_column = table.c.bucket_start
+            query = select(
+                table.c.symbol, time_column, table.c.open, table.c.high, table.c.low, table.c.close,
+                table.c.volume, table.c.tick_count
+            ).where(table.c.resolution == source)
+        query = query.where(time_column >= start)
+        if end is not None:
+            query = query.where(time_column < end)
+        return await self._fetch_columns(query.order_by(table.c.symbol, time_column), 8)
+
+    def _aggregate(self, resolution, seconds, symbols, timestamps, opens, highs, lows, closes, volumes, counts):
+        """(sembol, zaman) sıralı tikleri ya da alt çözünürlük barlarını vektörel olarak OHLCV satırlarına indirger"""
+        names, codes = np.unique(np.asarray(symbols, dtype=object), return_inverse=True)
+        epoch = self._timestamps(timestamps).astype('datetime64[s]').astype(np.int64)
+        buckets = epoch // seconds * seconds
+        opens, highs, lows, closes = (self._floats(values) for values in (opens, highs, lows, closes))
+        volumes = np.nan_to_num(self._floats(volumes))
+        counts = np.nan_to_num(self._floats(counts))
+
+        # Sorgu (sembol, zaman) sıralı; sembol ya da kova değiştiği yerler grup başlangıcıdır
+        key_change = np.ones(len(codes), dtype=bool)
+        key_change[1:] = (codes[1:] != codes[:-1]) | (buckets[1:] != buckets[:-1])
+        starts = np.flatnonzero(key_change)
+        ends = np.append(starts[1:], len(codes)) - 1
+
+        rows = [
+            {
+                'symbol': names[codes[first]],
+                'resolution': resolution,
+                'bucket_start': bucket,
+                'open': float(opens[first]),
+                'high': float(high),
+                'low': float(low),
+                'close': float(closes[last]),
+                'volume': float(volume),
+                'tick_count': int(count)
+            }
+            for first, last, bucket, high, low, volume, count in zip(
+                starts, ends,
+                buckets[starts].astype('datetime64[s]').tolist(),
+                np.maximum.reduceat(highs, starts),
+                np.minimum.reduceat(lows, starts),
+                np.add.reduceat(volumes, starts),
+                np.add.reduceat(counts, starts)
+            )
+        ]
+        return names.tolist(), rows
+
+    async def apply_retention(self, raw_days=None, minute_days=None):
+        """Eski ham tikleri ve dakikalık barları siler; saatlik/günlük barlar korunur
+
+        Kesim noktaları gün sınırına hizalıdır. Silinecek verinin son günü önce üst
+        çözünürlüklere toplanır, böylece veri kaybı olmaz.
+        """
+        raw_days = raw_days or Config.TIMESERIES_RAW_RETENTION_DAYS
+        minute_days = minute_days or Config.TIMESERIES_MINUTE_RETENTION_DAYS
+        now = datetime.utcnow()
+        raw_cutoff = _align(now - timedelta(days=raw_days), RESOLUTIONS['1d'])
+        minute_cutoff = _align(now - timedelta(days=minute_days), RESOLUTIONS['1d'])
+
+        for resolution in RESOLUTIONS:
+            await self.rollup(resolution, raw_cutoff - timedelta(days=1), raw_cutoff)
+        for resolution in ('1h', '1d'):
+            await self.rollup(resolution, minute_cutoff - timedelta(days=1), minute_cutoff)
+
+        ticks = MarketData.__table__
+        bars = OHLCVBar.__table__
+        async with self.engine.begin() as conn:
+            await conn.execute(delete(ticks).where(ticks.c.timestamp < raw_cutoff))
+            await conn.execute(delete(bars).where(
+                bars.c.resolution == '1m',
+                bars.c.bucket_start < minute_cutoff
+            ))
+
+def _align(moment, seconds):
+    """Zamanı bar sınırına aşağı yuvarlar"""
+    epoch = int((moment - datetime(1970, 1, 1)).total_seconds())
+    return datetime(1970, 1, 1) + timedelta(seconds=epoch // seconds * seconds)
+
+class TimeSeriesMaintenance:
+    """Son tikleri periyodik olarak barlara toplar ve saklama politikasını uygular"""
+
+    def __init__(self, store, interval=None):
+        self.store = store
+        self.interval = interval or Config.TIMESERIES_ROLLUP_INTERVAL
+        self._task = None
+        # Bir önceki turun başladığı an; sonraki tur yalnızca o andan itibaren açık kovaları yeniden hesaplar
+        self._last_run = None
+        self._retention_day = None
+        self.runs = 0
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run_once(self):
+        """Son turdan beri değişen kovaları alttan üste yeniden hesaplar; saklama politikasını günde bir uygular"""
+        now = datetime.utcnow()
+        if self._last_run is None:
+            since = now - timedelta(seconds=max(RESOLUTIONS['1m'], self.interval) * 2)
+        else:
+            # Bir önceki dakika kovası da gecikmeli gelen tikler için yeniden hesaplanır
+            since = self._last_run - timedelta(seconds=RESOLUTIONS['1m'])
+        # Sıra önemlidir: her çözünürlük bir alttakinin yeni yazılmış barlarından toplanır
+        for resolution in RESOLUTIONS:
+            await self.store.rollup(resolution, since)
+        self._last_run = now
+
+        # Kesim noktaları gün sınırına hizalı olduğundan saklama günde bir kez yeterlidir
+        day = _align(now, RESOLUTIONS['1d'])
+        if day != self._retention_day:
+            await self.store.apply_retention()
+            self._retention_day = day
+        self.runs += 1
+
+    async def _run(self):
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                print(f"Zaman serisi bakım hatası: {e}")
+            await asyncio.sleep(self.interval)
@@ -1,7 +1,12 @@
 import discord
 from discord.ext import commands
 from src.ai_engine.chat_engine import FinancialChatBot
+from src.alerts.engine import AlertEngine, ALERT_USAGE, format_alert, parse_alert_command
 from src.config import Config
+from src.data_collectors.market_data import MarketDataCollector
+from src.integrations.gateway import BotGateway
+from src.integrations.streaming import ThrottledMessageEditor
+from src.utils.tracing import get_tracer, traced, current_request_id
 import asyncio
 
 class FintelliDiscordBot(commands.Bot):
@@ -10,11 +15,16 @@ class FintelliDiscordBot(commands.Bot):
         intents.message_content = True
         super().__init__(command_prefix='!', intents=intents)
         
-        self.chatbot = FinancialChatBot()
+        self.chatbot = FinancialChatBot(platform='discord')
+        # DM'ler sohbet motoruna hız sınırı ve sınırlı kuyruk üzerinden ulaşır
+        self.gateway = BotGateway('discord')
+        # Alarmı olan semboller yoklanır; tetiklenen alarmlar bu bot üzerinden gönderilir
+        self.alerts = AlertEngine('discord', self.send_alert, collector=MarketDataCollector(), max_length=2000)
         self.setup_commands()
         
     def setup_commands(self):
         @self.command(name='analiz')
+        @traced("discord.analiz")
         async def analyze(ctx, symbol: str = None):
             """Bir hisse veya kripto para analizi yapar"""
             if not symbol:
@@ -23,7 +33,7 @@ class FintelliDiscordBot(commands.Bot):
                 
             async with ctx.typing():
                 try:
-                    response = await self.chatbot._handle_market_analysis(f"analiz {symbol}")
+                    response = await self.chatbot._handle_market_analysis(f"analiz {symbol}", symbol=symbol.upper())
                     
                     # Discord embed oluştur
                     embed = discord.Embed(
@@ -38,6 +48,7 @@ class FintelliDiscordBot(commands.Bot):
                     await ctx.send("Analiz yapılırken bir hata oluştu. Lütfen tekrar deneyin.")
         
         @self.command(name='portfoy')
+        @traced("discord.portfoy")
         async def portfolio(ctx):
             """Kullanıcının portföy durumunu gösterir"""
             async with ctx.typing():
@@ -57,6 +68,7 @@ class FintelliDiscordBot(commands.Bot):
                     await ctx.send("Portföy bilgileri alınırken bir hata oluştu.")
         
         @self.command(name='haberler')
+        @traced("discord.haberler")
         async def news(ctx, symbol: str = None):
             """Finansal haberleri gösterir"""
             async with ctx.typing():
@@ -83,6 +95,37 @@ class FintelliDiscordBot(commands.Bot):
                 except Exception as e:
                     await ctx.send("Haberler alınırken bir hata oluştu.")
         
+        @self.command(name='alarm')
+        @traced("discord.alarm")
+        async def alarm(ctx, *args):
+            """Fiyat alarmı kurar, listeler ya da siler"""
+            try:
+                action, payload = parse_alert_command(list(args))
+            except ValueError as e:
+                await ctx.send(f"{e}\n\n{ALERT_USAGE.format(prefix='!')}")
+                return
+                
+            try:
+                user_id = ctx.author.id
+                if action == 'list':
+                    alerts = await self.alerts.list(user_id)
+                    response = "\n".join(format_alert(alert) for alert in alerts) or "Aktif alarmınız yok."
+                elif action == 'remove':
+                    removed = await self.alerts.remove(user_id, payload)
+                    response = "Alarm silindi." if removed else "Alarm bulunamadı."
+                else:
+                    symbol, direction, threshold = payload
+                    alert = await self.alerts.add(
+                        user_id, ctx.channel.id, symbol, direction, threshold,
+                        asset_type=self.chatbot.recognizer.asset_type(symbol)
+                    )
+                    response = f"Alarm kuruldu: {format_alert(alert)}"
+                await ctx.send(response)
+            except ValueError as e:
+                await ctx.send(str(e))
+            except Exception as e:
+                await ctx.send("Alarm işlenirken bir hata oluştu.")
+        
         @self.event
         async def on_ready():
             print(f'{self.user} olarak giriş yapıldı!')
@@ -97,17 +140,37 @@ class FintelliDiscordBot(commands.Bot):
             await self.process_commands(message)
             
             # Eğer komut değilse ve DM ise
-            if isinstance(message.channel, discord.DMChannel):
-                async with message.channel.typing():
-                    try:
-                        response = await self.chatbot.generate_response(
-                            user_id=message.author.id,
-                            message=message.content
-                        )
-                        await message.reply(response)
-                    except Exception as e:
-                        await message.reply("Üzgünüm, bir hata oluştu. Lütfen tekrar deneyin.")
+            if isinstance(message.channel, discord.DMChannel) and not message.content.startswith(self.command_prefix):
+                await self.gateway.submit(
+                    message.author.id,
+                    message.content,
+                    lambda: self.handle_direct_message(message),
+                    message.reply
+                )
                         
+    async def handle_direct_message(self, message):
+        """DM mesajına yanıtı üretildikçe gönderir"""
+        try:
+            # Yanıt hemen gönderilir, üretildikçe aralıklarla düzenlenir
+            editor = ThrottledMessageEditor(
+                send=message.reply,
+                edit=lambda sent, text: sent.edit(content=text),
+                max_length=2000
+            )
+            await editor.stream(self.chatbot.stream_response(
+                user_id=message.author.id,
+                message=message.content
+            ))
+        except Exception as e:
+            get_tracer().current_span().fail(e)
+            print(f"Discord mesaj hatası [{current_request_id()}]: {e}")
+            await message.reply("Üzgünüm, bir hata oluştu. Lütfen tekrar deneyin.")
+            
+    async def send_alert(self, channel_id, text):
+        """Tetiklenen alarm bildirimini alarmın kurulduğu kanala gönderir"""
+        channel = self.get_channel(channel_id) or await self.fetch_channel(channel_id)
+        await channel.send(text)
+        
     async def start_bot(self):
         """Bot'u başlatır"""
         await self.start(Config.DISCORD_BOT_TOKEN) 
\ No newline at end of file
@@ -0,0 +1,293 @@
+import asyncio
+import time
+from collections import deque
+from src.config import Config
+from src.utils.rate_limit import TokenBucket
+from src.utils.tracing import get_tracer
+
+# İşin sonucu (submit'in döndürdüğü future bu değerlerden biriyle tamamlanır)
+OUTCOME_DONE = 'done'
+OUTCOME_FAILED = 'failed'
+OUTCOME_RATE_LIMITED = 'rate_limited'
+OUTCOME_SHED = 'shed'
+OUTCOME_DUPLICATE = 'duplicate'
+OUTCOME_SUPERSEDED = 'superseded'
+OUTCOME_EXPIRED = 'expired'
+
+RATE_LIMITED_REPLY = "Çok hızlı mesaj gönderiyorsunuz. Lütfen {seconds} saniye sonra tekrar deneyin."
+SHED_REPLY = "Şu anda çok yoğunum. Lütfen birkaç dakika sonra tekrar deneyin."
+DEFERRED_REPLY = "Şu anda yoğunluk var; mesajınız sıraya alındı, birazdan yanıtlayacağım."
+EXPIRED_REPLY = "Yoğunluk nedeniyle mesajınızı zamanında yanıtlayamadım. Lütfen tekrar deneyin."
+
+def _normalize(text):
+    return " ".join(str(text or '').lower().split())
+
+class _Job:
+    __slots__ = ('text', 'process', 'reply', 'future', 'queued_at')
+
+    def __init__(self, text, process, reply, future):
+        self.text = text
+        self.process = process
+        self.reply = reply
+        self.future = future
+        self.queued_at = time.monotonic()
+
+class _UserState:
+    __slots__ = ('bucket', 'pending', 'running', 'scheduled', 'last_text', 'last_done', 'notice_until')
+
+    def __init__(self, rate, burst):
+        self.bucket = TokenBucket(rate=rate, capacity=burst)
+        self.pending = deque()
+        self.running = None
+        self.scheduled = False
+        self.last_text = None
+        self.last_done = 0.0
+        self.notice_until = 0.0
+
+class BotGateway:
+    """Bot mesajlarını sohbet motoruna hız sınırı, sınırlı kuyruk ve adil sırayla iletir
+
+    - Her kullanıcının jeton kovası vardır; limiti aşan mesajlar bir kez uyarılarak reddedilir.
+    - Kuyruktaki toplam mesaj sınırlıdır; dolduğunda yeni mesajlar nazik bir yanıtla geri çevrilir.
+    - Sabit sayıda işçi kullanıcılar arasında sırayla (round-robin) çalışır; bir kullanıcının aynı
+      anda tek mesajı işlenir, böylece çok mesaj gönderen kullanıcı diğerlerini bekletmez.
+    - Kullanıcının işlenmekte, sırada ya da az önce yanıtlanmış mesajıyla aynı olan mesajlar atılır;
+      sırada bekleyen eski mesajlar yenileri geldiğinde modele ulaşmadan düşürülür.
+    """
+
+    def __init__(self, platform, workers=None, max_queue=None, max_pending_per_user=None, rate=None, burst=None,
+                 max_wait=None, duplicate_window=None, max_users=None):
+        self.platform = platform
+        self.workers = workers or Config.BOT_GATEWAY_WORKERS
+        self.max_queue = max_queue or Config.BOT_GATEWAY_QUEUE_SIZE
+        self.max_pending_per_user = max_pending_per_user or Config.BOT_GATEWAY_MAX_PENDING_PER_USER
+        self.rate = rate or Config.BOT_USER_MESSAGE_RATE
+        self.burst = burst or Config.BOT_USER_MESSAGE_BURST
+        self.max_wait = max_wait or Config.BOT_GATEWAY_MAX_WAIT
+        self.duplicate_window = Config.BOT_GATEWAY_DUPLICATE_WINDOW if duplicate_window is None else duplicate_window
+        self.max_users = max_users or Config.BOT_GATEWAY_MAX_USERS
+
+        self._users = {}
+        self._ready = None
+        self._tasks = []
+        self.queued = 0
+        self.active = 0
+
+        self.accepted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rate_limited = 0
+        self.shed = 0
+        self.deferred = 0
+        self.duplicates = 0
+        self.superseded = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def start(self):
+        """İşçi görevlerini çalışan event loop üzerinde başlatır"""
+        if self._tasks and not all(task.done() for task in self._tasks):
+            return
+        self._ready = asyncio.Queue()
+        self._tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+        for user_id, state in self._users.items():
+            state.scheduled = bool(state.pending)
+            if state.scheduled:
+                self._ready.put_nowait(user_id)
+
+    async def stop(self):
+        """İşçileri durdurur, sırada bekleyen mesajları iptal eder"""
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+        for state in self._users.values():
+            while state.pending:
+                state.pending.popleft().future.cancel()
+            state.scheduled = False
+        self.queued = 0
+
+    async def submit(self, user_id, text, process, reply):
+        """Mesajı sıraya alır; process() yanıtı üreten, reply(text) kısa bilgi mesajı gönderen asenkron fonksiyonlardır
+
+        Mesajın işlenmesi beklenmez; sonucu (OUTCOME_*) taşıyan future döndürülür.
+        """
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        state = self._state(user_id)
+        if state is None:
+            # Kullanıcı tablosu dolu ve hepsinin işi sürüyor; yeni kullanıcı için yer açılamadı
+            self.shed += 1
+            future.set_result(OUTCOME_SHED)
+            await self._notify(reply, SHED_REPLY)
+            return future
+        now = time.monotonic()
+        normalized = _normalize(text)
+
+        if self._is_duplicate(state, normalized, now):
+            self.duplicates += 1
+            future.set_result(OUTCOME_DUPLICATE)
+            return future
+
+        if not state.bucket.try_acquire():
+            self.rate_limited += 1
+            future.set_result(OUTCOME_RATE_LIMITED)
+            # Limit aşıldığında kullanıcı pencere başına bir kez uyarılır; uyarılar da spam olmasın
+            if now >= state.notice_until:
+                wait = state.bucket.wait_time()
+                state.notice_until = now + wait
+                await self._notify(reply, RATE_LIMITED_REPLY.format(seconds=max(1, round(wait))))
+            return future
+
+        # Kullanıcının sıradaki eski mesajları yenisiyle değiştirilir (modele hiç ulaşmazlar)
+        while len(state.pending) >= self.max_pending_per_user:
+            self._drop(state.pending.popleft(), OUTCOME_SUPERSEDED)
+            self.superseded += 1
+
+        if self.queued >= self.max_queue:
+            self.shed += 1
+            future.set_result(OUTCOME_SHED)
+            await self._notify(reply, SHED_REPLY)
+            return future
+
+        job = _Job(normalized, process, reply, future)
+        state.pending.append(job)
+        self.queued += 1
+        self.accepted += 1
+        if not state.scheduled and state.running is None:
+            state.scheduled = True
+            self._ready.put_nowait(user_id)
+
+        # Tüm işçiler meşgul ve önünde en az bir tur iş varsa kullanıcıya sırada olduğu bildirilir
+        if self.active >= self.workers and self.queued > self.workers:
+            self.deferred += 1
+            await self._notify(reply, DEFERRED_REPLY)
+        return future
+
+    def _state(self, user_id):
+        """Kullanıcının durumunu döndürür; tablo dolu ve yer açılamıyorsa None"""
+        state = self._users.get(user_id)
+        if state is None:
+            if len(self._users) >= self.max_users:
+                self._prune()
+            if len(self._users) >= self.max_users and not self._evict():
+                return None
+            state = self._users[user_id] = _UserState(self.rate, self.burst)
+        return state
+
+    @staticmethod
+    def _idle(state):
+        return not state.pending and state.running is None and not state.scheduled
+
+    def _is_duplicate(self, state, normalized, now):
+        if not self.duplicate_window or not normalized:
+            return False
+        if state.running is not None and state.running.text == normalized:
+            return True
+        if any(job.text == normalized for job in state.pending):
+            return True
+        return state.last_text == normalized and now - state.last_done < self.duplicate_window
+
+    def _prune(self):
+        """Sırada ya da işlenmekte mesajı olmayan ve kovası dolmuş kullanıcıların durumunu siler"""
+        now = time.monotonic()
+        idle = [
+            user_id for user_id, state in self._users.items()
+            if self._idle(state) and now - state.last_done >= self.duplicate_window
+            and state.bucket.available() >= state.bucket.capacity
+        ]
+        for user_id in idle:
+            del self._users[user_id]
+
+    def _evict(self):
+        """Yük altında budanacak kullanıcı kalmadığında işi olmayan en eski kullanıcıyı çıkarır"""
+        idle = [(state.last_done, user_id) for user_id, state in self._users.items() if self._idle(state)]
+        if not idle:
+            return False
+        del self._users[min(idle, key=lambda item: item[0])[1]]
+        self.evicted += 1
+        return True
+
+    def _drop(self, job, outcome):
+        self.queued -= 1
+        if not job.future.done():
+            job.future.set_result(outcome)
+
+    async def _notify(self, reply, text):
+        try:
+            await reply(text)
+        except Exception as e:
+            print(f"{self.platform} bilgi mesajı gönderme hatası: {e}")
+
+    async def _worker(self):
+        while True:
+            user_id = await self._ready.get()
+            state = self._users.get(user_id)
+            if state is None:
+                continue
+            state.scheduled = False
+            if not state.pending:
+                continue
+
+            job = state.pending.popleft()
+            self.queued -= 1
+            state.running = job
+            self.active += 1
+            try:
+                await self._run(job)
+            finally:
+                self.active -= 1
+                state.running = None
+                state.last_text = job.text
+                state.last_done = time.monotonic()
+                # Kullanıcının başka mesajı varsa sıranın sonuna geçer; diğer kullanıcılar araya girer
+                if state.pending and not state.scheduled:
+                    state.scheduled = True
+                    self._ready.put_nowait(user_id)
+
+    async def _run(self, job):
+        waited = time.monotonic() - job.queued_at
+        if job.future.done():
+            return
+        if waited > self.max_wait:
+            self.expired += 1
+            job.future.set_result(OUTCOME_EXPIRED)
+            await self._notify(job.reply, EXPIRED_REPLY)
+            return
+
+        with get_tracer().trace(f"{self.platform}.message", queue_wait_ms=round(waited * 1000, 1)) as root:
+            try:
+                await job.process()
+            except Exception as e:
+                root.fail(e)
+                self.failed += 1
+                print(f"{self.platform} mesaj işleme hatası [{root.request_id}]: {e}")
+                job.future.set_result(OUTCOME_FAILED)
+                return
+        self.completed += 1
+        job.future.set_result(OUTCOME_DONE)
+
+    def stats(self):
+        """Kuyruk doluluğunu ve mesaj sonuçlarının sayılarını döndürür"""
+        return {
+            'workers': self.workers,
+            'active': self.active,
+            'queued': self.queued,
+            'max_queue': self.max_queue,
+            'users': len(self._users),
+            'accepted': self.accepted,
+            'completed': self.completed,
+            'failed': self.failed,
+            'rate_limited': self.rate_limited,
+            'shed': self.shed,
+            'deferred': self.deferred,
+            'duplicates': self.duplicates,
+            'superseded': self.superseded,
+            'expired': self.expired,
+            'evicted': self.evicted
+        }
@@ -0,0 +1,39 @@
+import time
+from src.config import Config
+
+class ThrottledMessageEditor:
+    """Akış halinde gelen yanıtı önce hemen gönderir, sonra hız limitine uygun aralıklarla düzenler
+
+    send(text) yeni mesaj gönderip mesaj nesnesini döndüren, edit(mesaj, text) mesajı
+    güncelleyen asenkron fonksiyonlardır.
+    """
+
+    def __init__(self, send, edit, max_length, interval=None, placeholder="⏳"):
+        self.send = send
+        self.edit = edit
+        self.max_length = max_length
+        self.interval = interval or Config.BOT_STREAM_EDIT_INTERVAL
+        self.placeholder = placeholder
+
+    async def stream(self, chunks):
+        """Parçaları tüketir, mesajı throttled olarak günceller ve tam metni döndürür"""
+        message = await self.send(self.placeholder)
+        text = ""
+        shown = self.placeholder
+        last_edit = time.monotonic()
+
+        async for chunk in chunks:
+            text += chunk
+            visible = text[:self.max_length]
+            if visible.strip() and visible != shown and time.monotonic() - last_edit >= self.interval:
+                await self.edit(message, visible)
+                shown = visible
+                last_edit = time.monotonic()
+
+        # Son hali gönder; platform sınırını aşan kısım ek mesajlarla iletilir
+        final = text.strip() or "Yanıt üretilemedi."
+        if final[:self.max_length] != shown:
+            await self.edit(message, final[:self.max_length])
+        for start in range(self.max_length, len(final), self.max_length):
+            await self.send(final[start:start + self.max_length])
+        return final
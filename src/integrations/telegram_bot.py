@@ -1,20 +1,30 @@
 from telegram import Update
 from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes
 from src.ai_engine.chat_engine import FinancialChatBot
+from src.alerts.engine import AlertEngine, ALERT_USAGE, format_alert, parse_alert_command
 from src.config import Config
+from src.data_collectors.market_data import MarketDataCollector
+from src.integrations.gateway import BotGateway
+from src.integrations.streaming import ThrottledMessageEditor
+from src.utils.tracing import get_tracer, traced, current_request_id
 import asyncio
 
 class FintelliTelegramBot:
     def __init__(self):
         self.token = Config.TELEGRAM_BOT_TOKEN
-        self.chatbot = FinancialChatBot()
+        self.chatbot = FinancialChatBot(platform='telegram')
+        # Serbest mesajlar sohbet motoruna hız sınırı ve sınırlı kuyruk üzerinden ulaşır
+        self.gateway = BotGateway('telegram')
         self.app = Application.builder().token(self.token).build()
+        # Alarmı olan semboller yoklanır; tetiklenen alarmlar bu bot üzerinden gönderilir
+        self.alerts = AlertEngine('telegram', self.send_alert, collector=MarketDataCollector(), max_length=4096)
         
         # Komut işleyicilerini ekle
         self.app.add_handler(CommandHandler("start", self.start_command))
         self.app.add_handler(CommandHandler("help", self.help_command))
         self.app.add_handler(CommandHandler("analiz", self.analysis_command))
         self.app.add_handler(CommandHandler("portfoy", self.portfolio_command))
+        self.app.add_handler(CommandHandler("alarm", self.alarm_command))
         self.app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, self.handle_message))
         
     async def start(self):
@@ -49,12 +59,14 @@ class FintelliTelegramBot:
         /analiz [sembol] - Bir hisse veya kripto için analiz
         /portfoy - Portföyünüzün durumu
         /haberler [sembol] - İlgili haberleri göster
+        /alarm [sembol] [>|<] [fiyat] - Fiyat alarmı kur (/alarm liste, /alarm sil ID)
         
         Ayrıca benimle doğal dilde konuşabilirsiniz!
         Örnek: "Bitcoin'in durumu nasıl?" veya "THYAO hakkında ne düşünüyorsun?"
         """
         await update.message.reply_text(help_message)
         
+    @traced("telegram.analiz")
     async def analysis_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Analiz komutu"""
         try:
@@ -63,12 +75,13 @@ class FintelliTelegramBot:
                 return
                 
             symbol = context.args[0].upper()
-            response = await self.chatbot._handle_market_analysis(f"analiz {symbol}")
+            response = await self.chatbot._handle_market_analysis(f"analiz {symbol}", symbol=symbol.upper())
             await update.message.reply_text(response)
             
         except Exception as e:
             await update.message.reply_text("Analiz yapılırken bir hata oluştu. Lütfen tekrar deneyin.")
             
+    @traced("telegram.portfoy")
     async def portfolio_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Portföy komutu"""
         try:
@@ -79,8 +92,52 @@ class FintelliTelegramBot:
         except Exception as e:
             await update.message.reply_text("Portföy bilgileri alınırken bir hata oluştu. Lütfen tekrar deneyin.")
             
+    @traced("telegram.alarm")
+    async def alarm_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Fiyat alarmı komutu"""
+        try:
+            action, payload = parse_alert_command(context.args or [])
+        except ValueError as e:
+            await update.message.reply_text(f"{e}\n\n{ALERT_USAGE.format(prefix='/')}")
+            return
+            
+        try:
+            user_id = update.effective_user.id
+            if action == 'list':
+                alerts = await self.alerts.list(user_id)
+                response = "\n".join(format_alert(alert) for alert in alerts) or "Aktif alarmınız yok."
+            elif action == 'remove':
+                removed = await self.alerts.remove(user_id, payload)
+                response = "Alarm silindi." if removed else "Alarm bulunamadı."
+            else:
+                symbol, direction, threshold = payload
+                alert = await self.alerts.add(
+                    user_id, update.effective_chat.id, symbol, direction, threshold,
+                    asset_type=self.chatbot.recognizer.asset_type(symbol)
+                )
+                response = f"Alarm kuruldu: {format_alert(alert)}"
+            await update.message.reply_text(response)
+            
+        except ValueError as e:
+            await update.message.reply_text(str(e))
+        except Exception as e:
+            await update.message.reply_text("Alarm işlenirken bir hata oluştu. Lütfen tekrar deneyin.")
+            
+    async def send_alert(self, chat_id, text):
+        """Tetiklenen alarm bildirimini gönderir"""
+        await self.app.bot.send_message(chat_id=chat_id, text=text)
+        
     async def handle_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Genel mesaj işleyici"""
+        """Genel mesaj işleyici; mesaj ağ geçidinde sıraya alınır, sonucu taşıyan future döndürülür"""
+        return await self.gateway.submit(
+            update.effective_user.id,
+            update.message.text,
+            lambda: self.reply_to_message(update),
+            update.message.reply_text
+        )
+        
+    async def reply_to_message(self, update: Update):
+        """Mesaja yanıtı üretildikçe gönderir"""
         try:
             user_id = update.effective_user.id
             message = update.message.text
@@ -88,13 +145,18 @@ class FintelliTelegramBot:
             # Yazıyor... aksiyonu
             await update.message.chat.send_action(action="typing")
             
-            # Chatbot'tan yanıt al
-            response = await self.chatbot.generate_response(
+            # Yanıt hemen gönderilir, üretildikçe aralıklarla düzenlenir
+            editor = ThrottledMessageEditor(
+                send=update.message.reply_text,
+                edit=lambda sent, text: sent.edit_text(text),
+                max_length=4096
+            )
+            await editor.stream(self.chatbot.stream_response(
                 user_id=user_id,
                 message=message
-            )
-            
-            await update.message.reply_text(response)
+            ))
             
         except Exception as e:
+            get_tracer().current_span().fail(e)
+            print(f"Telegram mesaj hatası [{current_request_id()}]: {e}")
             await update.message.reply_text("Üzgünüm, bir hata oluştu. Lütfen tekrar deneyin.") 
\ No newline at end of file
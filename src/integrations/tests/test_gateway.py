@@ -0,0 +1,188 @@
+import asyncio
+from src.integrations.gateway import (
+    BotGateway, OUTCOME_DONE, OUTCOME_DUPLICATE, OUTCOME_EXPIRED, OUTCOME_FAILED, OUTCOME_RATE_LIMITED,
+    OUTCOME_SHED, OUTCOME_SUPERSEDED, RATE_LIMITED_REPLY, SHED_REPLY
+)
+
+def gateway(**kwargs):
+    params = dict(workers=1, max_queue=100, max_pending_per_user=10, rate=1000, burst=1000,
+                  max_wait=60, duplicate_window=10, max_users=100)
+    params.update(kwargs)
+    return BotGateway('test', **params)
+
+class Recorder:
+    """Bot tarafını taklit eder: işlenen mesajları ve gönderilen bilgi yanıtlarını kaydeder"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.processed = []
+        self.replies = []
+
+    def process(self, user_id, text):
+        async def run():
+            self.processed.append((user_id, text))
+            await asyncio.sleep(self.delay)
+        return run
+
+    async def reply(self, text):
+        self.replies.append(text)
+
+    async def submit(self, gateway, user_id, text):
+        return await gateway.submit(user_id, text, self.process(user_id, text), self.reply)
+
+def run(scenario):
+    async def wrapper():
+        return await scenario()
+    return asyncio.run(wrapper())
+
+def test_workers_round_robin_between_users():
+    bot = Recorder()
+
+    async def scenario():
+        gw = gateway()
+        futures = [await bot.submit(gw, 1, text) for text in ('a', 'b', 'c')]
+        futures += [await bot.submit(gw, 2, 'x'), await bot.submit(gw, 3, 'y')]
+        outcomes = await asyncio.gather(*futures)
+        await gw.stop()
+        return outcomes
+
+    assert run(scenario) == [OUTCOME_DONE] * 5
+    assert bot.processed == [(1, 'a'), (2, 'x'), (3, 'y'), (1, 'b'), (1, 'c')]
+
+def test_user_has_at_most_one_message_in_flight():
+    bot = Recorder(delay=0.01)
+    in_flight = []
+
+    async def scenario():
+        gw = gateway(workers=4)
+        futures = [await bot.submit(gw, 1, str(i)) for i in range(3)]
+        while not all(future.done() for future in futures):
+            in_flight.append(gw.active)
+            await asyncio.sleep(0.002)
+        await gw.stop()
+
+    run(scenario)
+    assert max(in_flight) == 1
+    assert [text for _, text in bot.processed] == ['0', '1', '2']
+
+def test_rate_limited_user_is_warned_once():
+    bot = Recorder()
+
+    async def scenario():
+        gw = gateway(rate=0.01, burst=1)
+        futures = [await bot.submit(gw, 1, text) for text in ('a', 'b', 'c')]
+        outcomes = await asyncio.gather(*futures)
+        await gw.stop()
+        return outcomes, gw.rate_limited
+
+    outcomes, rate_limited = run(scenario)
+    assert outcomes == [OUTCOME_DONE, OUTCOME_RATE_LIMITED, OUTCOME_RATE_LIMITED]
+    assert rate_limited == 2
+    assert len(bot.replies) == 1
+    assert bot.replies[0].startswith(RATE_LIMITED_REPLY.split('{')[0])
+
+def test_duplicates_of_queued_running_and_recent_messages_are_dropped():
+    bot = Recorder(delay=0.01)
+
+    async def scenario():
+        gw = gateway()
+        first = await bot.submit(gw, 1, "BTC fiyatı?")
+        await asyncio.sleep(0)
+        running_duplicate = await bot.submit(gw, 1, "  btc   FiYATı? ")
+        await first
+        recent_duplicate = await bot.submit(gw, 1, "BTC fiyatı?")
+        other_user = await bot.submit(gw, 2, "BTC fiyatı?")
+        outcomes = [await running_duplicate, await recent_duplicate, await other_user]
+        await gw.stop()
+        return outcomes
+
+    assert run(scenario) == [OUTCOME_DUPLICATE, OUTCOME_DUPLICATE, OUTCOME_DONE]
+    assert bot.processed == [(1, "BTC fiyatı?"), (2, "BTC fiyatı?")]
+
+def test_duplicate_check_can_be_disabled():
+    bot = Recorder()
+
+    async def scenario():
+        gw = gateway(duplicate_window=0)
+        futures = [await bot.submit(gw, 1, 'same') for _ in range(2)]
+        outcomes = await asyncio.gather(*futures)
+        await gw.stop()
+        return outcomes
+
+    assert run(scenario) == [OUTCOME_DONE, OUTCOME_DONE]
+
+def test_newer_message_supersedes_queued_one():
+    bot = Recorder(delay=0.01)
+
+    async def scenario():
+        gw = gateway(max_pending_per_user=1)
+        busy = await bot.submit(gw, 2, 'busy')
+        await asyncio.sleep(0)
+        old = await bot.submit(gw, 1, 'old')
+        new = await bot.submit(gw, 1, 'new')
+        outcomes = [await busy, await old, await new]
+        await gw.stop()
+        return outcomes
+
+    assert run(scenario) == [OUTCOME_DONE, OUTCOME_SUPERSEDED, OUTCOME_DONE]
+    assert (1, 'old') not in bot.processed
+
+def test_full_queue_sheds_with_friendly_reply():
+    bot = Recorder(delay=0.01)
+
+    async def scenario():
+        gw = gateway(max_queue=2)
+        futures = [await bot.submit(gw, user_id, 'm') for user_id in range(4)]
+        outcomes = await asyncio.gather(*futures)
+        await gw.stop()
+        return outcomes
+
+    assert run(scenario) == [OUTCOME_DONE, OUTCOME_DONE, OUTCOME_SHED, OUTCOME_SHED]
+    assert bot.replies.count(SHED_REPLY) == 2
+
+def test_messages_waiting_too_long_expire():
+    bot = Recorder(delay=0.05)
+
+    async def scenario():
+        gw = gateway(max_wait=0.01)
+        futures = [await bot.submit(gw, user_id, 'm') for user_id in range(2)]
+        outcomes = await asyncio.gather(*futures)
+        await gw.stop()
+        return outcomes, gw.expired
+
+    assert run(scenario) == ([OUTCOME_DONE, OUTCOME_EXPIRED], 1)
+
+def test_processing_errors_are_reported_as_failed():
+    async def scenario():
+        gw = gateway()
+
+        async def broken():
+            raise RuntimeError("model")
+
+        async def reply(text):
+            pass
+        outcome = await (await gw.submit(1, 'm', broken, reply))
+        await gw.stop()
+        return outcome, gw.failed
+
+    assert run(scenario) == (OUTCOME_FAILED, 1)
+
+def test_user_table_is_bounded_under_load():
+    bot = Recorder(delay=0.02)
+
+    async def scenario():
+        # Kovalar hiç dolmadığından budama kimseyi çıkaramaz
+        gw = gateway(workers=2, max_users=2, rate=0.001, burst=1)
+        first = [await bot.submit(gw, user_id, 'm') for user_id in (1, 2)]
+        await asyncio.sleep(0)
+        while_busy = await bot.submit(gw, 3, 'm')
+        await asyncio.gather(*first)
+        after = await bot.submit(gw, 3, 'm')
+        outcomes = [await while_busy, await after]
+        await gw.stop()
+        return outcomes, len(gw._users), gw.evicted
+
+    outcomes, users, evicted = run(scenario)
+    assert outcomes == [OUTCOME_SHED, OUTCOME_DONE]
+    assert users == 2
+    assert evicted == 1
@@ -1,9 +1,50 @@
+# Açılış süresi ölçümü ilk import ile başlar
+from src.utils.startup import get_startup_report, warm_up_models
 import asyncio
-from src.integrations.discord_bot import FintelliDiscordBot
+from src.config import Config
+from src.ai_engine.conversation_store import get_conversation_store
+from src.data_collectors.http_client import close_http_client
+from src.data_collectors.scheduler import get_scheduler
+from src.database.session import init_db, close_db
+from src.utils.loop_monitor import EventLoopMonitor
 
 async def main():
-    bot = FintelliDiscordBot()
-    await bot.start_bot()
+    report = get_startup_report()
+    report.checkpoint("imports")
+    with report.phase("init_db"):
+        await init_db()
+    # Bot süreci upstream kotasının kendi payını kullanır; zamanlayıcı bot bileşenlerinden önce oluşturulur
+    get_scheduler(Config.BOT_ALPHA_VANTAGE_QUOTA_SHARE)
+    conversations = get_conversation_store()
+    conversations.start()
+    # Event loop'u bloke eden kod (ör. senkron model çağrısı) yığınıyla birlikte yazdırılır
+    loop_monitor = EventLoopMonitor()
+    loop_monitor.start()
+    
+    # Discord kütüphanesi ve sohbet motoru yalnızca bot çalıştırılırken yüklenir
+    with report.phase("bot_setup"):
+        from src.integrations.discord_bot import FintelliDiscordBot
+        bot = FintelliDiscordBot()
+        
+    # Aktif fiyat alarmları yüklenir, alarmlı semboller yoklanmaya başlar
+    with report.phase("alerts"):
+        await bot.alerts.start()
+        
+    # Modeller bot bağlanırken arka planda yüklenir; rapor yükleme bitince yazdırılır
+    warmup = asyncio.ensure_future(
+        warm_up_models(bot.chatbot.registry, Config.MODEL_WARMUP, report, bot.chatbot)
+    )
+    warmup.add_done_callback(lambda task: task.cancelled() or print(f"Açılış raporu: {report.report()}"))
+    try:
+        await bot.start_bot()
+    finally:
+        warmup.cancel()
+        await bot.alerts.stop()
+        await bot.gateway.stop()
+        await conversations.stop()
+        await loop_monitor.stop()
+        await close_http_client()
+        await close_db()
 
 if __name__ == "__main__":
     asyncio.run(main()) 
\ No newline at end of file
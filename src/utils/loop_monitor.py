@@ -0,0 +1,135 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+from src.config import Config
+from src.utils.metrics import get_metrics
+
+# Gecikme histogramı sınırları (saniye)
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+class EventLoopMonitor:
+    """Event loop gecikmesini ölçer ve loop'u bloke eden kodu raporlar
+
+    Loop üzerindeki görev her `interval` saniyede uyanır; beklenenden geç uyanması gecikme
+    olarak histograma işlenir. Ayrı bir gözcü iş parçacığı loop'un `threshold` saniyeden uzun
+    süre yanıt vermediğini fark ederse loop iş parçacığının o anki çağrı yığınını yakalar;
+    böylece bloke eden callback'in kendisi (ör. senkron bir model ya da veritabanı çağrısı) görülür.
+    """
+
+    def __init__(self, interval=None, threshold=None, max_reports=None, metrics=None):
+        self.interval = interval or Config.LOOP_MONITOR_INTERVAL
+        self.threshold = threshold or Config.LOOP_MONITOR_THRESHOLD
+        metrics = metrics or get_metrics()
+        self._lag = metrics.histogram('event_loop_lag_seconds', "Event loop zamanlayıcı gecikmesi", buckets=LAG_BUCKETS)
+        self._blocked = metrics.counter('event_loop_blocked_total', "Eşiği aşan event loop blokajları")
+        self._reports = deque(maxlen=max_reports or Config.LOOP_MONITOR_MAX_REPORTS)
+        self._recent = deque(maxlen=max(1, int(60 / self.interval)))
+
+        self._task = None
+        self._watchdog = None
+        self._stopping = threading.Event()
+        self._loop_thread = None
+        self._heartbeat = time.monotonic()
+        self._stall = None
+
+        self.max_lag = 0.0
+        self.blocked = 0
+
+    def start(self):
+        """Ölçüm görevini ve gözcü iş parçacığını çalışan event loop için başlatır"""
+        if self._task is not None and not self._task.done():
+            return
+        self._loop_thread = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopping.clear()
+        self._task = asyncio.ensure_future(self._run())
+        self._watchdog = threading.Thread(target=self._watch, name="event-loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self):
+        self._stopping.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            await asyncio.to_thread(self._watchdog.join, self.interval * 2)
+            self._watchdog = None
+
+    async def _run(self):
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._heartbeat = now
+            lag = max(0.0, now - expected)
+            self._lag.observe(lag)
+            self._recent.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+
+            stall, self._stall = self._stall, None
+            if stall is not None:
+                # Gözcünün yakaladığı blokajın toplam süresi loop geri döndüğünde belli olur
+                stall['duration_ms'] = round(lag * 1000, 1)
+            elif lag >= self.threshold:
+                # Gözcü görmeden biten kısa blokaj; yığın yakalanamadı
+                self._record({
+                    'detected_at': datetime.utcnow().isoformat(),
+                    'duration_ms': round(lag * 1000, 1),
+                    'cause': 'unknown',
+                    'stack': []
+                })
+
+    def _watch(self):
+        """Gözcü: loop eşikten uzun süre kalp atışı vermezse loop iş parçacığının yığınını yakalar"""
+        step = max(self.threshold / 2, 0.01)
+        while not self._stopping.wait(step):
+            stalled = time.monotonic() - self._heartbeat - self.interval
+            if stalled < self.threshold or self._stall is not None:
+                continue
+            frame = sys._current_frames().get(self._loop_thread)
+            stack = traceback.format_list(traceback.extract_stack(frame)[-Config.LOOP_MONITOR_STACK_DEPTH:]) if frame else []
+            # Loop select() içinde bekliyorsa callback bloke etmiyordur; GIL başka bir iş parçacığındadır
+            idle = frame is not None and frame.f_code.co_name in ('select', 'poll') and 'selectors' in frame.f_code.co_filename
+            report = {
+                'detected_at': datetime.utcnow().isoformat(),
+                'duration_ms': None,
+                'cause': 'gil_contention' if idle else 'blocking_callback',
+                'stack': [] if idle else [line.strip() for line in stack]
+            }
+            self._stall = report
+            self._record(report)
+            if idle:
+                print(f"Event loop {stalled:.3f}s'dir gecikmeli: GIL CPU yoğun başka bir iş parçacığında")
+            else:
+                location = report['stack'][-1].splitlines()[0] if report['stack'] else "bilinmiyor"
+                print(f"Event loop {stalled:.3f}s'dir bloke: {location}")
+
+    def _record(self, report):
+        self.blocked += 1
+        self._blocked.inc()
+        self._reports.append(report)
+
+    def stats(self):
+        """Son bir dakikadaki gecikme dağılımını ve son blokaj raporlarını döndürür"""
+        recent = sorted(self._recent)
+
+        def percentile(q):
+            return round(recent[min(len(recent) - 1, int(q * len(recent)))] * 1000, 2) if recent else 0.0
+
+        return {
+            'interval_ms': self.interval * 1000,
+            'threshold_ms': self.threshold * 1000,
+            'lag_p50_ms': percentile(0.5),
+            'lag_p99_ms': percentile(0.99),
+            'lag_max_ms': round(self.max_lag * 1000, 2),
+            'blocked': self.blocked,
+            'recent_blocks': list(self._reports)
+        }
@@ -0,0 +1,194 @@
+import bisect
+import math
+import re
+import threading
+
+# Saniye cinsinden gecikme histogramı sınırları (1 ms - 30 s)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+def _sanitize(name):
+    return re.sub(r'[^a-zA-Z0-9_]', '_', name).strip('_').lower()
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+class _Metric:
+    type = 'untyped'
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, '')) for name in self.labels)
+
+    def _labels(self, key, extra=()):
+        return tuple(zip(self.labels, key)) + tuple(extra)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_value(key, value))
+        return lines
+
+    def _render_value(self, key, value):
+        return [f"{self.name}{_format_labels(self._labels(key))} {_format_value(value)}"]
+
+class Counter(_Metric):
+    """Yalnızca artan sayaç"""
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+class Gauge(_Metric):
+    """Anlık değer"""
+    type = 'gauge'
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels))
+
+class Histogram(_Metric):
+    """Kümülatif kovalı dağılım; her gözlem O(log kova) maliyetindedir"""
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Kova sayıları, toplam, adet
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def count(self, **labels):
+        state = self._values.get(self._key(labels))
+        return state[2] if state else 0
+
+    def _render_value(self, key, state):
+        counts, total, count = state
+        lines, cumulative = [], 0
+        for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+            cumulative += bucket_count
+            labels = self._labels(key, (('le', _format_value(float(bound))),))
+            lines.append(f"{self.name}_bucket{_format_labels(labels)} {cumulative}")
+        lines.append(f"{self.name}_sum{_format_labels(self._labels(key))} {_format_value(total)}")
+        lines.append(f"{self.name}_count{_format_labels(self._labels(key))} {count}")
+        return lines
+
+class MetricsRegistry:
+    """Süreç metriklerini tutar ve Prometheus metin formatında (0.0.4) dışa aktarır
+
+    Sayaç ve histogramlar ölçüm anında güncellenir; önbellek ve kuyruk göstergeleri ise
+    bileşenlerin mevcut stats() çıktılarından yalnızca kazıma (scrape) anında okunur.
+    """
+
+    def __init__(self, namespace='fintelli'):
+        self.namespace = namespace
+        self._metrics = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, documentation, labels, **kwargs):
+        name = f"{self.namespace}_{name}"
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labels, **kwargs)
+            elif not isinstance(metric, cls) or metric.labels != tuple(labels):
+                raise ValueError(f"Metrik farklı tür ya da etiketlerle tanımlı: {name}")
+        return metric
+
+    def counter(self, name, documentation, labels=()):
+        return self._get_or_create(Counter, name, documentation, labels)
+
+    def gauge(self, name, documentation, labels=()):
+        return self._get_or_create(Gauge, name, documentation, labels)
+
+    def histogram(self, name, documentation, labels=(), buckets=DEFAULT_BUCKETS):
+        return self._get_or_create(Histogram, name, documentation, labels, buckets=buckets)
+
+    def register_stats(self, component, stats):
+        """stats() sözlüğündeki sayısal değerleri `<namespace>_<bileşen>_<anahtar>` göstergeleri olarak yayınlar"""
+        self._stats[_sanitize(component)] = stats
+
+    def _stats_lines(self):
+        lines = []
+        for component, stats in self._stats.items():
+            try:
+                values = stats()
+            except Exception as e:
+                print(f"Metrik toplama hatası ({component}): {e}")
+                continue
+            for key, value in _flatten(values or {}):
+                name = f"{self.namespace}_{component}_{key}"
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {_format_value(value)}")
+        return lines
+
+    def render(self):
+        """Tüm metrikleri Prometheus metin formatında döndürür"""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        lines.extend(self._stats_lines())
+        return "\n".join(lines) + "\n"
+
+def _flatten(values, prefix=''):
+    """İç içe stats sözlüğünden (anahtar, sayı) çiftleri üretir; sayısal olmayan değerler atlanır"""
+    for key, value in values.items():
+        name = _sanitize(f"{prefix}{key}")
+        if isinstance(value, bool):
+            yield name, float(value)
+        elif isinstance(value, (int, float)):
+            if math.isfinite(value):
+                yield name, float(value)
+        elif isinstance(value, dict):
+            yield from _flatten(value, f"{name}_")
+
+# Süreç genelinde paylaşılan metrik kayıt defteri
+_metrics = None
+
+def get_metrics():
+    """Paylaşılan metrik kayıt defterini döndürür"""
+    global _metrics
+    if _metrics is None:
+        _metrics = MetricsRegistry()
+    return _metrics
@@ -0,0 +1,43 @@
+import time
+
+class TokenBucket:
+    """Saniyede `rate` token ile dolan, en fazla `capacity` token tutan kova"""
+
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def available(self):
+        """Şu anda kullanılabilir token sayısını döndürür"""
+        self._refill()
+        return self.tokens
+
+    def wait_time(self, tokens=1):
+        """`tokens` kadar token birikene dek beklenecek süreyi (saniye) döndürür"""
+        self._refill()
+        missing = tokens - self.tokens
+        if missing <= 0:
+            return 0.0
+        if self.rate <= 0:
+            return float('inf')
+        return missing / self.rate
+
+    def try_acquire(self, tokens=1):
+        """Yeterli token varsa harcar ve True döndürür"""
+        self._refill()
+        if self.tokens >= tokens:
+            self.tokens -= tokens
+            return True
+        return False
+
+    def drain(self):
+        """Kovayı boşaltır (karşı taraf limit bildirdiğinde geri çekilmek için)"""
+        self._refill()
+        self.tokens = 0.0
@@ -0,0 +1,111 @@
+import asyncio
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+# Açılışta yüklenmemesi gereken ağır kütüphaneler; rapor bunların ne zaman yüklendiğini gösterir
+HEAVY_MODULES = ('torch', 'tensorflow', 'transformers')
+
+class StartupReport:
+    """Açılış süresinin hangi aşamalarda harcandığını ve hazır olma durumunu izler
+
+    Süreler bu nesnenin oluşturulduğu andan (giriş noktasının ilk import'u) itibaren ölçülür.
+    Hazır olmak için expect() ile bildirilen tüm bileşenlerin complete() edilmesi gerekir.
+    """
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.started_wall = datetime.utcnow()
+        self.phases = []
+        self.ready_seconds = None
+        self._last_checkpoint = self.started_at
+        self._required = {}
+
+    def _offset(self, moment=None):
+        return round((moment or time.perf_counter()) - self.started_at, 3)
+
+    def checkpoint(self, name):
+        """Bir önceki kontrol noktasından bu yana geçen süreyi aşama olarak kaydeder"""
+        now = time.perf_counter()
+        self.phases.append({
+            'name': name,
+            'started_at': self._offset(self._last_checkpoint),
+            'seconds': round(now - self._last_checkpoint, 3),
+            'status': 'ok'
+        })
+        self._last_checkpoint = now
+
+    @contextmanager
+    def phase(self, name):
+        """Blok süresini aşama olarak kaydeder; hata olursa aşama 'failed' işaretlenir"""
+        started = time.perf_counter()
+        record = {'name': name, 'started_at': self._offset(started), 'seconds': None, 'status': 'running'}
+        self.phases.append(record)
+        try:
+            yield record
+            record['status'] = 'ok'
+        except BaseException as e:
+            record['status'] = 'failed'
+            record['error'] = str(e)
+            raise
+        finally:
+            record['seconds'] = round(time.perf_counter() - started, 3)
+            self._last_checkpoint = time.perf_counter()
+
+    def expect(self, *components):
+        """Hazır olmak için tamamlanması gereken bileşenleri bildirir"""
+        for component in components:
+            self._required.setdefault(component, 'pending')
+
+    def complete(self, component, ok=True):
+        """Bileşenin durumunu günceller; hepsi tamamlandıysa hazır olma anını kaydeder"""
+        self._required[component] = 'ok' if ok else 'failed'
+        if self.ready_seconds is None and self.is_ready():
+            self.ready_seconds = self._offset()
+
+    def is_ready(self):
+        return all(status == 'ok' for status in self._required.values())
+
+    def readiness(self):
+        """Hazır olma durumunu bileşen bazında döndürür"""
+        return {
+            'ready': self.is_ready(),
+            'components': dict(self._required)
+        }
+
+    def report(self):
+        """Aşama sürelerini, hazır olma süresini ve yüklenmiş ağır kütüphaneleri döndürür"""
+        return {
+            'started_at': self.started_wall.isoformat(),
+            'uptime_seconds': self._offset(),
+            'ready_seconds': self.ready_seconds,
+            'phases': list(self.phases),
+            'heavy_modules_loaded': [name for name in HEAVY_MODULES if name in sys.modules],
+            **self.readiness()
+        }
+
+async def warm_up_models(registry, names, report, chatbot=None):
+    """Modelleri arka planda sırayla yükler; her model ayrı bir aşama ve hazır olma bileşenidir
+
+    Sohbet LLM'i yüklendiyse sistem promptu önbelleğiyle birlikte üretim motoru da hazırlanır.
+    """
+    for name in names:
+        try:
+            with report.phase(f"warmup:{name}"):
+                await asyncio.to_thread(registry.get, name)
+                if name == 'chat_llm' and chatbot is not None:
+                    await asyncio.to_thread(chatbot.get_engine)
+        except Exception as e:
+            print(f"Model ön yükleme hatası ({name}): {e}")
+            report.complete(f"model:{name}", ok=False)
+            continue
+        report.complete(f"model:{name}")
+
+# Süreç genelinde tek rapor; bu modülün ilk import anı açılış başlangıcı sayılır,
+# bu yüzden giriş noktalarında ilk import olarak yer almalıdır
+_startup_report = StartupReport()
+
+def get_startup_report():
+    """Paylaşılan açılış raporunu döndürür"""
+    return _startup_report
@@ -0,0 +1,38 @@
+import pytest
+from src.utils import rate_limit
+from src.utils.rate_limit import TokenBucket
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, 'monotonic', lambda: now[0])
+    return now
+
+def test_bucket_starts_full_and_refills_at_rate(clock):
+    bucket = TokenBucket(rate=2, capacity=3)
+
+    assert all(bucket.try_acquire() for _ in range(3))
+    assert not bucket.try_acquire()
+    assert bucket.wait_time() == pytest.approx(0.5)
+
+    clock[0] += 0.5
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+def test_bucket_never_exceeds_capacity(clock):
+    bucket = TokenBucket(rate=10, capacity=2)
+    clock[0] += 60
+
+    assert bucket.available() == 2
+
+def test_drain_empties_bucket(clock):
+    bucket = TokenBucket(rate=1, capacity=5)
+    bucket.drain()
+
+    assert bucket.wait_time(2) == pytest.approx(2.0)
+
+def test_zero_rate_waits_forever(clock):
+    bucket = TokenBucket(rate=0, capacity=1)
+    bucket.try_acquire()
+
+    assert bucket.wait_time() == float('inf')
@@ -0,0 +1,250 @@
+import contextvars
+import functools
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+from src.config import Config
+from src.utils.metrics import get_metrics
+
+# Span türleri; her tür için <tür>_seconds histogramı ve <tür>_errors_total sayacı tutulur
+SPAN_KINDS = {
+    'request': "Uçtan uca istek ve bot mesajı işleme süresi",
+    'stage': "İstek içindeki işlem aşamalarının süresi",
+    'external': "Dış servis (Alpha Vantage, NewsAPI) çağrılarının süresi",
+    'model': "Model çıkarımlarının süresi",
+    'db': "Veritabanı sorgularının süresi"
+}
+
+_current = contextvars.ContextVar('fintelli_span', default=None)
+# parent verilmezse bağlamdaki etkin span ebeveyn olur
+_INHERIT = object()
+
+class Span:
+    """İzdeki tek bir zamanlanmış işlem"""
+    __slots__ = ('name', 'kind', 'trace', 'span_id', 'parent_id', 'attributes', 'started', 'duration', 'error')
+
+    def __init__(self, name, kind, trace, parent_id, attributes):
+        self.name = name
+        self.kind = kind
+        self.trace = trace
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.started = time.perf_counter()
+        self.duration = None
+        self.error = None
+
+    @property
+    def request_id(self):
+        return self.trace.request_id if self.trace is not None else None
+
+    def set(self, **attributes):
+        """Span'a öznitelik ekler"""
+        self.attributes.update(attributes)
+
+    def fail(self, error):
+        """İstisna fırlatılmadan ele alınan hatayı span'a işler"""
+        self.error = error if isinstance(error, str) else type(error).__name__
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'kind': self.kind,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'offset_ms': round((self.started - self.trace.root.started) * 1000, 3) if self.trace else 0.0,
+            'duration_ms': None if self.duration is None else round(self.duration * 1000, 3),
+            'error': self.error,
+            'attributes': self.attributes
+        }
+
+class Trace:
+    """Bir isteğin ya da bot mesajının request ID'si altında toplanan span'ları"""
+
+    def __init__(self, request_id, max_spans):
+        self.request_id = request_id
+        self.started_at = datetime.utcnow()
+        self.max_spans = max_spans
+        self.spans = []
+        self.dropped = 0
+        self.root = None
+
+    def add(self, span):
+        if len(self.spans) < self.max_spans:
+            self.spans.append(span)
+        else:
+            self.dropped += 1
+
+    def to_dict(self):
+        return {
+            'request_id': self.request_id,
+            'name': self.root.name,
+            'started_at': self.started_at.isoformat(),
+            'duration_ms': None if self.root.duration is None else round(self.root.duration * 1000, 3),
+            'error': self.root.error,
+            'dropped_spans': self.dropped,
+            'spans': [span.to_dict() for span in sorted(self.spans, key=lambda span: span.started)]
+        }
+
+class Tracer:
+    """Hafif izleme: contextvar ile taşınan request ID altında span'lar toplar ve süreleri metriklere işler
+
+    Etkin bir iz yoksa span yalnızca metriklere yazılır. Tamamlanan son izler sınırlı bir
+    tamponda tutulur; eşiği aşan izlerin aşama dökümü yazdırılır.
+    """
+
+    def __init__(self, metrics=None, max_traces=None, max_spans=None, slow_threshold=None):
+        self.metrics = metrics or get_metrics()
+        self.max_traces = max_traces or Config.TRACE_BUFFER_SIZE
+        self.max_spans = max_spans or Config.TRACE_MAX_SPANS
+        self.slow_threshold = Config.TRACE_SLOW_THRESHOLD if slow_threshold is None else slow_threshold
+        self._traces = OrderedDict()
+        self._lock = threading.Lock()
+        self._seconds = {
+            kind: self.metrics.histogram(f"{kind}_seconds", description, ('operation',))
+            for kind, description in SPAN_KINDS.items()
+        }
+        self._errors = {
+            kind: self.metrics.counter(f"{kind}_errors_total", f"{description} (hatalı sonuçlanan)", ('operation',))
+            for kind, description in SPAN_KINDS.items()
+        }
+
+    @staticmethod
+    def current_span():
+        return _current.get()
+
+    def start_span(self, name, kind='stage', parent=_INHERIT, **attributes):
+        """Span'ı bağlamı değiştirmeden başlatır; finish_span ile kapatılmalıdır"""
+        if parent is _INHERIT:
+            parent = _current.get()
+        trace = parent.trace if parent is not None else None
+        span = Span(name, kind, trace, parent.span_id if parent is not None else None, attributes)
+        if trace is not None:
+            trace.add(span)
+        return span
+
+    def finish_span(self, span, error=None):
+        """Span'ı kapatır, süresini ve hatasını metriklere işler"""
+        span.duration = time.perf_counter() - span.started
+        if error is not None:
+            span.fail(error)
+        if span.kind in self._seconds:
+            self._seconds[span.kind].observe(span.duration, operation=span.name)
+            if span.error is not None:
+                self._errors[span.kind].inc(operation=span.name)
+
+    def attach(self, parent, span):
+        """Paylaşılan bir işlemin (ör. parti çıkarımı) kopyasını metriklere yeniden işlemeden parent'ın izine ekler"""
+        if parent is None or parent.trace is None:
+            return
+        copy = Span(span.name, span.kind, parent.trace, parent.span_id, dict(span.attributes))
+        copy.started, copy.duration, copy.error = span.started, span.duration, span.error
+        parent.trace.add(copy)
+
+    @contextmanager
+    def span(self, name, kind='stage', parent=_INHERIT, **attributes):
+        """İşlemi span olarak zamanlar; gövde içinde başlatılan span'lar bunun altına düşer"""
+        span = self.start_span(name, kind, parent, **attributes)
+        token = _current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            self.finish_span(span, error=e)
+            raise
+        else:
+            self.finish_span(span)
+        finally:
+            _restore(token, span)
+
+    @contextmanager
+    def trace(self, name, request_id=None, **attributes):
+        """Yeni bir iz başlatır; request_id verilmezse üretilir. Kök span döndürülür"""
+        trace = Trace(request_id or uuid.uuid4().hex, self.max_spans)
+        root = Span(name, 'request', trace, None, attributes)
+        trace.root = root
+        trace.add(root)
+        with self._lock:
+            self._traces[trace.request_id] = trace
+            while len(self._traces) > self.max_traces:
+                self._traces.popitem(last=False)
+
+        token = _current.set(root)
+        try:
+            yield root
+        except BaseException as e:
+            self.finish_span(root, error=e)
+            raise
+        else:
+            self.finish_span(root)
+        finally:
+            _restore(token, root)
+            if self.slow_threshold and root.duration >= self.slow_threshold:
+                print(f"Yavaş istek [{trace.request_id}] {root.name}: {root.duration:.3f}s ({_breakdown(trace)})")
+
+    def get(self, request_id):
+        """request ID'ye ait izi döndürür (tamponda yoksa None)"""
+        trace = self._traces.get(request_id)
+        return trace.to_dict() if trace is not None else None
+
+    def recent(self, limit=20, min_duration=0.0):
+        """Son tamamlanan izlerin özetini yeniden eskiye döndürür"""
+        with self._lock:
+            traces = list(self._traces.values())
+        summaries = []
+        for trace in reversed(traces):
+            if trace.root.duration is None or trace.root.duration < min_duration:
+                continue
+            summary = trace.to_dict()
+            summary['breakdown'] = _breakdown(trace)
+            del summary['spans']
+            summaries.append(summary)
+            if len(summaries) >= limit:
+                break
+        return summaries
+
+def _restore(token, span):
+    try:
+        _current.reset(token)
+    except ValueError:
+        # Async üreteçler farklı bir bağlamda sürdürülmüş olabilir; en azından ebeveyne dön
+        _current.set(None if span.trace is None or span.parent_id is None else _find(span.trace, span.parent_id))
+
+def _find(trace, span_id):
+    return next((span for span in trace.spans if span.span_id == span_id), None)
+
+def _breakdown(trace, limit=5):
+    """İzde en çok süre harcanan span adları ve toplam süreleri (ms)"""
+    totals = {}
+    for span in trace.spans:
+        if span is not trace.root and span.duration is not None:
+            totals[span.name] = totals.get(span.name, 0.0) + span.duration * 1000
+    slowest = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:limit]
+    return ", ".join(f"{name}={value:.1f}ms" for name, value in slowest) or "span yok"
+
+def traced(name):
+    """Async işleyiciyi (bot komutu, mesaj işleyici) kendi request ID'li izi içinde çalıştırır"""
+    def decorator(handler):
+        @functools.wraps(handler)
+        async def wrapper(*args, **kwargs):
+            with get_tracer().trace(name):
+                return await handler(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def current_request_id():
+    """Etkin izin request ID'sini döndürür (iz yoksa None)"""
+    span = _current.get()
+    return span.request_id if span is not None else None
+
+# Süreç genelinde tek izleyici
+_tracer = None
+
+def get_tracer():
+    """Paylaşılan izleyiciyi döndürür"""
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer()
+    return _tracer